@@ -0,0 +1,94 @@
+"""Benchmark the per-message overhead before a message handler runs."""
+
+import asyncio
+import time
+import uuid
+
+from uagents import Agent, Context, Model, Protocol
+from uagents.agent import AgentRepresentation
+from uagents.context import MsgInfo
+
+ITERATIONS = 10000
+REPEATS = 5
+
+
+class Ping(Model):
+    text: str
+
+
+def build_agent(num_protocols: int) -> Agent:
+    agent = Agent(
+        name="bench", seed="benchmark message phrase", enable_agent_inspector=False
+    )
+    for i in range(num_protocols):
+        proto = Protocol(name=f"proto-{i}", version="0.1.0")
+        model = type(f"Model{i}", (Model,), {"__annotations__": {"value": int}})
+
+        @proto.on_message(model)
+        async def _(_ctx: Context, _sender: str, _msg: Model):
+            pass
+
+        agent.include(proto)
+
+    @agent.on_message(Ping)
+    async def _(_ctx: Context, _sender: str, _msg: Ping):
+        pass
+
+    agent.include(agent._protocol)  # pylint: disable=protected-access
+    return agent
+
+
+def legacy_lookup(agent: Agent, schema_digest: str, sender: str, message: str):
+    """The lookups previously done per message: a protocol scan and new objects."""
+    protocol = None
+    for protocol_digest, proto in agent.protocols.items():
+        if schema_digest in proto.models:
+            protocol = (protocol_digest, proto)
+            break
+    representation = AgentRepresentation(
+        address=agent.address,
+        name=agent.name,
+        identity=agent._identity,  # pylint: disable=protected-access
+        prefix=agent._prefix,  # pylint: disable=protected-access
+    )
+    info = MsgInfo(message=message, sender=sender, schema_digest=schema_digest)
+    return protocol, representation, info
+
+
+async def time_processing(agent: Agent, digest: str, message: str) -> float:
+    session = uuid.uuid4()
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(ITERATIONS):
+            await agent._process_single_message(  # pylint: disable=protected-access
+                digest, agent.address, message, session
+            )
+        best = min(best, time.perf_counter() - start)
+    return best / ITERATIONS * 1e6
+
+
+def time_legacy_lookup(agent: Agent, digest: str, message: str) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(ITERATIONS):
+            legacy_lookup(agent, digest, agent.address, message)
+        best = min(best, time.perf_counter() - start)
+    return best / ITERATIONS * 1e6
+
+
+async def main() -> None:
+    digest = Model.build_schema_digest(Ping)
+    message = Ping(text="hello").model_dump_json()
+    print(f"Per-message processing with a no-op handler ({ITERATIONS} iterations)")
+    print(f"{'protocols':>10} {'process (us)':>13} {'legacy lookups (us)':>20}")
+    for num_protocols in (1, 10, 100):
+        agent = build_agent(num_protocols)
+        processing = await time_processing(agent, digest, message)
+        legacy = time_legacy_lookup(agent, digest, message)
+        print(f"{num_protocols + 1:>10} {processing:>13.2f} {legacy:>20.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+"""Benchmark REST route lookup cost against the number of registered routes."""
+
+import asyncio
+import timeit
+
+from uagents_core.models import Model
+
+from uagents.asgi import ASGIServer
+from uagents.crypto import Identity
+
+ITERATIONS = 10000
+ROUTES_PER_AGENT = 3
+
+
+class Response(Model):
+    status: str
+
+
+def linear_lookup(server: ASGIServer, method: str, endpoint: str) -> dict:
+    """Route lookup by scanning all registered handlers."""
+    handlers = {}
+    for sink, meth, end in server._rest_handler_map:  # pylint: disable=protected-access
+        if meth == method and end == endpoint:
+            handlers[sink] = server._rest_handler_map[(sink, meth, end)]  # pylint: disable=protected-access
+    return handlers
+
+
+def build_server(num_agents: int) -> ASGIServer:
+    server = ASGIServer(port=8000, loop=asyncio.new_event_loop(), queries={})
+    for _ in range(num_agents):
+        address = Identity.generate().address
+        for i in range(ROUTES_PER_AGENT):
+            server.add_rest_endpoint(address, "GET", f"/route-{i}", None, Response)
+    return server
+
+
+def main() -> None:
+    print(f"REST route lookup ({ITERATIONS} iterations, /submit miss)")
+    print(f"{'routes':>8} {'linear (us)':>12} {'indexed (us)':>13}")
+    for num_agents in (1, 10, 100, 1000):
+        server = build_server(num_agents)
+        linear = timeit.timeit(
+            lambda server=server: linear_lookup(server, "POST", "/submit"),
+            number=ITERATIONS,
+        )
+        indexed = timeit.timeit(
+            lambda server=server: server._get_rest_handler_details("POST", "/submit"),  # pylint: disable=protected-access
+            number=ITERATIONS,
+        )
+        print(
+            f"{num_agents * ROUTES_PER_AGENT:>8} "
+            f"{linear / ITERATIONS * 1e6:>12.2f} "
+            f"{indexed / ITERATIONS * 1e6:>13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
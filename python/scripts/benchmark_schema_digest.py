@@ -0,0 +1,39 @@
+"""Benchmark the cost of computing model schema digests on every send."""
+
+import hashlib
+import timeit
+import uuid
+from datetime import datetime, timezone
+
+from uagents_core.contrib.protocols.chat import ChatMessage, TextContent
+from uagents_core.models import Model
+
+ITERATIONS = 10000
+
+
+def uncached_digest(model: Model) -> str:
+    schema = model.schema_json(indent=None, sort_keys=True)
+    return f"model:{hashlib.sha256(schema.encode('utf8')).digest().hex()}"
+
+
+def main() -> None:
+    message = ChatMessage(
+        timestamp=datetime.now(timezone.utc),
+        msg_id=uuid.uuid4(),
+        content=[TextContent(type="text", text="hello")],
+    )
+    assert uncached_digest(message) == Model.build_schema_digest(message)
+
+    uncached = timeit.timeit(lambda: uncached_digest(message), number=ITERATIONS)
+    cached = timeit.timeit(
+        lambda: Model.build_schema_digest(message), number=ITERATIONS
+    )
+
+    print(f"ChatMessage schema digest ({ITERATIONS} iterations)")
+    print(f"  uncached: {uncached / ITERATIONS * 1e6:8.2f} us/send")
+    print(f"  cached:   {cached / ITERATIONS * 1e6:8.2f} us/send")
+    print(f"  speedup:  {uncached / cached:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
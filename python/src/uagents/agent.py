@@ -5,7 +5,10 @@ import contextlib
 import functools
 import logging
 import os
+import socket
 import uuid
+from collections.abc import Coroutine
+from dataclasses import dataclass
 from typing import Any
 
 import aiohttp
@@ -17,7 +20,7 @@ from pydantic import ValidationError
 from typing_extensions import deprecated
 from uagents_core.config import AgentverseConfig
 from uagents_core.identity import Identity, derive_key_from_seed, is_user_address
-from uagents_core.models import ErrorMessage, Model
+from uagents_core.models import ERROR_MESSAGE_DIGEST, ErrorMessage, Model
 from uagents_core.registration import AgentProfile, RegistrationRequest
 from uagents_core.types import (
     AddressPrefix,
@@ -31,8 +34,11 @@ from uagents.asgi import ASGIServer
 from uagents.communication import Dispenser
 from uagents.config import (
     AVERAGE_BLOCK_INTERVAL,
+    DISPENSER_BATCH_WINDOW_SECONDS,
+    DISPENSER_MAX_CONCURRENCY,
     LEDGER_PREFIX,
     MAINNET_PREFIX,
+    MESSAGE_WORKERS,
     REGISTRATION_RETRY_INTERVAL_SECONDS,
     REGISTRATION_UPDATE_INTERVAL_SECONDS,
     TESTNET_PREFIX,
@@ -50,6 +56,7 @@ from uagents.mailbox import (
     AgentverseConnectRequest,
     AgentverseDisconnectRequest,
     MailboxClient,
+    MailboxMultiplexer,
     RegistrationResponse,
     UnregistrationResponse,
     is_mailbox_agent,
@@ -73,8 +80,14 @@ from uagents.registration import (
     LedgerBasedRegistrationPolicy,
     update_agent_status,
 )
-from uagents.resolver import GlobalResolver, Resolver
-from uagents.storage import KeyValueStore, get_or_create_private_keys
+from uagents.resolver import AgentSearch, GlobalResolver, Resolver
+from uagents.storage import (
+    ExecutorStorageAdapter,
+    KeyValueStore,
+    StorageAPI,
+    get_or_create_private_keys,
+)
+from uagents.transport import HttpTransport
 from uagents.types import (
     AgentNetwork,
     EnvelopeHistory,
@@ -83,6 +96,7 @@ from uagents.types import (
     EventCallback,
     IntervalCallback,
     JsonStr,
+    LocalMessage,
     MessageCallback,
     MsgInfo,
     RestGetHandler,
@@ -90,8 +104,17 @@ from uagents.types import (
     RestHandlerMap,
     RestMethod,
     RestPostHandler,
+    message_json,
+    parse_message,
 )
 from uagents.utils import get_logger, set_global_log_level
+from uagents.verification import VerificationPool
+from uagents.workers import (
+    MessageItem,
+    MessageWorkerPool,
+    MessageWorkerPoolMetrics,
+    QueuePolicy,
+)
 
 
 async def _run_interval(
@@ -140,6 +163,25 @@ async def _send_error_message(ctx: Context, destination: str, msg: ErrorMessage)
     await ctx.send(destination=destination, message=msg)
 
 
+@dataclass(frozen=True)
+class MessageRoute:
+    """
+    Everything needed to process an incoming message with a given schema digest.
+
+    Attributes:
+        model (type[Model]): The message model.
+        handler (MessageCallback): The message handler.
+        signed (bool): Whether the handler only accepts messages from agent addresses.
+        protocol (tuple[str, Protocol] | None): The digest and the protocol that
+        includes the message, if the protocol has a digest.
+    """
+
+    model: type[Model]
+    handler: MessageCallback
+    signed: bool
+    protocol: tuple[str, Protocol] | None
+
+
 class AgentRepresentation:
     """
     Represents an agent in the context of a message.
@@ -229,6 +271,7 @@ class Agent(Sink):
         _port (int): The port on which the agent's server runs.
         _background_tasks (set[asyncio.Task]): Set of background tasks associated with the agent.
         _resolver (Resolver): The resolver for agent communication.
+        _agent_search (AgentSearch): The cached search for agents supporting a protocol.
         _loop (asyncio.AbstractEventLoop): The asyncio event loop used by the agent.
         _logger: The logger instance for logging agent activities.
         _endpoints (list[AgentEndpoint]): List of endpoints at which the agent is reachable.
@@ -238,12 +281,15 @@ class Agent(Sink):
         _ledger: The client for interacting with the blockchain ledger.
         _almanac_contract: The almanac contract for registering agent addresses to endpoints.
         _storage: Key-value store for agent data storage.
+        _async_storage: Non-blocking adapter for the key-value store.
         _interval_handlers (list[tuple[IntervalCallback, float]]): List of interval
         handlers and their periods.
         _interval_messages (set[str]): Set of message digests that may be sent by interval tasks.
         _signed_message_handlers (dict[str, MessageCallback]): Handlers for signed messages.
         _unsigned_message_handlers (dict[str, MessageCallback]): Handlers for
         unsigned messages.
+        _message_routes (dict[str, MessageRoute]): The model, handler and protocol of
+        each supported message digest, built when protocols are included.
         _message_history (EnvelopeHistory): History of messages received by the agent.
         _models (dict[str, type[Model]]): Dictionary mapping supported message digests to messages.
         _replies (dict[str, dict[str, type[Model]]]): Dictionary of allowed replies for each type
@@ -252,10 +298,17 @@ class Agent(Sink):
         Futures.
         _dispatcher: The dispatcher for internal handling/sorting of messages.
         _dispenser: The dispatcher for external message handling.
-        _message_queue: Asynchronous queue for incoming messages.
+        _transport (HttpTransport): The pooled HTTP transport for outbound messages.
+        _verification_pool (VerificationPool | None): The pool used to verify inbound
+        envelope signatures off the event loop.
+        _message_pool (MessageWorkerPool): The queue and workers for incoming messages.
+        _message_slots (asyncio.Semaphore | None): Limits the number of message handlers
+        running at once when handling messages concurrently.
         _message_tasks: A set for storing message handler tasks
             to prevent the GC from deleting them.
         _handle_messages_concurrently (bool): Whether to handle incoming messages concurrently.
+        _serialize_local_messages (bool): Whether messages to agents in the same process
+        are serialized to JSON.
         _on_startup (list[Callable]): List of functions to run on agent startup.
         _on_shutdown (list[Callable]): List of functions to run on agent shutdown.
         _version (str): The version of the agent.
@@ -277,7 +330,7 @@ class Agent(Sink):
         address (str): The address of the agent used for communication.
         identifier (str): The Agent Identifier, including network prefix and address.
         wallet (LocalWallet): The agent's wallet for transacting on the ledger.
-        storage (KeyValueStore): The key-value store for storage operations.
+        storage (StorageAPI): The key-value store for storage operations.
         agentverse (AgentverseConfig): The agentverse configuration for the agent.
         mailbox_client (MailboxClient): The client for interacting with the agentverse mailbox.
         protocols (dict[str, Protocol]): Dictionary mapping all supported protocol digests to their
@@ -314,6 +367,18 @@ class Agent(Sink):
         handle_messages_concurrently: bool = False,
         shutdown_timeout: float = 60.0,
         mark_inactive_on_shutdown: bool = True,
+        transport: HttpTransport | None = None,
+        dispenser_concurrency: int = DISPENSER_MAX_CONCURRENCY,
+        dispenser_batch_window: float = DISPENSER_BATCH_WINDOW_SECONDS,
+        verification_pool: VerificationPool | None = None,
+        storage: StorageAPI | None = None,
+        message_workers: int = MESSAGE_WORKERS,
+        message_queue_size: int = 0,
+        message_queue_policy: QueuePolicy = "block",
+        order_messages_by_session: bool = True,
+        max_messages_in_flight: int | None = None,
+        serialize_local_messages: bool = True,
+        response_compression_threshold: int | None = None,
     ):
         """
         Initialize an Agent instance.
@@ -350,6 +415,38 @@ class Agent(Sink):
             mark_inactive_on_shutdown (bool): Whether to mark the agent as inactive in Almanac
             during shutdown. Set to False for deployments where a new instance replaces this one
             (e.g., Kubernetes rolling updates). Defaults to True.
+            transport (HttpTransport | None): The pooled HTTP transport used for outbound
+            messages. A new transport is created if not provided.
+            dispenser_concurrency (int): The maximum number of outbound envelopes sent
+            concurrently. Envelopes for the same destination are always sent in order.
+            Defaults to 1 (sequential sending).
+            dispenser_batch_window (float): The time in seconds outbound envelopes to the
+            same endpoint are collected for to send them in a single batch request.
+            Defaults to 0 (no batching).
+            verification_pool (VerificationPool | None): The worker pool used to verify the
+            signatures of inbound envelopes. Signatures are verified on the event loop if
+            not provided.
+            storage (StorageAPI | None): The key-value store used for agent data storage.
+            Defaults to a `KeyValueStore` named after the agent address.
+            message_workers (int): The number of workers processing incoming messages.
+            message_queue_size (int): The maximum number of queued incoming messages.
+            Defaults to 0 (unbounded).
+            message_queue_policy (QueuePolicy): What to do with an incoming message when
+            the queue is full: wait for space ("block"), reject it so that the sender
+            retries later ("reject") or drop the oldest queued message ("drop_oldest").
+            Error messages and requests of waiting sync senders are always processed
+            first.
+            order_messages_by_session (bool): Whether messages from the same sender and
+            session are processed in order when using multiple message workers.
+            max_messages_in_flight (int | None): The maximum number of message handlers
+            running at once when handling messages concurrently. Unbounded if not provided.
+            serialize_local_messages (bool): Whether messages sent to agents in the same
+            process are serialized to JSON. If False, the receiving agent gets a copy of the
+            message object (or the object itself if its model is immutable) and the message
+            is only serialized when needed, e.g. for the message history. Defaults to True.
+            response_compression_threshold (int | None): Compress server responses of at
+            least this many bytes with an encoding the client accepts. Compressed requests
+            are always accepted. Defaults to None (no response compression).
         """
         self._init_done = False
         self._name = name
@@ -370,10 +467,16 @@ class Agent(Sink):
             endpoint, self._agentverse, mailbox, proxy, self._logger
         )
 
+        self._verification_pool = verification_pool
+        self._transport = transport or HttpTransport()
         self._use_mailbox = is_mailbox_agent(self._endpoints, self._agentverse)
         if self._use_mailbox:
             self._mailbox_client = MailboxClient(
-                self._identity, self._agentverse, self._logger
+                self._identity,
+                self._agentverse,
+                self._logger,
+                verification_pool=self._verification_pool,
+                transport=self._transport,
             )
         else:
             self._mailbox_client = None
@@ -383,14 +486,17 @@ class Agent(Sink):
             max_endpoints=max_resolver_endpoints,
             almanac_api_url=self._almanac_api_url,
         )
+        self._agent_search = AgentSearch(transport=self._transport)
 
         self._ledger = get_ledger(network)
         self._almanac_contract = get_almanac_contract(network)
-        self._storage = KeyValueStore(self.address[0:16])
+        self._storage = storage or KeyValueStore(self.address[0:16])
+        self._async_storage = ExecutorStorageAdapter(self._storage)
         self._interval_handlers: list[tuple[IntervalCallback, float]] = []
         self._interval_messages: set[str] = set()
         self._signed_message_handlers: dict[str, MessageCallback] = {}
         self._unsigned_message_handlers: dict[str, MessageCallback] = {}
+        self._message_routes: dict[str, MessageRoute] = {}
         self._rest_handlers: RestHandlerMap = {}
         self._models: dict[str, type[Model]] = {}
         self._replies: dict[str, dict[str, type[Model]]] = {}
@@ -406,8 +512,25 @@ class Agent(Sink):
             if enable_agent_inspector or store_message_history
             else None
         )
-        self._dispenser = Dispenser()
-        self._message_queue = asyncio.Queue()
+        self._dispenser = Dispenser(
+            transport=self._transport,
+            max_concurrency=dispenser_concurrency,
+            batch_window=dispenser_batch_window,
+        )
+        self._message_pool = MessageWorkerPool(
+            self._process_single_message,
+            num_workers=message_workers,
+            max_queue_size=message_queue_size,
+            ordered=order_messages_by_session,
+            policy=message_queue_policy,
+            priority=self._message_priority,
+            logger=self._logger,
+        )
+        self._message_slots: asyncio.Semaphore | None = (
+            asyncio.Semaphore(max_messages_in_flight)
+            if max_messages_in_flight is not None
+            else None
+        )
         self._message_tasks: set[asyncio.Task] = set()
         self._interval_tasks: set[asyncio.Task] = set()
         self._rest_tasks: set[asyncio.Task] = set()
@@ -415,6 +538,7 @@ class Agent(Sink):
         self._dispenser_task: asyncio.Task | None = None
         self._message_queue_task: asyncio.Task | None = None
         self._handle_messages_concurrently = handle_messages_concurrently
+        self._serialize_local_messages = serialize_local_messages
         self._shutdown_timeout = shutdown_timeout
         self._mark_inactive_on_shutdown = mark_inactive_on_shutdown
         self._on_startup = []
@@ -423,6 +547,13 @@ class Agent(Sink):
         self._prefix: AddressPrefix = (
             MAINNET_PREFIX if network == "mainnet" else TESTNET_PREFIX
         )
+        # shared by all contexts, the represented attributes never change
+        self._representation = AgentRepresentation(
+            address=self.address,
+            name=self._name,
+            identity=self._identity,
+            prefix=self._prefix,
+        )
         self._version = version or "0.1.0"
         self._registration_policy = registration_policy or None
 
@@ -463,6 +594,8 @@ class Agent(Sink):
             loop=self._loop,
             queries=self._queries,
             logger=self._logger,
+            verification_pool=self._verification_pool,
+            response_compression_threshold=response_compression_threshold,
         )
 
         # define default error message handler
@@ -553,19 +686,17 @@ class Agent(Sink):
             InternalContext: The internal context for the agent.
         """
         return InternalContext(
-            agent=AgentRepresentation(
-                address=self.address,
-                name=self._name,
-                identity=self._identity,
-                prefix=self._prefix,
-            ),
+            agent=self._representation,
             storage=self._storage,
+            async_storage=self._async_storage,
             ledger=self._ledger,
             resolver=self._resolver,
             dispenser=self._dispenser,
+            agent_search=self._agent_search,
             interval_messages=self._interval_messages,
             logger=self._logger,
             message_history=self._message_history,
+            serialize_local_messages=self._serialize_local_messages,
         )
 
     def _initialize_wallet_and_identity(
@@ -676,12 +807,12 @@ class Agent(Sink):
         return self._ledger
 
     @property
-    def storage(self) -> KeyValueStore:
+    def storage(self) -> StorageAPI:
         """
         Get the key-value store used by the agent for data storage.
 
         Returns:
-            KeyValueStore: The key-value store instance.
+            StorageAPI: The key-value store instance.
         """
         return self._storage
 
@@ -705,6 +836,16 @@ class Agent(Sink):
         """
         return self._mailbox_client
 
+    @property
+    def message_metrics(self) -> MessageWorkerPoolMetrics:
+        """
+        Get the queue depth and processing metrics of the incoming messages.
+
+        Returns:
+            MessageWorkerPoolMetrics: The metrics snapshot.
+        """
+        return self._message_pool.metrics
+
     @property
     def balance(self) -> int:
         """
@@ -819,6 +960,30 @@ class Agent(Sink):
         """
         self._queries = queries
 
+    def update_transport(self, transport: HttpTransport):
+        """
+        Update the HTTP transport used for outbound messages.
+
+        Args:
+            transport (HttpTransport): The new transport.
+        """
+        self._transport = transport
+        self._dispenser.update_transport(transport)
+        self._agent_search.update_transport(transport)
+        if self._mailbox_client is not None:
+            self._mailbox_client.update_transport(transport)
+
+    def update_verification_pool(self, pool: VerificationPool):
+        """
+        Update the pool used to verify the signatures of inbound envelopes.
+
+        Args:
+            pool (VerificationPool): The new verification pool.
+        """
+        self._verification_pool = pool
+        if self._mailbox_client is not None:
+            self._mailbox_client.update_verification_pool(pool)
+
     def update_registration_policy(self, policy: AgentRegistrationPolicy):
         """
         Update the registration policy.
@@ -1039,23 +1204,30 @@ class Agent(Sink):
 
         self._interval_messages.update(protocol.interval_messages)
 
+        protocol_info = (
+            (protocol.digest, protocol) if protocol.digest is not None else None
+        )
         for schema_digest in protocol.models:
             if schema_digest in self._models:
                 raise RuntimeError("Unable to register duplicate model")
             if schema_digest in self._signed_message_handlers:
                 raise RuntimeError("Unable to register duplicate message handler")
             if schema_digest in protocol.signed_message_handlers:
-                self._signed_message_handlers[schema_digest] = (
-                    protocol.signed_message_handlers[schema_digest]
-                )
+                handler = protocol.signed_message_handlers[schema_digest]
+                self._signed_message_handlers[schema_digest] = handler
             elif schema_digest in protocol.unsigned_message_handlers:
-                self._unsigned_message_handlers[schema_digest] = (
-                    protocol.unsigned_message_handlers[schema_digest]
-                )
+                handler = protocol.unsigned_message_handlers[schema_digest]
+                self._unsigned_message_handlers[schema_digest] = handler
             else:
                 raise RuntimeError("Unable to lookup up message handler in protocol")
 
             self._models[schema_digest] = protocol.models[schema_digest]
+            self._message_routes[schema_digest] = MessageRoute(
+                model=protocol.models[schema_digest],
+                handler=handler,
+                signed=schema_digest in self._signed_message_handlers,
+                protocol=protocol_info,
+            )
 
             if schema_digest in protocol.replies:
                 self._replies[schema_digest] = protocol.replies[schema_digest]
@@ -1092,8 +1264,28 @@ class Agent(Sink):
         except aiohttp.ClientError as ex:
             self._logger.warning(f"Unable to publish manifest: {ex}")
 
+    def _message_priority(self, item: MessageItem) -> int:
+        """
+        Get the priority of an incoming message, lower values are processed first.
+
+        Args:
+            item (MessageItem): The (schema_digest, sender, message, session) item.
+
+        Returns:
+            int: 0 for error messages and requests of senders waiting for a sync
+            response, 1 otherwise.
+        """
+        schema_digest, sender, _, _ = item
+        if schema_digest == ERROR_MESSAGE_DIGEST or sender in self._queries:
+            return 0
+        return 1
+
     async def handle_message(
-        self, sender, schema_digest: str, message: JsonStr, session: uuid.UUID
+        self,
+        sender,
+        schema_digest: str,
+        message: JsonStr | LocalMessage,
+        session: uuid.UUID,
     ):
         """
         Handle an incoming message.
@@ -1101,10 +1293,14 @@ class Agent(Sink):
         Args:
             sender: The sender of the message.
             schema_digest (str): The digest of the message schema.
-            message (JsonStr): The message content in JSON format.
+            message (JsonStr | LocalMessage): The message content in JSON format, or the
+            message object if sent by an agent in the same process.
             session (uuid.UUID): The session UUID.
+
+        Raises:
+            QueueFullError: If the message queue is full and the policy is "reject".
         """
-        await self._message_queue.put((schema_digest, sender, message, session))
+        await self._message_pool.put((schema_digest, sender, message, session))
 
     async def handle_rest(
         self, method: RestMethod, endpoint: str, message: Model | None
@@ -1210,11 +1406,21 @@ class Agent(Sink):
         # Run shutdown handlers
         await self.run_shutdown_tasks()
 
+        # Persist any buffered storage writes
+        self._storage.close()
+
         # Shutdown dispenser, which will try to send any queued outgoing messages first
         if self._dispenser_task:
             self._dispenser_task.cancel()
             await asyncio.gather(self._dispenser_task, return_exceptions=True)
 
+        # Release pooled outbound connections
+        await self._transport.close()
+
+        # Stop the signature verification workers
+        if self._verification_pool is not None:
+            self._verification_pool.shutdown()
+
     def setup(self):
         """
         Include the internal agent protocol, run startup tasks, and start background tasks.
@@ -1347,10 +1553,8 @@ class Agent(Sink):
         self, message_schema_digest
     ) -> tuple[str, Protocol] | None:
         """Get the protocol for a given message schema digest."""
-        for protocol_digest, protocol in self.protocols.items():
-            if message_schema_digest in protocol.models:
-                return (protocol_digest, protocol)
-        return None
+        route = self._message_routes.get(message_schema_digest)
+        return route.protocol if route is not None else None
 
     async def _handle_message(
         self,
@@ -1374,7 +1578,7 @@ class Agent(Sink):
         self,
         schema_digest: str,
         sender: str,
-        message: JsonStr,
+        message: JsonStr | LocalMessage,
         session: uuid.UUID,
     ) -> None:
         """
@@ -1383,18 +1587,19 @@ class Agent(Sink):
         Args:
             schema_digest (str): The schema digest of the message.
             sender (str): The sender address.
-            message (JsonStr): The message content.
+            message (JsonStr | LocalMessage): The message content.
             session (uuid.UUID): The session UUID.
         """
-        # lookup the model definition
-        model_class: type[Model] | None = self._models.get(schema_digest)
-        if model_class is None:
+        # lookup the model definition, handler and protocol
+        route = self._message_routes.get(schema_digest)
+        if route is None:
             self._logger.warning(
                 f"Received message with unrecognized schema digest: {schema_digest}"
             )
             return
 
-        protocol_info = self.get_message_protocol(schema_digest)
+        model_class = route.model
+        protocol_info = route.protocol
         protocol_digest = protocol_info[0] if protocol_info else None
 
         if self._message_history:
@@ -1402,25 +1607,22 @@ class Agent(Sink):
                 EnvelopeHistoryEntry(
                     version=1,
                     sender=sender,
-                    target=self.address,
+                    target=self._representation.address,
                     session=session,
                     schema_digest=schema_digest,
                     protocol_digest=protocol_digest,
-                    payload=message,
+                    payload=message_json(message),
                 )
             )
 
         context = ExternalContext(
-            agent=AgentRepresentation(
-                address=self.address,
-                name=self._name,
-                identity=self._identity,
-                prefix=self._prefix,
-            ),
+            agent=self._representation,
             storage=self._storage,
+            async_storage=self._async_storage,
             ledger=self._ledger,
             resolver=self._resolver,
             dispenser=self._dispenser,
+            agent_search=self._agent_search,
             logger=self._logger,
             queries=self._queries,
             session=session,
@@ -1430,6 +1632,7 @@ class Agent(Sink):
             ),
             protocol=protocol_info,
             message_history=self._message_history,
+            serialize_local_messages=self._serialize_local_messages,
         )
 
         # sanity check
@@ -1439,7 +1642,7 @@ class Agent(Sink):
 
         # parse the received message
         try:
-            recovered = model_class.parse_raw(message)
+            recovered = parse_message(model_class, message)
         except ValidationError as ex:
             self._logger.warning(f"Unable to parse message: {ex}")
             await _send_error_message(
@@ -1451,75 +1654,44 @@ class Agent(Sink):
             )
             return
 
-        # attempt to find the handler
-        handler: MessageCallback | None = self._unsigned_message_handlers.get(
-            schema_digest
-        )
-        if handler is None:
-            if not is_user_address(sender):
-                handler = self._signed_message_handlers.get(schema_digest)
-            elif schema_digest in self._signed_message_handlers:
-                await _send_error_message(
-                    context,
-                    sender,
-                    ErrorMessage(
-                        error="Message must be sent from verified agent address"
-                    ),
-                )
-                return
-
-        if handler is not None:
-            if self._handle_messages_concurrently:
-                handler_task = asyncio.create_task(
-                    self._handle_message(
-                        handler=handler,
-                        context=context,
-                        sender=sender,
-                        model_class=model_class,
-                        message=recovered,
-                    )
-                )
-                self._message_tasks.add(handler_task)
-                handler_task.add_done_callback(self._message_tasks.discard)
-            else:
-                await self._handle_message(
-                    handler=handler,
+        # signed handlers only accept messages from agents
+        if route.signed and is_user_address(sender):
+            await _send_error_message(
+                context,
+                sender,
+                ErrorMessage(error="Message must be sent from verified agent address"),
+            )
+            return
+
+        if self._handle_messages_concurrently:
+            if self._message_slots is not None:
+                await self._message_slots.acquire()
+            handler_task = asyncio.create_task(
+                self._handle_message(
+                    handler=route.handler,
                     context=context,
                     sender=sender,
                     model_class=model_class,
                     message=recovered,
                 )
+            )
+            self._message_tasks.add(handler_task)
+            handler_task.add_done_callback(self._message_tasks.discard)
+            if self._message_slots is not None:
+                slots = self._message_slots
+                handler_task.add_done_callback(lambda _: slots.release())
+        else:
+            await self._handle_message(
+                handler=route.handler,
+                context=context,
+                sender=sender,
+                model_class=model_class,
+                message=recovered,
+            )
 
     async def _process_message_queue(self):
-        """Process the message queue."""
-        try:
-            while True:
-                (
-                    schema_digest,
-                    sender,
-                    message,
-                    session,
-                ) = await self._message_queue.get()
-                await self._process_single_message(
-                    schema_digest, sender, message, session
-                )
-        except (asyncio.CancelledError, KeyboardInterrupt):
-            # Drain remaining messages from queue using get_nowait()
-            while not self._message_queue.empty():
-                try:
-                    schema_digest, sender, message, session = (
-                        self._message_queue.get_nowait()
-                    )
-                    await self._process_single_message(
-                        schema_digest, sender, message, session
-                    )
-                except asyncio.QueueEmpty:
-                    break
-                except Exception as ex:
-                    # Log error but continue draining to prevent message loss
-                    self._logger.error(
-                        f"Error processing message during shutdown: {ex}"
-                    )
+        """Process the message queue, draining the remaining messages on shutdown."""
+        await self._message_pool.run()
 
 
 class Bureau:
@@ -1542,6 +1714,9 @@ class Bureau:
         _use_mailbox (bool): A flag indicating whether mailbox functionality is enabled for any
         of the agents.
         _registration_policy (AgentRegistrationPolicy): The registration policy for the bureau.
+        _transport (HttpTransport): The pooled HTTP transport shared by all agents.
+        _verification_pool (VerificationPool | None): The pool used to verify inbound
+        envelope signatures off the event loop.
     """
 
     def __init__(
@@ -1558,6 +1733,9 @@ class Bureau:
         loop: asyncio.AbstractEventLoop | None = None,
         log_level: int | str = logging.INFO,
         shutdown_timeout: int = 60,
+        transport: HttpTransport | None = None,
+        verification_pool: VerificationPool | None = None,
+        response_compression_threshold: int | None = None,
     ):
         """
         Initialize a Bureau instance.
@@ -1575,23 +1753,35 @@ class Bureau:
             loop (asyncio.AbstractEventLoop | None): The event loop.
             log_level (int | str): The logging level for the bureau.
             shutdown_timeout (int): The timeout for shutting down the bureau.
+            transport (HttpTransport | None): The pooled HTTP transport shared by all agents
+            for outbound messages. A new transport is created if not provided.
+            verification_pool (VerificationPool | None): The worker pool used to verify the
+            signatures of inbound envelopes for all agents. Signatures are verified on the
+            event loop if not provided.
+            response_compression_threshold (int | None): Compress server responses of at
+            least this many bytes with an encoding the client accepts. Compressed requests
+            are always accepted. Defaults to None (no response compression).
         """
         self._loop = loop or asyncio.get_event_loop_policy().get_event_loop()
         self._agents: list[Agent] = []
         self._port = port or 8000
         self._queries: dict[str, asyncio.Future] = {}
         self._logger = get_logger("bureau", log_level)
+        self._verification_pool = verification_pool
         self._server = ASGIServer(
             port=self._port,
             loop=self._loop,
             queries=self._queries,
             logger=self._logger,
+            verification_pool=self._verification_pool,
+            response_compression_threshold=response_compression_threshold,
         )
         self._agentverse = parse_agentverse_config(agentverse)
         self._endpoints = parse_endpoint_config(
             endpoint, self._agentverse, False, False, self._logger
         )
         self._shutdown_timeout = shutdown_timeout
+        self._transport = transport or HttpTransport()
         self._use_mailbox = any(
             is_mailbox_agent(agent._endpoints, self._agentverse)
             for agent in self._agents
@@ -1641,6 +1831,9 @@ class Bureau:
         """
         agent.update_loop(self._loop)
         agent.update_queries(self._queries)
+        agent.update_transport(self._transport)
+        if self._verification_pool is not None:
+            agent.update_verification_pool(self._verification_pool)
         if is_mailbox_agent(agent._endpoints, self._agentverse):
             self._use_mailbox = True
         else:
@@ -1650,7 +1843,7 @@ class Bureau:
                     f"with the Bureau's endpoints {self._endpoints}."
                 )
             agent.update_endpoints(self._endpoints)
-        self._server._rest_handler_map.update(agent._server._rest_handler_map)
+        self._server.update_rest_endpoints(agent._server._rest_handler_map)
 
         # Run the batch Almanac API registration by default and only run the agent's
         # ledger registration if the Bureau is not using a batch ledger registration
@@ -1773,29 +1966,61 @@ class Bureau:
 
             # Run agent's shutdown handlers
             await agent.run_shutdown_tasks()
+            agent._storage.close()
 
             # Shutdown agent's dispenser
             if agent._dispenser_task:
                 agent._dispenser_task.cancel()
                 await asyncio.gather(agent._dispenser_task, return_exceptions=True)
 
+            if agent._verification_pool is not None:
+                agent._verification_pool.shutdown()
+
+        # Release pooled outbound connections shared by all agents
+        await self._transport.close()
+
+        # Stop the signature verification workers
+        if self._verification_pool is not None:
+            self._verification_pool.shutdown()
+
+    def _start_agents(self, sock: socket.socket | None = None) -> list[Coroutine]:
+        """
+        Set up the agents of the bureau and prepare the server and mailbox polling.
+
+        Args:
+            sock (socket.socket | None): An already bound listening socket for the server.
+
+        Returns:
+            list[Coroutine]: The coroutines receiving messages for the agents.
+        """
+        coros = [self._server.serve(sock=sock)]
+        mailbox_clients: list[MailboxClient] = []
+        for agent in self._agents:
+            agent.setup()
+            if (
+                is_mailbox_agent(agent._endpoints, self._agentverse)
+                and agent.mailbox_client is not None
+            ):
+                mailbox_clients.append(agent.mailbox_client)
+        if mailbox_clients:
+            # poll all mailboxes from a single task over the shared transport
+            coros.append(MailboxMultiplexer(mailbox_clients, logger=self._logger).run())
+        return coros
+
     async def run_async(self):
         """Run the agents managed by the bureau."""
-        coros = [self._server.serve()]
         if not self._agents:
             self._logger.warning("No agents to run.")
             return
+        coros = self._start_agents()
         for agent in self._agents:
-            agent.setup()
             self._registration_policy.add_agent(agent.info, agent._identity)
-            if (
-                is_mailbox_agent(agent._endpoints, self._agentverse)
-                and agent.mailbox_client is not None
-            ):
-                coros.append(agent.mailbox_client.run())
 
         self._loop.create_task(self._schedule_registration())
+        await self._run_until_shutdown(coros)
 
+    async def _run_until_shutdown(self, coros: list[Coroutine]):
+        """Run the given coroutines until cancelled, then shut down the agents."""
         # Convert coroutines to tasks
         tasks = [self._loop.create_task(coro) for coro in coros]
 
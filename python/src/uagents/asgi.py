@@ -1,6 +1,7 @@
 import asyncio
 import contextlib
 import json
+import socket
 from datetime import datetime, timezone
 from logging import Logger
 from typing import Any
@@ -13,29 +14,117 @@ from requests.structures import CaseInsensitiveDict
 from uagents_core.envelope import Envelope
 from uagents_core.identity import is_user_address
 from uagents_core.models import ERROR_MESSAGE_DIGEST, ErrorMessage, Model
+from uagents_core.types import DeliveryStatus
 
 from uagents.communication import enclose_response_raw
-from uagents.config import DEFAULT_ENVELOPE_TIMEOUT_SECONDS, RESPONSE_TIME_HINT_SECONDS
+from uagents.compression import (
+    DecompressedSizeError,
+    DecompressionError,
+    UnsupportedEncodingError,
+    compress,
+    decompress,
+    negotiate_encoding,
+    supported_encodings,
+)
+from uagents.config import (
+    DEFAULT_ENVELOPE_TIMEOUT_SECONDS,
+    MAX_REQUEST_BODY_SIZE_BYTES,
+    RESPONSE_TIME_HINT_SECONDS,
+)
 from uagents.dispatch import dispatcher
 from uagents.types import RestHandlerDetails, RestMethod
 from uagents.utils import get_logger
+from uagents.verification import VerificationPool, verify_envelope
+from uagents.wire import decode_envelope, is_msgpack, msgpack_available
+from uagents.workers import QueueFullError
 
 HOST = "0.0.0.0"
 
-RESERVED_ENDPOINTS = ["/submit", "/messages", "/agent_info", "/connect", "/disconnect"]
+RESERVED_ENDPOINTS = [
+    "/submit",
+    "/submit/batch",
+    "/messages",
+    "/agent_info",
+    "/connect",
+    "/disconnect",
+]
 
+# pydantic error types raised when the body is not valid JSON at all
+JSON_DECODE_ERRORS = {"json_invalid", "json_type"}
 
-async def _read_asgi_body(receive):
-    """Read the entire body of an ASGI message."""
-    body = b""
-    more_body = True
 
+class BodyTooLargeError(ValueError):
+    """Raised when a request body exceeds the configured maximum size."""
+
+
+class RequestRejectedError(Exception):
+    """Raised when a request was rejected and the response has already been sent."""
+
+
+async def _read_asgi_body(receive, max_size: int | None = None) -> bytes:
+    """
+    Read the entire body of an ASGI message.
+
+    Args:
+        receive: The ASGI receive callable.
+        max_size (int | None): The maximum body size in bytes, or None for no limit.
+
+    Returns:
+        bytes: The request body.
+
+    Raises:
+        BodyTooLargeError: If the body exceeds `max_size` bytes.
+    """
+    message = await receive()
+    more_body = message.get("more_body", False)
+    chunk = message.get("body", b"")
+    if max_size is not None and len(chunk) > max_size:
+        raise BodyTooLargeError(f"Request body exceeds {max_size} bytes")
+    if not more_body:  # single chunk, no need to copy
+        return bytes(chunk)
+
+    body = bytearray(chunk)
     while more_body:
         message = await receive()
         body += message.get("body", b"")
         more_body = message.get("more_body", False)
+        if max_size is not None and len(body) > max_size:
+            raise BodyTooLargeError(f"Request body exceeds {max_size} bytes")
 
-    return body
+    return bytes(body)
+
+
+def _parse_envelope_batch(raw_contents: bytes, ndjson: bool) -> list[Envelope | str]:
+    """
+    Parse a batch of envelopes sent as a JSON array or as NDJSON (one per line).
+
+    Args:
+        raw_contents (bytes): The request body.
+        ndjson (bool): Whether the body is NDJSON rather than a JSON array.
+
+    Returns:
+        list[Envelope | str]: The envelopes, or an error for each invalid envelope.
+
+    Raises:
+        ValueError: If the body is not a batch of envelopes at all.
+    """
+    if ndjson:
+        items: list[Any] = [line for line in raw_contents.splitlines() if line.strip()]
+    else:
+        items = json.loads(raw_contents or b"null")
+        if not isinstance(items, list):
+            raise ValueError("batch must be a JSON array")
+
+    envelopes: list[Envelope | str] = []
+    for item in items:
+        try:
+            if ndjson:
+                envelopes.append(Envelope.model_validate_json(item))
+            else:
+                envelopes.append(Envelope.model_validate(item))
+        except ValidationError:
+            envelopes.append("contents do not match envelope schema")
+    return envelopes
 
 
 class ASGIServer:
@@ -47,6 +136,9 @@ class ASGIServer:
         loop: asyncio.AbstractEventLoop,
         queries: dict[str, asyncio.Future],
         logger: Logger | None = None,
+        verification_pool: VerificationPool | None = None,
+        max_body_size: int | None = MAX_REQUEST_BODY_SIZE_BYTES,
+        response_compression_threshold: int | None = None,
     ):
         """
         Initialize the ASGI server.
@@ -56,6 +148,14 @@ class ASGIServer:
             loop (asyncio.AbstractEventLoop): The event loop to use.
             queries (dict[str, asyncio.Future]): The dictionary of queries to resolve.
             logger (Logger | None): The logger to use.
+            verification_pool (VerificationPool | None): The pool used to verify envelope
+            signatures off the event loop. Signatures are verified inline if not provided.
+            max_body_size (int | None): The maximum accepted request body size in bytes.
+            Larger requests are rejected with 413. None disables the limit. The limit
+            also applies to the decompressed size of compressed requests.
+            response_compression_threshold (int | None): Compress responses of at least
+            this many bytes with an encoding the client accepts. None disables response
+            compression.
         """
         self._port = int(port)
         self._loop = loop
@@ -63,8 +163,15 @@ class ASGIServer:
         self._rest_handler_map: dict[
             tuple[str, RestMethod, str], RestHandlerDetails
         ] = {}
+        # index of the handlers above by (method, endpoint) for constant time routing
+        self._rest_routes: dict[
+            tuple[RestMethod, str], dict[str, RestHandlerDetails]
+        ] = {}
         self._logger = logger or get_logger("server")
         self._server: uvicorn.Server | None = None
+        self._verification_pool = verification_pool
+        self._max_body_size = max_body_size
+        self._response_compression_threshold = response_compression_threshold
 
     @property
     def server(self) -> uvicorn.Server | None:
@@ -80,31 +187,41 @@ class ASGIServer:
         response: type[Model | BaseModel],
     ):
         """Add a REST endpoint to the server."""
-        self._rest_handler_map[(address, method, endpoint)] = RestHandlerDetails(
-            method=method,
-            endpoint=endpoint,
-            request_model=request,
-            response_model=response,
+        self._add_rest_handler(
+            address,
+            RestHandlerDetails(
+                method=method,
+                endpoint=endpoint,
+                request_model=request,
+                response_model=response,
+            ),
         )
 
+    def update_rest_endpoints(
+        self, handler_map: dict[tuple[str, RestMethod, str], RestHandlerDetails]
+    ):
+        """Add all REST endpoints of another server (e.g. of an agent joining a bureau)."""
+        for (address, _, _), details in handler_map.items():
+            self._add_rest_handler(address, details)
+
+    def _add_rest_handler(self, address: str, details: RestHandlerDetails):
+        self._rest_handler_map[(address, details.method, details.endpoint)] = details
+        self._rest_routes.setdefault((details.method, details.endpoint), {})[
+            address
+        ] = details
+
     def has_rest_endpoint(self, method: RestMethod, endpoint: str) -> bool:
         """Check if the server has a REST endpoint registered."""
         if endpoint in RESERVED_ENDPOINTS:
             self._logger.warning(f"Endpoint {endpoint} is reserved")
             return True
-        return any(
-            meth == method and end == endpoint
-            for sink, meth, end in self._rest_handler_map
-        )
+        return (method, endpoint) in self._rest_routes
 
     def _get_rest_handler_details(
         self, method: RestMethod, endpoint: str
     ) -> dict[str, RestHandlerDetails]:
-        handlers = {}
-        for sink, meth, end in self._rest_handler_map:
-            if meth == method and end == endpoint:
-                handlers[sink] = self._rest_handler_map[(sink, meth, end)]
-        return handlers
+        handlers = self._rest_routes.get((method, endpoint))
+        return dict(handlers) if handlers else {}
 
     async def _asgi_send(
         self,
@@ -112,6 +229,7 @@ class ASGIServer:
         status_code: int = 200,
         headers: dict[str, str] | None = None,
         body: dict[str, Any] | ErrorWrapper | None = None,
+        accept_encoding: bytes | None = None,
     ):
         header = (
             [[k.encode(), v.encode()] for k, v in headers.items()]
@@ -119,14 +237,6 @@ class ASGIServer:
             else [[b"content-type", b"application/json"]]
         )
 
-        await send(
-            {
-                "type": "http.response.start",
-                "status": status_code,
-                "headers": header,
-            }
-        )
-
         if body is None:
             encoded_body = (
                 b"{}" if [[b"content-type", b"application/json"]] in header else b""
@@ -134,6 +244,32 @@ class ASGIServer:
         else:
             encoded_body = json.dumps(body).encode()
 
+        if accept_encoding and not any(
+            name == b"accept-encoding" for name, _ in header
+        ):
+            # advertise the encodings request bodies may be compressed with
+            header.append(
+                [b"accept-encoding", ", ".join(supported_encodings()).encode()]
+            )
+
+        if (
+            accept_encoding
+            and self._response_compression_threshold is not None
+            and len(encoded_body) >= self._response_compression_threshold
+        ):
+            encoding = negotiate_encoding(accept_encoding)
+            if encoding is not None:
+                encoded_body = compress(encoded_body, encoding)
+                header.append([b"content-encoding", encoding.encode()])
+                header.append([b"vary", b"accept-encoding"])
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status_code,
+                "headers": header,
+            }
+        )
         await send({"type": "http.response.body", "body": encoded_body})
 
     async def handle_readiness_probe(self, headers: CaseInsensitiveDict, send):
@@ -162,6 +298,88 @@ class ASGIServer:
                     },
                 )
 
+    async def _read_body(self, headers: CaseInsensitiveDict, receive) -> bytes:
+        """
+        Read the request body, checking the declared content length first, and
+        decompress it according to its content encoding.
+
+        Raises:
+            BodyTooLargeError: If the body or the decompressed body exceeds the
+            maximum body size.
+            DecompressionError: If the body can not be decompressed.
+        """
+        if self._max_body_size is not None and b"content-length" in headers:
+            try:
+                content_length = int(headers[b"content-length"])  # type: ignore
+            except ValueError:
+                content_length = 0
+            if content_length > self._max_body_size:
+                raise BodyTooLargeError(
+                    f"Request body exceeds {self._max_body_size} bytes"
+                )
+        raw_contents = await _read_asgi_body(receive, self._max_body_size)
+        if b"content-encoding" not in headers:
+            return raw_contents
+        encoding: bytes = headers[b"content-encoding"]  # type: ignore
+        try:
+            return decompress(
+                raw_contents, encoding.decode(errors="replace"), self._max_body_size
+            )
+        except DecompressedSizeError as err:
+            raise BodyTooLargeError(str(err)) from err
+
+    async def _receive_body(self, headers: CaseInsensitiveDict, send, receive) -> bytes:
+        """
+        Read the request body, rejecting the request if it can not be read.
+
+        Raises:
+            RequestRejectedError: If the body can not be read, after the rejection was
+            sent.
+        """
+        try:
+            return await self._read_body(headers, receive)
+        except BodyTooLargeError as err:
+            await self.handle_payload_too_large(send)
+            raise RequestRejectedError from err
+        except UnsupportedEncodingError as err:
+            await self.handle_unsupported_encoding(send)
+            raise RequestRejectedError from err
+        except DecompressionError as err:
+            await self._asgi_send(
+                send=send, status_code=400, body={"error": "empty or invalid payload"}
+            )
+            raise RequestRejectedError from err
+
+    async def handle_payload_too_large(self, send):
+        """Reject a request with a body that exceeds the maximum body size."""
+        await self._asgi_send(
+            send=send, status_code=413, body={"error": "payload too large"}
+        )
+
+    async def handle_unsupported_encoding(self, send):
+        """Reject a request with a body compressed with an unsupported encoding."""
+        await self._asgi_send(
+            send=send,
+            status_code=415,
+            headers={
+                "content-type": "application/json",
+                "accept-encoding": ", ".join(supported_encodings()),
+            },
+            body={"error": "unsupported content-encoding"},
+        )
+
+    async def handle_queue_full(self, send, retry_after: int):
+        """Ask the sender to back off while the agent's message queue is full."""
+        await self._asgi_send(
+            send=send,
+            status_code=503,
+            headers={
+                "content-type": "application/json",
+                "retry-after": str(retry_after),
+            },
+            body={"error": "message queue is full, retry later"},
+        )
+
     async def handle_missing_content_type(self, headers: CaseInsensitiveDict, send):
         """Handle missing content type header."""
         # if connecting from browser, return a 200 OK
@@ -174,8 +392,107 @@ class ASGIServer:
                 body={"error": "missing header: content-type"},
             )
 
-    async def serve(self):
-        """Start the server."""
+    async def _verify_batch_envelope(self, env: Envelope | str) -> str | None:
+        """Verify an envelope of a batch, returning the error if it is not valid."""
+        if isinstance(env, str):
+            return env
+        if is_user_address(env.sender):
+            return None
+        try:
+            await verify_envelope(env, self._verification_pool)
+        except Exception as err:
+            self._logger.warning(f"Failed to verify envelope: {err}")
+            return str(err)
+        return None
+
+    async def _handle_batch_submit(self, headers: CaseInsensitiveDict, send, receive):
+        """
+        Handle a batch of envelopes, responding with the status of each envelope.
+
+        The envelopes are sent as a JSON array or, with the content type
+        `application/x-ndjson`, one per line. Signatures are verified concurrently and
+        the envelopes are dispatched in order. Batches can not be sent synchronously.
+        """
+        content_type: bytes = headers.get(b"content-type", b"")  # type: ignore
+        ndjson = b"application/x-ndjson" in content_type
+        if not ndjson and b"application/json" not in content_type:
+            await self._asgi_send(
+                send=send, status_code=400, body={"error": "invalid content-type"}
+            )
+            return
+
+        if headers.get(b"x-uagents-connection") == b"sync":  # type: ignore
+            await self._asgi_send(
+                send=send,
+                status_code=400,
+                body={"error": "sync envelopes can not be sent in a batch"},
+            )
+            return
+
+        try:
+            raw_contents = await self._receive_body(headers, send, receive)
+        except RequestRejectedError:
+            return
+
+        try:
+            envelopes = _parse_envelope_batch(raw_contents, ndjson)
+        except ValueError:
+            await self._asgi_send(
+                send=send, status_code=400, body={"error": "empty or invalid payload"}
+            )
+            return
+
+        errors: list[str | None] = await asyncio.gather(
+            *[self._verify_batch_envelope(env) for env in envelopes]
+        )
+
+        results: list[dict[str, Any]] = []
+        for env, error in zip(envelopes, errors, strict=True):
+            if not isinstance(env, Envelope) or error is not None:
+                results.append({"status": DeliveryStatus.FAILED.value, "detail": error})
+                continue
+            if not dispatcher.contains(env.target):
+                results.append(
+                    {
+                        "status": DeliveryStatus.FAILED.value,
+                        "detail": "unable to route envelope",
+                    }
+                )
+                continue
+            try:
+                await dispatcher.dispatch_msg(
+                    sender=env.sender,
+                    destination=env.target,
+                    schema_digest=env.schema_digest,
+                    message=env.decode_payload(),
+                    session=env.session,
+                )
+            except QueueFullError as err:
+                results.append(
+                    {
+                        "status": DeliveryStatus.FAILED.value,
+                        "detail": "message queue is full, retry later",
+                        "retry_after": err.retry_after,
+                    }
+                )
+                continue
+            results.append({"status": DeliveryStatus.DELIVERED.value})
+
+        await self._asgi_send(
+            send=send,
+            body={"results": results},
+            accept_encoding=headers.get(b"accept-encoding"),  # type: ignore
+        )
+
+    async def serve(self, sock: socket.socket | None = None):
+        """
+        Start the server.
+
+        Args:
+            sock (socket.socket | None): An already bound listening socket to serve on,
+            e.g. one shared by several processes. A new socket is bound to the port of
+            the server if not provided.
+        """
         config = uvicorn.Config(
             self,
             host=HOST,
@@ -195,7 +512,7 @@ class ASGIServer:
         )
 
         with contextlib.suppress(asyncio.CancelledError, KeyboardInterrupt):
-            await self._server.serve()
+            await self._server.serve(sockets=[sock] if sock is not None else None)
 
     async def _handle_rest(
         self,
@@ -204,7 +521,10 @@ class ASGIServer:
         send,
         receive,
     ):
-        raw_contents = await _read_asgi_body(receive)
+        try:
+            raw_contents = await self._receive_body(headers, send, receive)
+        except RequestRejectedError:
+            return
         received_request: Model | None = None
         if len(handlers) > 1:
             if b"x-uagents-address" not in headers:
@@ -276,7 +596,11 @@ class ASGIServer:
             return
 
         # return the validated response
-        await self._asgi_send(send=send, body=validated_response.model_dump())
+        await self._asgi_send(
+            send=send,
+            body=validated_response.model_dump(),
+            accept_encoding=headers.get(b"accept-encoding"),  # type: ignore
+        )
 
     async def __call__(self, scope, receive, send):  #  pylint: disable=too-many-branches
         """
@@ -312,6 +636,10 @@ class ASGIServer:
             await self._handle_rest(headers, handlers, send, receive)
             return
 
+        if request_path == "/submit/batch" and request_method == "POST":
+            await self._handle_batch_submit(headers, send, receive)
+            return
+
         # check if the request is for agent communication and reject if not
         if request_path != "/submit":
             await self._asgi_send(
@@ -327,30 +655,33 @@ class ASGIServer:
             await self.handle_missing_content_type(headers, send)
             return
 
-        if b"application/json" not in headers[b"content-type"]:  # type: ignore
+        content_type: bytes = headers[b"content-type"]  # type: ignore
+        binary = is_msgpack(content_type) and msgpack_available()
+        if not binary and b"application/json" not in content_type:
             await self._asgi_send(
                 send=send, status_code=400, body={"error": "invalid content-type"}
             )
             return
 
         # read the entire payload
-        raw_contents = await _read_asgi_body(receive)
-
         try:
-            contents = json.loads(raw_contents.decode())
-        except (AttributeError, UnicodeDecodeError, json.JSONDecodeError):
-            await self._asgi_send(
-                send=send, status_code=400, body={"error": "empty or invalid payload"}
-            )
+            raw_contents = await self._receive_body(headers, send, receive)
+        except RequestRejectedError:
             return
 
+        # parse the envelope straight from the raw bytes
         try:
-            env = Envelope.model_validate(contents)
-        except ValidationError:
+            env = decode_envelope(raw_contents, content_type)
+        except ValidationError as err:
+            if any(e["type"] in JSON_DECODE_ERRORS for e in err.errors()):
+                error = "empty or invalid payload"
+            else:
+                error = "contents do not match envelope schema"
+            await self._asgi_send(send=send, status_code=400, body={"error": error})
+            return
+        except ValueError:
             await self._asgi_send(
-                send=send,
-                status_code=400,
-                body={"error": "contents do not match envelope schema"},
+                send=send, status_code=400, body={"error": "empty or invalid payload"}
             )
             return
 
@@ -362,7 +693,7 @@ class ASGIServer:
 
         if not is_user_address(env.sender):  # verify signature if sent from agent
             try:
-                env.verify()
+                await verify_envelope(env, self._verification_pool)
             except Exception as err:
                 self._logger.warning(f"Failed to verify envelope: {err}")
                 await self._asgi_send(
@@ -376,13 +707,19 @@ class ASGIServer:
             )
             return
 
-        await dispatcher.dispatch_msg(
-            sender=env.sender,
-            destination=env.target,
-            schema_digest=env.schema_digest,
-            message=env.decode_payload(),
-            session=env.session,
-        )
+        try:
+            await dispatcher.dispatch_msg(
+                sender=env.sender,
+                destination=env.target,
+                schema_digest=env.schema_digest,
+                message=env.decode_payload(),
+                session=env.session,
+            )
+        except QueueFullError as err:
+            if expects_response:
+                self._queries.pop(env.sender, None)
+            await self.handle_queue_full(send, err.retry_after)
+            return
 
         # wait for any queries to be resolved
         if expects_response:
@@ -413,4 +750,8 @@ class ASGIServer:
         else:
             response = "{}"
 
-        await self._asgi_send(send=send, body=json.loads(response))
+        await self._asgi_send(
+            send=send,
+            body=json.loads(response),
+            accept_encoding=headers.get(b"accept-encoding"),  # type: ignore
+        )
@@ -4,7 +4,9 @@ import asyncio
 import json
 import logging
 import uuid
+from collections import deque
 from time import time
+from urllib.parse import urlsplit
 
 import aiohttp
 from pydantic import UUID4, ValidationError
@@ -13,22 +15,110 @@ from uagents_core.identity import Identity, is_user_address
 from uagents_core.models import Model
 from uagents_core.types import DeliveryStatus, MsgStatus
 
-from uagents.config import DEFAULT_ENVELOPE_TIMEOUT_SECONDS
+from uagents.compression import compress
+from uagents.config import (
+    DEFAULT_ENVELOPE_TIMEOUT_SECONDS,
+    DISPENSER_BATCH_WINDOW_SECONDS,
+    DISPENSER_MAX_BATCH_SIZE,
+    DISPENSER_MAX_CONCURRENCY,
+    DISPENSER_MAX_PENDING_ENVELOPES,
+)
 from uagents.dispatch import dispatcher
 from uagents.resolver import GlobalResolver, Resolver
-from uagents.types import JsonStr
+from uagents.transport import HttpTransport
+from uagents.types import JsonStr, LocalMessage
 from uagents.utils import get_logger
+from uagents.wire import JSON_CONTENT_TYPE, encode_envelope
+from uagents.workers import QueueFullError
 
 LOGGER: logging.Logger = get_logger("dispenser", logging.DEBUG)
 
 
+PendingEnvelope = tuple[Envelope, list[str], asyncio.Future, bool]
+
+
+class BatchNotSupportedError(Exception):
+    """Raised when an endpoint does not accept batches of envelopes."""
+
+
 class Dispenser:
-    """Dispenses messages externally."""
+    """
+    Dispenses messages externally.
+
+    By default envelopes are sent one at a time in the order they were queued. With a
+    concurrency greater than one, up to that many envelopes are in flight at once while
+    envelopes for the same destination agent are still delivered in order (unless
+    ordering is disabled). The number of in-flight requests per destination host is
+    bounded by the connection limits of the HTTP transport.
+
+    With a batch window, asynchronous envelopes for the same endpoint that are queued
+    within the window are coalesced and sent in a single request to the batch
+    submission endpoint of the agent server. Batches for the same endpoint are sent
+    one at a time, and envelopes are sent individually to endpoints that do not
+    support batches. Envelopes that fail within a batch are sent to the other endpoints
+    of their destination.
+    """
+
+    def __init__(
+        self,
+        transport: HttpTransport | None = None,
+        max_concurrency: int = DISPENSER_MAX_CONCURRENCY,
+        max_pending: int = DISPENSER_MAX_PENDING_ENVELOPES,
+        preserve_order: bool = True,
+        batch_window: float = DISPENSER_BATCH_WINDOW_SECONDS,
+        max_batch_size: int = DISPENSER_MAX_BATCH_SIZE,
+    ):
+        """
+        Initialize the dispenser.
+
+        Args:
+            transport (HttpTransport | None): The pooled HTTP transport used to deliver
+            envelopes. A new transport is created if not provided.
+            max_concurrency (int): The maximum number of envelopes sent concurrently.
+            max_pending (int): The number of queued or in-flight envelopes above which
+            senders have to wait before queueing more. 0 disables backpressure.
+            preserve_order (bool): Deliver envelopes for the same destination in order
+            when sending concurrently.
+            batch_window (float): The time in seconds to wait for more envelopes to the
+            same endpoint before sending a batch. 0 disables batching.
+            max_batch_size (int): The maximum number of envelopes sent in one batch.
+        """
+        self._envelopes: asyncio.Queue[PendingEnvelope] = asyncio.Queue()
+        self._transport = transport or HttpTransport()
+        self._max_concurrency = max(1, max_concurrency)
+        self._max_pending = max_pending
+        self._preserve_order = preserve_order
+        self._slots = asyncio.Semaphore(self._max_concurrency)
+        self._destination_queues: dict[str, deque[PendingEnvelope]] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._num_pending = 0
+        self._capacity = asyncio.Event()
+        self._capacity.set()
+        self._batch_window = batch_window
+        self._max_batch_size = max(1, max_batch_size)
+        self._batches: dict[str, list[PendingEnvelope]] = {}
+        self._batch_timers: dict[str, asyncio.TimerHandle] = {}
+        self._batch_queues: dict[str, deque[list[PendingEnvelope]]] = {}
+        self._unbatched_endpoints: set[str] = set()
+
+    @property
+    def transport(self) -> HttpTransport:
+        """The HTTP transport used to deliver envelopes."""
+        return self._transport
+
+    @property
+    def num_pending(self) -> int:
+        """The number of envelopes queued or in flight."""
+        return self._num_pending
+
+    def update_transport(self, transport: HttpTransport) -> None:
+        """
+        Replace the HTTP transport used to deliver envelopes.
 
-    def __init__(self):
-        self._envelopes: asyncio.Queue[
-            tuple[Envelope, list[str], asyncio.Future, bool]
-        ] = asyncio.Queue()
+        Args:
+            transport (HttpTransport): The new transport.
+        """
+        self._transport = transport
 
     def add_envelope(
         self,
@@ -46,8 +136,22 @@ class Dispenser:
             response_future (asyncio.Future): The future to set the response on.
             sync (bool): True if the message is synchronous. Defaults to False.
         """
+        self._num_pending += 1
+        if self._max_pending and self._num_pending >= self._max_pending:
+            self._capacity.clear()
         self._envelopes.put_nowait((envelope, endpoints, response_future, sync))
 
+    async def wait_for_capacity(self) -> None:
+        """Wait until the number of pending envelopes is below the backpressure limit."""
+        while self._max_pending and self._num_pending >= self._max_pending:
+            self._capacity.clear()
+            await self._capacity.wait()
+
+    def _envelope_done(self) -> None:
+        self._num_pending -= 1
+        if not self._max_pending or self._num_pending < self._max_pending:
+            self._capacity.set()
+
     async def _process_envelope(
         self,
         env: Envelope,
@@ -69,6 +173,7 @@ class Dispenser:
                 envelope=env,
                 endpoints=endpoints,
                 sync=sync,
+                transport=self._transport,
             )
             if not response_future.done():
                 response_future.set_result(result)
@@ -77,26 +182,174 @@ class Dispenser:
                 return
             LOGGER.error(f"Failed to send envelope: {err}")
             response_future.set_exception(err)
+        finally:
+            self._envelope_done()
+
+    async def _send_with_slot(self, item: PendingEnvelope) -> None:
+        async with self._slots:
+            await self._process_envelope(*item)
+
+    async def _send_and_release(self, item: PendingEnvelope) -> None:
+        try:
+            await self._process_envelope(*item)
+        finally:
+            self._slots.release()
+
+    async def _drain_destination(self, destination: str) -> None:
+        """Send all queued envelopes for a single destination in order."""
+        pending = self._destination_queues[destination]
+        try:
+            while pending:
+                await self._send_with_slot(pending.popleft())
+        finally:
+            del self._destination_queues[destination]
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _batch_endpoint(self, item: PendingEnvelope) -> str | None:
+        """Get the endpoint to batch an envelope for, or None to send it on its own."""
+        _, endpoints, _, sync = item
+        if self._batch_window <= 0 or sync or not endpoints:
+            return None
+        endpoint = endpoints[0]
+        if endpoint in self._unbatched_endpoints or batch_url(endpoint) is None:
+            return None
+        return endpoint
+
+    def _add_to_batch(self, endpoint: str, item: PendingEnvelope) -> None:
+        batch = self._batches.setdefault(endpoint, [])
+        batch.append(item)
+        if len(batch) >= self._max_batch_size:
+            self._flush_batch(endpoint)
+        elif len(batch) == 1:
+            self._batch_timers[endpoint] = asyncio.get_running_loop().call_later(
+                self._batch_window, self._flush_batch, endpoint
+            )
+
+    def _flush_batch(self, endpoint: str) -> None:
+        """Queue the pending batch for an endpoint to be sent."""
+        timer = self._batch_timers.pop(endpoint, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._batches.pop(endpoint, None)
+        if not batch:
+            return
+        if endpoint in self._batch_queues:
+            self._batch_queues[endpoint].append(batch)
+        else:
+            self._batch_queues[endpoint] = deque([batch])
+            self._spawn(self._drain_batches(endpoint))
+
+    async def _drain_batches(self, endpoint: str) -> None:
+        """Send all queued batches for a single endpoint in order."""
+        pending = self._batch_queues[endpoint]
+        try:
+            while pending:
+                batch = pending.popleft()
+                async with self._slots:
+                    await self._process_batch(endpoint, batch)
+        finally:
+            del self._batch_queues[endpoint]
+
+    async def _process_batch(self, endpoint: str, batch: list[PendingEnvelope]) -> None:
+        """
+        Send a batch of envelopes and update their response futures, falling back to
+        sending them individually if the batch could not be delivered, and to the other
+        endpoints of the destination for envelopes that failed within the batch.
+
+        Args:
+            endpoint (str): The endpoint to send the batch to.
+            batch (list[PendingEnvelope]): The envelopes to send.
+        """
+        pending = deque(batch)
+        try:
+            results = None
+            if len(batch) > 1:
+                try:
+                    results = await send_exchange_envelope_batch(
+                        [env for env, _, _, _ in batch], endpoint, self._transport
+                    )
+                except BatchNotSupportedError:
+                    LOGGER.debug(f"Endpoint {endpoint} does not support batches")
+                    self._unbatched_endpoints.add(endpoint)
+                except Exception as ex:
+                    LOGGER.warning(f"Failed to deliver batch to {endpoint}: {ex}")
+
+            for index in range(len(batch)):
+                env, endpoints, response_future, sync = pending.popleft()
+                result = results[index] if results is not None else None
+                if result is None:
+                    await self._process_envelope(env, endpoints, response_future, sync)
+                elif result.status == DeliveryStatus.FAILED and len(endpoints) > 1:
+                    await self._process_envelope(
+                        env, endpoints[1:], response_future, sync
+                    )
+                else:
+                    if not response_future.done():
+                        response_future.set_result(result)
+                    self._envelope_done()
+        finally:
+            # envelopes that were not handed off, e.g. when the dispenser is stopped
+            for env, _, response_future, _ in pending:
+                if not response_future.done():
+                    response_future.set_result(
+                        MsgStatus(
+                            status=DeliveryStatus.FAILED,
+                            detail="Message delivery failed",
+                            destination=env.target,
+                            endpoint=endpoint,
+                            session=env.session,
+                        )
+                    )
+                self._envelope_done()
+
+    async def _schedule(self, item: PendingEnvelope) -> None:
+        """Dispatch an envelope according to the configured concurrency mode."""
+        endpoint = self._batch_endpoint(item)
+        if endpoint is not None:
+            self._add_to_batch(endpoint, item)
+        elif self._max_concurrency == 1:
+            await self._process_envelope(*item)
+        elif self._preserve_order:
+            destination = item[0].target
+            if destination in self._destination_queues:
+                self._destination_queues[destination].append(item)
+            else:
+                self._destination_queues[destination] = deque([item])
+                self._spawn(self._drain_destination(destination))
+        else:
+            # wait for a free slot to avoid creating an unbounded number of tasks
+            await self._slots.acquire()
+            self._spawn(self._send_and_release(item))
 
     async def run(self) -> None:
         """Run the dispenser routine."""
         try:
             while True:
-                env, endpoints, response_future, sync = await self._envelopes.get()
-                await self._process_envelope(env, endpoints, response_future, sync)
+                await self._schedule(await self._envelopes.get())
         except (asyncio.CancelledError, KeyboardInterrupt):
             LOGGER.info("Shutting down dispenser...")
 
             # Drain remaining messages from queue using get_nowait()
             while not self._envelopes.empty():
                 try:
-                    env, endpoints, response_future, sync = self._envelopes.get_nowait()
-                    await self._process_envelope(env, endpoints, response_future, sync)
+                    await self._schedule(self._envelopes.get_nowait())
                 except asyncio.QueueEmpty:
                     break
                 except Exception as ex:
                     LOGGER.exception(f"Error processing envelope during shutdown: {ex}")
 
+            # Send the envelopes still waiting for their batch window to close
+            for endpoint in list(self._batches):
+                self._flush_batch(endpoint)
+
+            # Wait for concurrently dispatched envelopes to be sent
+            while self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+
             LOGGER.info("Shutting down dispenser...complete")
 
 
@@ -104,17 +357,26 @@ async def dispatch_local_message(
     sender: str,
     destination: str,
     schema_digest: str,
-    message: JsonStr,
+    message: JsonStr | LocalMessage,
     session_id: uuid.UUID,
 ) -> MsgStatus:
     """Process a message locally."""
-    await dispatcher.dispatch_msg(
-        sender=sender,
-        destination=destination,
-        schema_digest=schema_digest,
-        message=message,
-        session=session_id,
-    )
+    try:
+        await dispatcher.dispatch_msg(
+            sender=sender,
+            destination=destination,
+            schema_digest=schema_digest,
+            message=message,
+            session=session_id,
+        )
+    except QueueFullError as err:
+        return MsgStatus(
+            status=DeliveryStatus.FAILED,
+            detail=f"Message queue of the destination is full: {err}",
+            destination=destination,
+            endpoint="",
+            session=session_id,
+        )
     return MsgStatus(
         status=DeliveryStatus.DELIVERED,
         detail="Message dispatched locally",
@@ -124,8 +386,22 @@ async def dispatch_local_message(
     )
 
 
+def _rejects_content_type(status: int, body: str) -> bool:
+    """Whether an agent server rejected a request because of its content type."""
+    return status == 415 or (status == 400 and "invalid content-type" in body)
+
+
+def _rejects_content_encoding(status: int, body: str) -> bool:
+    """Whether an agent server may have rejected a request because it was compressed."""
+    # servers without compression support fail to parse the compressed body
+    return status == 415 or (status == 400 and "invalid payload" in body)
+
+
 async def send_exchange_envelope(
-    envelope: Envelope, endpoints: list[str], sync: bool = False
+    envelope: Envelope,
+    endpoints: list[str],
+    sync: bool = False,
+    transport: HttpTransport | None = None,
 ) -> MsgStatus | Envelope:
     """
     Method to send an exchange envelope.
@@ -134,50 +410,96 @@ async def send_exchange_envelope(
         envelope (Envelope): The envelope to send.
         endpoints (list[str]): The endpoints to send the envelope to.
         sync (bool): True if the message is synchronous. Defaults to False.
+        transport (HttpTransport | None): The pooled HTTP transport to send the envelope
+        with. A transport that is closed after sending is used if not provided.
 
     Returns:
         MsgStatus | Envelope: Either the status of the message or the response envelope.
     """
-    headers = {"content-type": "application/json"}
-    if sync:
-        headers["x-uagents-connection"] = "sync"
+    if transport is None:
+        async with HttpTransport() as temporary_transport:
+            return await send_exchange_envelope(
+                envelope, endpoints, sync, temporary_transport
+            )
+    session = transport.session
+    encoded: dict[tuple[str, str | None], bytes] = {}
+    # endpoints that rejected the compressed body and are retried uncompressed
+    uncompressed: set[str] = set()
     errors = []
-    for endpoint in endpoints:
+    attempts = deque(
+        (endpoint, transport.envelope_content_type(endpoint)) for endpoint in endpoints
+    )
+    while attempts:
+        endpoint, content_type = attempts.popleft()
+        headers = {"content-type": content_type}
+        if sync:
+            headers["x-uagents-connection"] = "sync"
+        if (content_type, None) not in encoded:
+            encoded[content_type, None] = encode_envelope(envelope, content_type)
+        encoding = None
+        if endpoint not in uncompressed:
+            encoding = transport.request_encoding(
+                endpoint, len(encoded[content_type, None])
+            )
+        if encoding is not None:
+            headers["content-encoding"] = encoding
+            if (content_type, encoding) not in encoded:
+                encoded[content_type, encoding] = compress(
+                    encoded[content_type, None], encoding
+                )
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    endpoint,
-                    headers=headers,
-                    data=envelope.model_dump_json(),
-                ) as resp:
-                    success = resp.status == 200
-                    if success:
-                        if sync:
-                            env = Envelope.model_validate(await resp.json())
-                            if env.signature:
-                                verified = False
-                                try:
-                                    verified = env.verify()
-                                except Exception as ex:
-                                    errors.append(
-                                        f"Received response envelope that failed verification: {ex}"
-                                    )
-                                if not verified:
-                                    continue
-                            return await dispatch_sync_response_envelope(env, endpoint)
-                        return MsgStatus(
-                            status=DeliveryStatus.DELIVERED,
-                            detail="Message successfully delivered via HTTP",
-                            destination=envelope.target,
-                            endpoint=endpoint,
-                            session=envelope.session,
-                        )
-                    body = await resp.text()
-                    try:
-                        error_json = json.loads(body)
-                        detail = error_json.get("detail", body)
-                    except json.JSONDecodeError:
-                        detail = body
+            async with session.post(
+                endpoint,
+                headers=headers,
+                data=encoded[content_type, encoding],
+            ) as resp:
+                transport.update_accepted_encodings(
+                    endpoint, resp.headers.get("accept-encoding")
+                )
+                success = resp.status == 200
+                if success:
+                    if endpoint in uncompressed:
+                        transport.disable_compression(endpoint)
+                    if sync:
+                        env = Envelope.model_validate(await resp.json())
+                        if env.signature:
+                            verified = False
+                            try:
+                                verified = env.verify()
+                            except Exception as ex:
+                                errors.append(
+                                    f"Received response envelope that failed verification: {ex}"
+                                )
+                            if not verified:
+                                continue
+                        return await dispatch_sync_response_envelope(env, endpoint)
+                    return MsgStatus(
+                        status=DeliveryStatus.DELIVERED,
+                        detail="Message successfully delivered via HTTP",
+                        destination=envelope.target,
+                        endpoint=endpoint,
+                        session=envelope.session,
+                    )
+                body = await resp.text()
+                if encoding is not None and _rejects_content_encoding(
+                    resp.status, body
+                ):
+                    # the endpoint may not accept compressed bodies, send uncompressed
+                    uncompressed.add(endpoint)
+                    attempts.appendleft((endpoint, content_type))
+                    continue
+                if content_type != JSON_CONTENT_TYPE and _rejects_content_type(
+                    resp.status, body
+                ):
+                    # the endpoint does not support the binary encoding, send JSON
+                    transport.disable_binary_envelopes(endpoint)
+                    attempts.appendleft((endpoint, JSON_CONTENT_TYPE))
+                    continue
+                try:
+                    error_json = json.loads(body)
+                    detail = error_json.get("detail", body)
+                except json.JSONDecodeError:
+                    detail = body
 
                 errors.append(f"{resp.status}: {detail}")
         except aiohttp.ClientConnectorError as ex:
@@ -198,6 +520,118 @@ async def send_exchange_envelope(
     )
 
 
+def batch_url(endpoint: str) -> str | None:
+    """
+    Get the batch submission URL of an agent endpoint.
+
+    Args:
+        endpoint (str): The endpoint to submit single envelopes to.
+
+    Returns:
+        str | None: The URL to submit batches of envelopes to, or None if the endpoint
+        is not the submission endpoint of an agent server.
+    """
+    if not urlsplit(endpoint).path.rstrip("/").endswith("/submit"):
+        return None
+    return endpoint.rstrip("/") + "/batch"
+
+
+async def send_exchange_envelope_batch(
+    envelopes: list[Envelope],
+    endpoint: str,
+    transport: HttpTransport | None = None,
+) -> list[MsgStatus] | None:
+    """
+    Send several asynchronous envelopes to an endpoint in a single request.
+
+    Args:
+        envelopes (list[Envelope]): The envelopes to send.
+        endpoint (str): The endpoint to submit single envelopes to.
+        transport (HttpTransport | None): The pooled HTTP transport to send the batch
+        with. A transport that is closed after sending is used if not provided.
+
+    Returns:
+        list[MsgStatus] | None: The status of each envelope, or None if the batch could
+        not be delivered.
+
+    Raises:
+        BatchNotSupportedError: If the endpoint does not accept batches.
+    """
+    url = batch_url(endpoint)
+    if url is None:
+        raise BatchNotSupportedError(endpoint)
+    if transport is None:
+        async with HttpTransport() as temporary_transport:
+            return await send_exchange_envelope_batch(
+                envelopes, endpoint, temporary_transport
+            )
+    data = ("[" + ",".join(env.model_dump_json() for env in envelopes) + "]").encode()
+    encoding = transport.request_encoding(endpoint, len(data))
+    uncompressed = False
+    try:
+        while True:
+            headers = {"content-type": JSON_CONTENT_TYPE}
+            if encoding is not None:
+                headers["content-encoding"] = encoding
+            async with transport.session.post(
+                url,
+                headers=headers,
+                data=data if encoding is None else compress(data, encoding),
+            ) as resp:
+                if resp.status in (404, 405):
+                    raise BatchNotSupportedError(endpoint)
+                transport.update_accepted_encodings(
+                    endpoint, resp.headers.get("accept-encoding")
+                )
+                if resp.status != 200:
+                    body = await resp.text()
+                    if encoding is not None and _rejects_content_encoding(
+                        resp.status, body
+                    ):
+                        # send the batch uncompressed once
+                        encoding = None
+                        uncompressed = True
+                        continue
+                    LOGGER.warning(
+                        f"Failed to deliver batch to {endpoint}: {resp.status}: {body}"
+                    )
+                    return None
+                if uncompressed:
+                    transport.disable_compression(endpoint)
+                results = (await resp.json())["results"]
+                break
+    except BatchNotSupportedError:
+        raise
+    except Exception as ex:
+        LOGGER.warning(f"Failed to deliver batch to {endpoint}: {ex}")
+        return None
+
+    if len(results) != len(envelopes):
+        LOGGER.warning(f"Invalid batch response from {endpoint}")
+        return None
+
+    statuses = []
+    for env, result in zip(envelopes, results, strict=True):
+        delivered = result.get("status") == DeliveryStatus.DELIVERED
+        if not delivered:
+            LOGGER.error(
+                f"Failed to deliver message to {env.target} @ {endpoint}: "
+                + str(result.get("detail"))
+            )
+        statuses.append(
+            MsgStatus(
+                status=DeliveryStatus.DELIVERED if delivered else DeliveryStatus.FAILED,
+                detail="Message successfully delivered via HTTP batch"
+                if delivered
+                else "Message delivery failed",
+                destination=env.target,
+                endpoint=endpoint,
+                session=env.session,
+            )
+        )
+    return statuses
+
+
 async def dispatch_sync_response_envelope(
     env: Envelope, endpoint: str
 ) -> MsgStatus | Envelope:
@@ -230,6 +664,7 @@ async def send_message_raw(
     resolver: Resolver | None = None,
     timeout: int = DEFAULT_ENVELOPE_TIMEOUT_SECONDS,
     sync: bool = False,
+    transport: HttpTransport | None = None,
 ) -> Model | JsonStr | MsgStatus | Envelope:
     """
     Standalone function to send a message to an agent.
@@ -243,6 +678,7 @@ async def send_message_raw(
         resolver (Resolver | None): The optional resolver for address-to-endpoint resolution.
         timeout (int): The timeout for the message response in seconds. Defaults to 30.
         sync (bool): True if the message is synchronous.
+        transport (HttpTransport | None): The optional pooled HTTP transport to send with.
 
     Returns:
         Model | JsonStr | MsgStatus | Envelope: On success, if the response type is provided,
@@ -289,6 +725,7 @@ async def send_message_raw(
         envelope=env,
         endpoints=endpoints,
         sync=sync,
+        transport=transport,
     )
     if isinstance(response, Envelope):
         if env.signature is None:
@@ -308,6 +745,7 @@ async def send_message(
     resolver: Resolver | None = None,
     timeout: int = DEFAULT_ENVELOPE_TIMEOUT_SECONDS,
     sync: bool = False,
+    transport: HttpTransport | None = None,
 ) -> Model | JsonStr | MsgStatus | Envelope:
     """
     Standalone function to send a message to an agent.
@@ -320,6 +758,7 @@ async def send_message(
         resolver (Resolver | None): The optional resolver for address-to-endpoint resolution.
         timeout (int): The timeout for the message response in seconds. Defaults to 30.
         sync (bool): True if the message is synchronous.
+        transport (HttpTransport | None): The optional pooled HTTP transport to send with.
 
     Returns:
         Model | JsonStr | MsgStatus | Envelope: On success, if the response type is provided,
@@ -336,6 +775,7 @@ async def send_message(
         resolver=resolver,
         timeout=timeout,
         sync=sync,
+        transport=transport,
     )
 
 
@@ -346,6 +786,7 @@ async def send_sync_message(
     sender: Identity | str | None = None,
     resolver: Resolver | None = None,
     timeout: int = DEFAULT_ENVELOPE_TIMEOUT_SECONDS,
+    transport: HttpTransport | None = None,
 ) -> Model | JsonStr | MsgStatus | Envelope:
     """
     Standalone function to send a synchronous message to an agent.
@@ -358,6 +799,7 @@ async def send_sync_message(
         resolver (Resolver | None): The optional resolver for address-to-endpoint resolution.
         timeout (int): The timeout for the message response in seconds. Defaults to 30.
         sync (bool): True if the message is synchronous.
+        transport (HttpTransport | None): The optional pooled HTTP transport to send with.
 
     Returns:
         Model | JsonStr | MsgStatus | Envelope: On success, if the response type is provided,
@@ -373,6 +815,7 @@ async def send_sync_message(
         resolver=resolver,
         timeout=timeout,
         sync=True,
+        transport=transport,
     )
 
 
@@ -0,0 +1,158 @@
+"""HTTP content encodings for compressing agent traffic."""
+
+import gzip
+import zlib
+from typing import Literal
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional zstd support
+    zstandard = None
+
+ContentEncoding = Literal["gzip", "zstd"]
+
+# compression levels trading a little ratio for speed on the hot path
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+class DecompressionError(ValueError):
+    """Raised when a request body can not be decompressed."""
+
+
+class UnsupportedEncodingError(DecompressionError):
+    """Raised when a request body is compressed with an unsupported encoding."""
+
+
+class DecompressedSizeError(DecompressionError):
+    """Raised when a decompressed request body exceeds the size limit."""
+
+
+def supported_encodings() -> list[ContentEncoding]:
+    """
+    Get the content encodings that can be used, preferred first.
+
+    Returns:
+        list[ContentEncoding]: The content encodings.
+    """
+    if zstandard is None:
+        return ["gzip"]
+    return ["zstd", "gzip"]
+
+
+def accepted_encodings(accept_encoding: str | bytes) -> set[str]:
+    """
+    Parse an accept-encoding header.
+
+    Args:
+        accept_encoding (str | bytes): The accept-encoding header.
+
+    Returns:
+        set[str]: The accepted content codings.
+    """
+    if isinstance(accept_encoding, bytes):
+        accept_encoding = accept_encoding.decode(errors="replace")
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        accepted.add(coding.strip())
+    return accepted
+
+
+def negotiate_encoding(accept_encoding: str | bytes) -> ContentEncoding | None:
+    """
+    Choose the encoding to compress a response with.
+
+    Args:
+        accept_encoding (str | bytes): The accept-encoding header of the request.
+
+    Returns:
+        ContentEncoding | None: The encoding, or None if the client accepts none of the
+        supported encodings.
+    """
+    accepted = accepted_encodings(accept_encoding)
+    for encoding in supported_encodings():
+        if encoding in accepted:
+            return encoding
+    return None
+
+
+def compress(data: bytes, encoding: ContentEncoding) -> bytes:
+    """
+    Compress data with a content encoding.
+
+    Args:
+        data (bytes): The data.
+        encoding (ContentEncoding): The content encoding.
+
+    Returns:
+        bytes: The compressed data.
+    """
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=GZIP_LEVEL)
+    if encoding == "zstd" and zstandard is not None:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    raise UnsupportedEncodingError(f"Unsupported content encoding: {encoding}")
+
+
+def _gunzip(data: bytes, max_size: int | None) -> bytes:
+    decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+    try:
+        result = decompressor.decompress(data, 0 if max_size is None else max_size + 1)
+    except zlib.error as err:
+        raise DecompressionError(f"Invalid gzip data: {err}") from err
+    if max_size is not None and len(result) > max_size:
+        raise DecompressedSizeError(f"Decompressed body exceeds {max_size} bytes")
+    if not decompressor.eof:
+        raise DecompressionError("Truncated gzip data")
+    return result
+
+
+def _unzstd(data: bytes, max_size: int | None) -> bytes:
+    if zstandard is None:
+        raise UnsupportedEncodingError("Unsupported content encoding: zstd")
+    result = bytearray()
+    try:
+        with zstandard.ZstdDecompressor().stream_reader(data) as reader:
+            while chunk := reader.read(_READ_CHUNK_SIZE):
+                result += chunk
+                if max_size is not None and len(result) > max_size:
+                    raise DecompressedSizeError(
+                        f"Decompressed body exceeds {max_size} bytes"
+                    )
+    except zstandard.ZstdError as err:
+        raise DecompressionError(f"Invalid zstd data: {err}") from err
+    return bytes(result)
+
+
+def decompress(data: bytes, encoding: str, max_size: int | None = None) -> bytes:
+    """
+    Decompress a request body, stopping as soon as it exceeds the size limit so that
+    small, highly compressed bodies can not exhaust memory.
+
+    Args:
+        data (bytes): The compressed data.
+        encoding (str): The content-encoding header of the request.
+        max_size (int | None): The maximum decompressed size in bytes, or None for no
+        limit.
+
+    Returns:
+        bytes: The decompressed data.
+
+    Raises:
+        UnsupportedEncodingError: If the encoding is not supported.
+        DecompressedSizeError: If the decompressed data exceeds `max_size` bytes.
+        DecompressionError: If the data is not valid for the encoding.
+    """
+    encoding = encoding.strip().lower()
+    if encoding in ("", "identity"):
+        return data
+    if encoding == "gzip":
+        return _gunzip(data, max_size)
+    if encoding == "zstd":
+        return _unzstd(data, max_size)
+    raise UnsupportedEncodingError(f"Unsupported content encoding: {encoding}")
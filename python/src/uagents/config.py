@@ -37,6 +37,13 @@ ALMANAC_API_TIMEOUT_SECONDS = 1.0
 ALMANAC_API_MAX_RETRIES = 10
 ALMANAC_REGISTRATION_WAIT = 100
 MAILBOX_POLL_INTERVAL_SECONDS = 1.0
+MAILBOX_MAX_POLL_INTERVAL_SECONDS = 30.0
+MAILBOX_POLL_BACKOFF_FACTOR = 2.0
+MAILBOX_POLL_JITTER = 0.1
+MAILBOX_LONG_POLL_HEADER = "x-mailbox-long-poll"
+MAILBOX_MAX_LONG_POLL_SECONDS = 30.0
+MAILBOX_MAX_CONCURRENCY = 16
+MAILBOX_MULTIPLEXER_MAX_CONCURRENCY = 10
 
 ORACLE_AGENT_DOMAIN = "verify.fetch.ai"
 ANAME_REGISTRATION_SECONDS = 5184000
@@ -45,9 +52,50 @@ RESPONSE_TIME_HINT_SECONDS = 5
 DEFAULT_ENVELOPE_TIMEOUT_SECONDS = 30
 DEFAULT_MAX_ENDPOINTS = 10
 DEFAULT_SEARCH_LIMIT = 100
+AGENT_SEARCH_CACHE_SIZE = 256
+AGENT_SEARCH_CACHE_TTL_SECONDS = 60.0
+BROADCAST_MAX_CONCURRENCY = 20
+
+HTTP_CONNECTION_LIMIT = 100
+HTTP_CONNECTION_LIMIT_PER_HOST = 10
+HTTP_KEEPALIVE_TIMEOUT_SECONDS = 30.0
+HTTP_CONNECT_TIMEOUT_SECONDS = 10.0
+# the default total timeout of aiohttp, as used before sessions were pooled
+HTTP_REQUEST_TIMEOUT_SECONDS = 300.0
+HTTP_COMPRESSION_THRESHOLD_BYTES = 1024
+
+RESOLVER_CACHE_SIZE = 1024
+RESOLVER_CACHE_TTL_SECONDS = 300.0
+RESOLVER_CACHE_FAILURE_TTL_SECONDS = 30.0
+
+LEDGER_QUERY_TIMEOUT_SECONDS = 10.0
+LEDGER_QUERY_MAX_WORKERS = 4
+# timed out queries keep their worker until they return, so each network only gets
+# a share of the workers
+LEDGER_QUERY_MAX_IN_FLIGHT = 2
+LEDGER_CIRCUIT_FAILURE_THRESHOLD = 3
+LEDGER_CIRCUIT_RESET_SECONDS = 60.0
+
+MESSAGE_WORKERS = 1
+MESSAGE_QUEUE_MAX_RETRY_AFTER_SECONDS = 60
+
+DISPENSER_MAX_CONCURRENCY = 1
+DISPENSER_MAX_PENDING_ENVELOPES = 10000
+DISPENSER_BATCH_WINDOW_SECONDS = 0.0
+DISPENSER_MAX_BATCH_SIZE = 100
+
+VERIFICATION_POOL_MAX_WORKERS = 4
+VERIFICATION_BATCH_SIZE = 64
+
+MAX_REQUEST_BODY_SIZE_BYTES = 16 * 1024 * 1024
+
+STORAGE_FLUSH_INTERVAL_SECONDS = 1.0
+STORAGE_FLUSH_BATCH_SIZE = 100
+STORAGE_COMPACTION_THRESHOLD = 1000
 
 MESSAGE_HISTORY_MESSAGE_LIMIT = 1000
 MESSAGE_HISTORY_RETENTION_SECONDS = 86400
+MESSAGE_HISTORY_BUCKET_SECONDS = 60
 
 
 def parse_endpoint_config(
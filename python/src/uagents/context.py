@@ -18,13 +18,22 @@ from uagents_core.types import DeliveryStatus, MsgStatus
 from uagents.communication import dispatch_local_message
 from uagents.config import (
     ALMANAC_API_URL,
+    BROADCAST_MAX_CONCURRENCY,
     DEFAULT_ENVELOPE_TIMEOUT_SECONDS,
     DEFAULT_SEARCH_LIMIT,
 )
 from uagents.dispatch import dispatcher
-from uagents.resolver import Resolver
-from uagents.storage import KeyValueStore
-from uagents.types import EnvelopeHistory, EnvelopeHistoryEntry, JsonStr, MsgInfo
+from uagents.resolver import AgentSearch, Resolver
+from uagents.storage import AsyncStorageAPI, ExecutorStorageAdapter, StorageAPI
+from uagents.types import (
+    EnvelopeHistory,
+    EnvelopeHistoryEntry,
+    JsonStr,
+    LocalMessage,
+    MsgInfo,
+    message_json,
+    parse_message,
+)
 from uagents.utils import log
 
 if TYPE_CHECKING:
@@ -39,7 +48,8 @@ class Context(ABC):
 
     Properties:
         agent (AgentRepresentation): The agent representation associated with the context.
-        storage (KeyValueStore): The key-value store for storage operations.
+        storage (StorageAPI): The key-value store for storage operations.
+        async_storage (AsyncStorageAPI): Non-blocking access to the key-value store.
         ledger (LedgerClient): The client for interacting with the blockchain ledger.
         logger (logging.Logger): The logger instance.
         session (uuid.UUID): The session UUID associated with the context.
@@ -47,6 +57,8 @@ class Context(ABC):
     Methods:
         get_agents_by_protocol(protocol_digest, limit, logger): Retrieve a list of agent addresses
             using a specific protocol digest.
+        get_agents_by_protocol_async(protocol_digest, limit, logger): Retrieve a list of
+            agent addresses using a specific protocol digest without blocking.
         broadcast(destination_protocol, message, limit, timeout): Broadcast a message
             to agents with a specific protocol.
         session_history: Get the message history associated with the context session.
@@ -68,15 +80,30 @@ class Context(ABC):
 
     @property
     @abstractmethod
-    def storage(self) -> KeyValueStore:
+    def storage(self) -> StorageAPI:
         """
         Get the key-value store associated with the context.
 
         Returns:
-            KeyValueStore: The key-value store.
+            StorageAPI: The key-value store.
         """
         raise NotImplementedError
 
+    @property
+    def async_storage(self) -> AsyncStorageAPI:
+        """
+        Get the key-value store associated with the context for use without blocking the
+        event loop. Defaults to running the operations of `storage` on an executor.
+
+        Returns:
+            AsyncStorageAPI: The asynchronous key-value store.
+        """
+        adapter = getattr(self, "_default_async_storage", None)
+        if adapter is None or adapter.storage is not self.storage:
+            adapter = ExecutorStorageAdapter(self.storage)
+            self._default_async_storage = adapter
+        return adapter
+
     @property
     @abstractmethod
     def ledger(self) -> LedgerClient:
@@ -132,6 +159,29 @@ class Context(ABC):
         """
         raise NotImplementedError
 
+    async def get_agents_by_protocol_async(
+        self,
+        protocol_digest: str,
+        limit: int = DEFAULT_SEARCH_LIMIT,
+        logger: logging.Logger | None = None,
+    ) -> list[str]:
+        """Retrieve a list of agent addresses using a specific protocol digest.
+
+        Non-blocking version of `get_agents_by_protocol` to be used from handlers.
+        By default, `get_agents_by_protocol` is run in the default executor.
+
+        Args:
+            protocol_digest (str): The protocol digest to search for, starting with "proto:".
+            limit (int, optional): The maximum number of agent addresses to return.
+
+        Returns:
+            list[str]: A list of agent addresses using the specified protocol digest.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, self.get_agents_by_protocol, protocol_digest, limit, logger
+        )
+
     @abstractmethod
     async def broadcast(
         self,
@@ -139,11 +189,13 @@ class Context(ABC):
         message: Model,
         limit: int = DEFAULT_SEARCH_LIMIT,
         timeout: int = DEFAULT_ENVELOPE_TIMEOUT_SECONDS,
+        max_concurrency: int = BROADCAST_MAX_CONCURRENCY,
     ) -> list[MsgStatus]:
         """Broadcast a message to agents with a specific protocol.
 
         This asynchronous method broadcasts a given message to agents associated
-        with a specific protocol. The message is sent to multiple agents concurrently.
+        with a specific protocol. The agents are resolved concurrently and the message
+        is sent to a bounded number of agents at a time.
         The schema digest of the message is used for verification.
 
         Args:
@@ -151,6 +203,8 @@ class Context(ABC):
             message (Model): The message to broadcast.
             limit (int, optional): The maximum number of agents to send the message to.
             timeout (int, optional): The timeout for sending each message.
+            max_concurrency (int, optional): The maximum number of messages being sent
+                at the same time.
 
         Returns:
             list[MsgStatus]: A list of message delivery statuses.
@@ -192,12 +246,13 @@ class Context(ABC):
         self,
         destination: str,
         message_schema_digest: str,
-        message_body: JsonStr,
+        message_body: JsonStr | LocalMessage,
         sync: bool = False,
         wait_for_response: bool = False,
         timeout: int = DEFAULT_ENVELOPE_TIMEOUT_SECONDS,
         protocol_digest: str | None = None,
         queries: dict[str, asyncio.Future] | None = None,
+        resolved: tuple[str | None, list[str]] | None = None,
     ) -> MsgStatus:
         """
         Send a message to the specified destination where the message body and
@@ -206,12 +261,15 @@ class Context(ABC):
         Args:
             destination (str): The destination address to send the message to.
             message_schema_digest (str): The schema digest of the message to be sent.
-            message_body (JsonStr): The JSON-encoded message body to be sent.
+            message_body (JsonStr | LocalMessage): The JSON-encoded message body to be
+            sent, or the message object if it is sent to an agent in the same process.
             sync (bool): Whether to send the message synchronously or asynchronously.
             wait_for_response (bool): Whether to wait for a response to the message.
             timeout (int, optional): The optional timeout for sending the message, in seconds.
             protocol_digest (str, optional): The protocol digest of the message to be sent.
             queries (dict[str, asyncio.Future] | None): The dictionary of queries to resolve.
+            resolved (tuple[str | None, list[str]] | None): The address and endpoints of
+            the destination if it was already resolved.
 
         Returns:
             MsgStatus: The delivery status of the message.
@@ -249,7 +307,7 @@ class InternalContext(Context):
     def __init__(
         self,
         agent: "AgentRepresentation",
-        storage: KeyValueStore,
+        storage: StorageAPI,
         ledger: LedgerClient,
         resolver: Resolver,
         dispenser: "Dispenser",
@@ -257,26 +315,38 @@ class InternalContext(Context):
         interval_messages: set[str] | None = None,
         message_history: EnvelopeHistory | None = None,
         logger: logging.Logger | None = None,
+        async_storage: AsyncStorageAPI | None = None,
+        agent_search: AgentSearch | None = None,
+        serialize_local_messages: bool = True,
     ):
         self._agent = agent
         self._storage = storage
+        self._async_storage = async_storage or ExecutorStorageAdapter(storage)
         self._ledger = ledger
         self._resolver = resolver
         self._dispenser = dispenser
+        self._agent_search = agent_search or AgentSearch(transport=dispenser.transport)
         self._logger = logger
         self._session = session or uuid.uuid4()
         self._interval_messages = interval_messages
         self._message_history = message_history
-        self._outbound_messages: dict[str, list[tuple[JsonStr, str]]] = {}
+        self._serialize_local_messages = serialize_local_messages
+        self._outbound_messages: dict[
+            str, list[tuple[JsonStr | LocalMessage, str]]
+        ] = {}
 
     @property
     def agent(self) -> "AgentRepresentation":
         return self._agent
 
     @property
-    def storage(self) -> KeyValueStore:
+    def storage(self) -> StorageAPI:
         return self._storage
 
+    @property
+    def async_storage(self) -> AsyncStorageAPI:
+        return self._async_storage
+
     @property
     def ledger(self) -> LedgerClient:
         return self._ledger
@@ -300,10 +370,15 @@ class InternalContext(Context):
         """
         Get the dictionary of outbound messages associated with the context.
 
+        Local messages that were delivered without serialization are serialized here.
+
         Returns:
             dict[str, list[tuple[JsonStr, str]]]: The dictionary of outbound messages.
         """
-        return self._outbound_messages
+        return {
+            target: [(message_json(body), digest) for body, digest in msgs]
+            for target, msgs in self._outbound_messages.items()
+        }
 
     def session_history(self) -> list[EnvelopeHistoryEntry] | None:
         """
@@ -317,6 +392,14 @@ class InternalContext(Context):
             return None
         return self._message_history.get_session_messages(self._session)
 
+    @property
+    def _almanac_api_url(self) -> str:
+        return getattr(
+            getattr(self._resolver, "_almanac_api_resolver", None),
+            "_almanac_api_url",
+            ALMANAC_API_URL,
+        )
+
     def get_agents_by_protocol(
         self,
         protocol_digest: str,
@@ -328,11 +411,10 @@ class InternalContext(Context):
         ):
             log(logger, logging.ERROR, f"Invalid protocol digest: {protocol_digest}")
             return []
-        almanac_api_url = getattr(
-            getattr(self._resolver, "_almanac_api_resolver", None),
-            "_almanac_api_url",
-            ALMANAC_API_URL,
-        )
+        almanac_api_url = self._almanac_api_url
+        agents = self._agent_search.get_cached(protocol_digest, almanac_api_url)
+        if agents is not None:
+            return agents[:limit]
         response = requests.post(
             url=almanac_api_url + "/search",
             json={"text": protocol_digest[6:]},
@@ -341,17 +423,33 @@ class InternalContext(Context):
         if response.status_code == 200:
             data = response.json()
             agents = [agent["address"] for agent in data if agent["status"] == "active"]
+            self._agent_search.store(protocol_digest, almanac_api_url, agents)
             return agents[:limit]
         return []
 
+    async def get_agents_by_protocol_async(
+        self,
+        protocol_digest: str,
+        limit: int = DEFAULT_SEARCH_LIMIT,
+        logger: logging.Logger | None = None,
+    ) -> list[str]:
+        if not isinstance(protocol_digest, str) or not protocol_digest.startswith(
+            "proto:"
+        ):
+            log(logger, logging.ERROR, f"Invalid protocol digest: {protocol_digest}")
+            return []
+        agents = await self._agent_search.search(protocol_digest, self._almanac_api_url)
+        return agents[:limit]
+
     async def broadcast(
         self,
         destination_protocol: str,
         message: Model,
         limit: int = DEFAULT_SEARCH_LIMIT,
         timeout: int = DEFAULT_ENVELOPE_TIMEOUT_SECONDS,
+        max_concurrency: int = BROADCAST_MAX_CONCURRENCY,
     ) -> list[MsgStatus]:
-        agents = self.get_agents_by_protocol(
+        agents = await self.get_agents_by_protocol_async(
             destination_protocol, limit=limit, logger=self.logger
         )
         if not agents:
@@ -364,16 +462,20 @@ class InternalContext(Context):
 
         if self.agent.address in agents:
             agents.remove(self.agent.address)
-        futures = await asyncio.gather(
-            *[
-                self.send(
-                    address,
-                    message,
-                    timeout=timeout,
+
+        # resolve all remote agents up front so that resolution is not throttled by
+        # the dispatch limit, the sends use the results instead of resolving again
+        remote = [address for address in agents if not dispatcher.contains(address)]
+        resolved = await self._resolver.resolve_many(remote)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def send(address: str) -> MsgStatus:
+            async with semaphore:
+                return await self._send(
+                    address, message, timeout=timeout, resolved=resolved.get(address)
                 )
-                for address in agents
-            ]
-        )
+
+        futures = await asyncio.gather(*[send(address) for address in agents])
         log(self.logger, logging.DEBUG, f"Sent {len(futures)} messages")
         return futures
 
@@ -391,6 +493,19 @@ class InternalContext(Context):
             return schema_digest in self._interval_messages
         return True
 
+    def _encode_message(
+        self, destination: str, message: Model
+    ) -> JsonStr | LocalMessage:
+        """
+        Serialize a message, unless serialization of local messages is disabled and the
+        destination is an agent in the same process.
+        """
+        if not self._serialize_local_messages:
+            _, _, address = parse_identifier(destination)
+            if dispatcher.contains(address):
+                return LocalMessage(message)
+        return message.model_dump_json()
+
     async def send(
         self,
         destination: str,
@@ -403,8 +518,20 @@ class InternalContext(Context):
         we don't have access properties that are only necessary in re-active
         contexts, like 'replies', 'message_received', or 'protocol'.
         """
+        return await self._send(destination, message, timeout=timeout)
+
+    async def _send(
+        self,
+        destination: str,
+        message: Model,
+        timeout: int = DEFAULT_ENVELOPE_TIMEOUT_SECONDS,
+        resolved: tuple[str | None, list[str]] | None = None,
+    ) -> MsgStatus:
+        """
+        Send a message, optionally to a destination that was already resolved.
+        """
         schema_digest: str = Model.build_schema_digest(message)
-        message_body: JsonStr = message.model_dump_json()
+        message_body = self._encode_message(destination, message)
 
         if not self._is_valid_interval_message(schema_digest):
             log(
@@ -425,19 +552,21 @@ class InternalContext(Context):
             message_schema_digest=schema_digest,
             message_body=message_body,
             timeout=timeout,
+            resolved=resolved,
         )
 
     async def send_raw(
         self,
         destination: str,
         message_schema_digest: str,
-        message_body: JsonStr,
+        message_body: JsonStr | LocalMessage,
         sync: bool = False,
         wait_for_response: bool = False,
         timeout: int = DEFAULT_ENVELOPE_TIMEOUT_SECONDS,
         protocol_digest: str | None = None,
         queries: dict[str, asyncio.Future] | None = None,
         expected_response_digests: set[str] | None = None,
+        resolved: tuple[str | None, list[str]] | None = None,
     ) -> MsgStatus:
         # Extract address from destination agent identifier if present
         _, _, parsed_address = parse_identifier(destination)
@@ -464,7 +593,7 @@ class InternalContext(Context):
             # Handle sync dispatch of messages
             elif queries and parsed_address in queries:
                 queries[parsed_address].set_result(
-                    (message_body, message_schema_digest)
+                    (message_json(message_body), message_schema_digest)
                 )
                 del queries[parsed_address]
                 result = MsgStatus(
@@ -485,8 +614,10 @@ class InternalContext(Context):
                 ]
 
         if result is None:
-            # Resolve destination using the resolver
-            destination_address, endpoints = await self._resolver.resolve(destination)
+            # Resolve destination using the resolver, unless done already
+            if resolved is None:
+                resolved = await self._resolver.resolve(destination)
+            destination_address, endpoints = resolved
 
             if not endpoints or not destination_address:
                 log(
@@ -515,9 +646,12 @@ class InternalContext(Context):
                     protocol_digest=protocol_digest,
                     expires=expires,
                 )
-                env.encode_payload(message_body)
+                env.encode_payload(message_json(message_body))
                 env.sign(self.agent.identity)
 
+                # Apply backpressure if the dispenser is overloaded
+                await self._dispenser.wait_for_capacity()
+
                 # Create awaitable future for MsgStatus and sync response
                 fut = asyncio.Future()
 
@@ -539,6 +673,13 @@ class InternalContext(Context):
                         session=self._session,
                     )
 
+                # endpoints may be stale, resolve again on the next attempt
+                if (
+                    isinstance(result, MsgStatus)
+                    and result.status == DeliveryStatus.FAILED
+                ):
+                    self._resolver.invalidate(destination)
+
         if result.status == DeliveryStatus.DELIVERED and self._message_history:
             self._message_history.add_entry(
                 EnvelopeHistoryEntry(
@@ -548,7 +689,7 @@ class InternalContext(Context):
                     session=self._session,
                     schema_digest=message_schema_digest,
                     protocol_digest=protocol_digest,
-                    payload=message_body,
+                    payload=message_json(message_body),
                 )
             )
 
@@ -602,7 +743,7 @@ class InternalContext(Context):
         msg_status: MsgStatus = await self.send_raw(
             destination=destination,
             message_schema_digest=schema_digest,
-            message_body=message.model_dump_json(),
+            message_body=self._encode_message(destination, message),
             sync=sync,
             wait_for_response=True,
             timeout=timeout,
@@ -632,7 +773,7 @@ class InternalContext(Context):
             )
 
         r_type = response_type_by_digest[response_msg.schema_digest]
-        return r_type.parse_raw(response_msg.message), msg_status
+        return parse_message(r_type, response_msg.message), msg_status
 
 
 class ExternalContext(InternalContext):
@@ -732,6 +873,15 @@ class ExternalContext(InternalContext):
         Returns:
             MsgStatus: The delivery status of the message.
         """
+        return await self._send(destination, message, timeout=timeout)
+
+    async def _send(
+        self,
+        destination: str,
+        message: Model,
+        timeout: int = DEFAULT_ENVELOPE_TIMEOUT_SECONDS,
+        resolved: tuple[str | None, list[str]] | None = None,
+    ) -> MsgStatus:
         schema_digest = Model.build_schema_digest(message)
 
         # This is the re-active send method
@@ -741,10 +891,11 @@ class ExternalContext(InternalContext):
         return await self.send_raw(
             destination=destination,
             message_schema_digest=schema_digest,
-            message_body=message.model_dump_json(),
+            message_body=self._encode_message(destination, message),
             timeout=timeout,
             protocol_digest=self._protocol[0],
             queries=self._queries,
+            resolved=resolved,
         )
 
 
@@ -7,7 +7,7 @@ from uuid import UUID
 
 from uagents_core.models import Model
 
-from uagents.types import JsonStr, MsgInfo, RestMethod
+from uagents.types import JsonStr, LocalMessage, MsgInfo, RestMethod
 
 PendingResponseKey = tuple[str, str, UUID]
 
@@ -33,7 +33,11 @@ class Sink(ABC):
 
     @abstractmethod
     async def handle_message(
-        self, sender: str, schema_digest: str, message: JsonStr, session: UUID
+        self,
+        sender: str,
+        schema_digest: str,
+        message: JsonStr | LocalMessage,
+        session: UUID,
     ):
         raise NotImplementedError
 
@@ -103,7 +107,7 @@ class Dispatcher:
         destination: str,
         session: UUID,
         schema_digest: str,
-        message: JsonStr,
+        message: JsonStr | LocalMessage,
     ) -> bool:
         key = (destination, sender, session)
         pending = self._pending_responses.get(key)
@@ -135,7 +139,7 @@ class Dispatcher:
         sender: str,
         destination: str,
         schema_digest: str,
-        message: JsonStr,
+        message: JsonStr | LocalMessage,
         session: UUID,
     ) -> None:
         if self.dispatch_pending_response(
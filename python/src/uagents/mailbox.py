@@ -1,5 +1,9 @@
 import asyncio
+import contextlib
+import heapq
 import logging
+import random
+import time
 from datetime import datetime, timezone
 from secrets import token_bytes
 
@@ -18,9 +22,23 @@ from uagents_core.registration import (
 from uagents_core.storage import compute_attestation
 from uagents_core.types import AddressPrefix, AgentEndpoint, AgentType
 
-from uagents.config import MAILBOX_POLL_INTERVAL_SECONDS
+from uagents.config import (
+    HTTP_REQUEST_TIMEOUT_SECONDS,
+    MAILBOX_LONG_POLL_HEADER,
+    MAILBOX_MAX_CONCURRENCY,
+    MAILBOX_MAX_LONG_POLL_SECONDS,
+    MAILBOX_MAX_POLL_INTERVAL_SECONDS,
+    MAILBOX_MULTIPLEXER_MAX_CONCURRENCY,
+    MAILBOX_POLL_BACKOFF_FACTOR,
+    MAILBOX_POLL_INTERVAL_SECONDS,
+    MAILBOX_POLL_JITTER,
+)
 from uagents.dispatch import dispatcher
+from uagents.transport import HttpTransport
 from uagents.utils import get_logger
+from uagents.verification import VerificationPool, verify_envelope
+from uagents.wire import decode_stored_envelopes, is_msgpack
+from uagents.workers import QueueFullError
 
 logger = get_logger("mailbox")
 
@@ -191,15 +209,122 @@ async def unregister_in_agentverse(
         return UnregistrationResponse(success=False, detail=detail)
 
 
+class PollScheduler:
+    """
+    Decides how long the mailbox client waits before polling again.
+
+    Full pages are followed by an immediate poll so that a backlog drains as fast as
+    possible, partial pages by a poll after the base interval, and empty pages (or
+    failures) back off exponentially up to the maximum interval. Every delay is
+    randomized by the jitter ratio so that the agents of a Bureau do not poll in
+    lockstep.
+
+    Attributes:
+        _interval (float): The base poll interval in seconds.
+        _max_interval (float): The maximum poll interval in seconds.
+        _backoff_factor (float): The factor the interval grows by after an empty poll.
+        _jitter (float): The maximum relative deviation applied to each delay.
+        _page_size (int | None): The number of envelopes in a full page, if known.
+        _current (float): The current interval used for empty polls.
+    """
+
+    def __init__(
+        self,
+        interval: float = MAILBOX_POLL_INTERVAL_SECONDS,
+        max_interval: float = MAILBOX_MAX_POLL_INTERVAL_SECONDS,
+        backoff_factor: float = MAILBOX_POLL_BACKOFF_FACTOR,
+        jitter: float = MAILBOX_POLL_JITTER,
+        page_size: int | None = None,
+    ):
+        """
+        Initialize the poll scheduler.
+
+        Args:
+            interval (float): The base poll interval in seconds.
+            max_interval (float): The maximum poll interval in seconds.
+            backoff_factor (float): The factor the interval grows by after an empty poll.
+            jitter (float): The maximum relative deviation applied to each delay.
+            page_size (int | None): The number of envelopes in a full page. If not
+            known, any page with processed envelopes is treated as full.
+        """
+        if interval <= 0 or max_interval < interval:
+            raise ValueError("invalid poll interval")
+        if backoff_factor < 1:
+            raise ValueError("backoff_factor must be at least 1")
+        if not 0 <= jitter < 1:
+            raise ValueError("jitter must be between 0 and 1")
+        self._interval = interval
+        self._max_interval = max_interval
+        self._backoff_factor = backoff_factor
+        self._jitter = jitter
+        self._page_size = page_size
+        self._current = interval
+
+    def _randomize(self, delay: float) -> float:
+        return delay * random.uniform(1 - self._jitter, 1 + self._jitter)
+
+    def initial_delay(self) -> float:
+        """
+        Get a random delay before the first poll to spread out the agents' polls.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        return random.uniform(0, self._interval * self._jitter)
+
+    def next_delay(self, retrieved: int, processed: int) -> float:
+        """
+        Get the delay before the next poll based on the outcome of the last one.
+
+        Args:
+            retrieved (int): The number of envelopes in the retrieved page.
+            processed (int): The number of envelopes that were processed and deleted.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        if processed > 0:
+            self._current = self._interval
+            if self._page_size is None or retrieved >= self._page_size:
+                return 0.0
+            return self._randomize(self._interval)
+        return self.failure()
+
+    def failure(self) -> float:
+        """
+        Get the delay after an empty page or a failed poll and back off further.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        delay = self._randomize(self._current)
+        self._current = min(self._current * self._backoff_factor, self._max_interval)
+        return delay
+
+
 class MailboxClient:
-    """Client for interacting with the Agentverse mailbox server."""
+    """
+    Client for interacting with the Agentverse mailbox server.
+
+    Each retrieved page of envelopes is verified concurrently, dispatched in the
+    order it was received and then acknowledged with concurrent deletions over the
+    pooled HTTP transport. The poll frequency adapts to the traffic (see
+    PollScheduler). If the mailbox server advertises long-polling support, the
+    client waits for new envelopes on the server instead of backing off locally.
+    """
 
     def __init__(
         self,
         identity: Identity,
         agentverse: AgentverseConfig,
         logger: logging.Logger | None = None,
+        verification_pool: VerificationPool | None = None,
+        transport: HttpTransport | None = None,
+        max_concurrency: int = MAILBOX_MAX_CONCURRENCY,
+        scheduler: PollScheduler | None = None,
     ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
         self._identity = identity
         self._agentverse = agentverse
         self._attestation: str | None = None
@@ -208,6 +333,30 @@ class MailboxClient:
         self._attestation_validity_secs = int(self._poll_interval * 1000)
         self._logger = logger or get_logger("mailbox")
         self._missing_mailbox_warning_logged = False
+        self._verification_pool = verification_pool
+        self._transport = transport or HttpTransport()
+        self._max_concurrency = max_concurrency
+        self._scheduler = scheduler or PollScheduler(interval=self._poll_interval)
+        self._long_poll_timeout: float | None = None
+        self._poll_immediately = False
+
+    def update_transport(self, transport: HttpTransport) -> None:
+        """
+        Replace the HTTP transport used to reach the mailbox.
+
+        Args:
+            transport (HttpTransport): The new transport.
+        """
+        self._transport = transport
+
+    def update_verification_pool(self, pool: VerificationPool) -> None:
+        """
+        Replace the pool used to verify the signatures of retrieved envelopes.
+
+        Args:
+            pool (VerificationPool): The new verification pool.
+        """
+        self._verification_pool = pool
 
     async def run(self):
         """Runs the mailbox client."""
@@ -217,103 +366,221 @@ class MailboxClient:
 
     async def _check_mailbox_loop(self):
         """Retrieves envelopes from the mailbox server and processes them."""
+        await asyncio.sleep(self._scheduler.initial_delay())
         while True:
+            await asyncio.sleep(await self._poll())
+
+    async def _poll(self) -> float:
+        """
+        Checks the mailbox once.
+
+        Returns:
+            float: The delay in seconds before the mailbox should be checked again.
+        """
+        try:
+            retrieved, processed = await self._check_mailbox()
+            if retrieved == 0 and self._poll_immediately:
+                return 0.0  # the server waits for new envelopes instead
+            return self._scheduler.next_delay(retrieved, processed)
+        except (ClientConnectorError, asyncio.TimeoutError) as ex:
+            self._logger.warning(f"Failed to connect to mailbox server: {ex}")
+
+        except Exception as ex:
+            self._logger.exception(f"Got exception while checking mailbox: {ex}")
+
+        return self._scheduler.failure()
+
+    async def _check_mailbox(self) -> tuple[int, int]:
+        """
+        Retrieves and processes a single page of envelopes from the mailbox server.
+
+        Returns:
+            tuple[int, int]: The number of envelopes retrieved and the number of
+            envelopes that were processed and deleted.
+        """
+        agents_url = self._agentverse.agents_api
+        params = {}
+        timeout = None
+        wait = self._long_poll_timeout
+        if wait is not None:
+            params["wait"] = str(wait)
+            timeout = aiohttp.ClientTimeout(total=wait + HTTP_REQUEST_TIMEOUT_SECONDS)
+        self._poll_immediately = False
+        start = time.monotonic()
+        async with self._transport.session.get(
+            f"{agents_url}/{self._identity.address}/mailbox",
+            params=params,
+            headers={
+                "Authorization": f"Agent {self.attestation}",
+                "Accept": self._transport.accepted_envelope_types,
+            },
+            timeout=timeout,
+        ) as resp:
+            if resp.status == 200:
+                self._update_long_poll(resp.headers.get(MAILBOX_LONG_POLL_HEADER))
+                # poll again right away if the server held the request, or if it has
+                # just started to support long-polling and will hold the next one
+                if wait is None:
+                    self._poll_immediately = self._long_poll_timeout is not None
+                else:
+                    held = time.monotonic() - start
+                    self._poll_immediately = held >= min(wait, self._poll_interval)
+                if is_msgpack(resp.content_type):
+                    try:
+                        items = decode_stored_envelopes(await resp.read())
+                    except ValueError as ex:
+                        self._logger.error(f"Failed to decode messages: {ex}")
+                        return 0, 0
+                else:
+                    items = await resp.json()
+            elif resp.status == 404:
+                if not self._missing_mailbox_warning_logged:
+                    self._logger.warning(
+                        "Agent mailbox not found: create one using the agent inspector"
+                    )
+                    self._missing_mailbox_warning_logged = True
+                return 0, 0
+            else:
+                self._logger.error(
+                    f"Failed to retrieve messages: {resp.status}:{(await resp.text())}"
+                )
+                return 0, 0
+
+        stored_envs: list[StoredEnvelope] = []
+        for item in items:
+            try:
+                stored_envs.append(StoredEnvelope.model_validate(item))
+            except ValidationError:
+                self._logger.warning("Received invalid stored envelope")
+        return len(items), await self._handle_envelopes(stored_envs)
+
+    def _update_long_poll(self, advertised: str | None):
+        """
+        Enables or disables long-polling based on the server's advertisement.
+
+        Args:
+            advertised (str | None): The maximum wait time in seconds advertised by
+            the server, or None if long-polling is not supported.
+        """
+        timeout: float | None = None
+        if advertised is not None:
+            try:
+                timeout = min(float(advertised), MAILBOX_MAX_LONG_POLL_SECONDS)
+            except ValueError:
+                self._logger.debug(f"Ignoring invalid long-poll timeout: {advertised}")
+            if timeout is not None and timeout <= 0:
+                timeout = None
+        if timeout != self._long_poll_timeout:
+            self._logger.debug(f"Mailbox long-poll timeout set to {timeout}")
+            self._long_poll_timeout = timeout
+
+    async def _handle_envelopes(self, stored_envs: list[StoredEnvelope]) -> int:
+        """
+        Verifies a page of envelopes concurrently, dispatches them in order and
+        deletes the dispatched envelopes from the mailbox server.
+
+        Args:
+            stored_envs (list[StoredEnvelope]): Envelopes to handle
+
+        Returns:
+            int: The number of envelopes that were dispatched and deleted.
+        """
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def bounded(coro):
+            async with semaphore:
+                return await coro
+
+        envelopes = await asyncio.gather(
+            *[bounded(self._verify_envelope(stored)) for stored in stored_envs]
+        )
+
+        dispatched: list[UUID4] = []
+        for stored_env, env in zip(stored_envs, envelopes, strict=True):
+            if env is None:
+                continue
             try:
-                async with aiohttp.ClientSession() as session:
-                    agents_url = self._agentverse.agents_api
-                    async with session.get(
-                        f"{agents_url}/{self._identity.address}/mailbox",
-                        headers={
-                            "Authorization": f"Agent {self.attestation}",
-                        },
-                    ) as resp:
-                        success = resp.status == 200
-                        if success:
-                            items = await resp.json()
-                            for item in items:
-                                stored_env = StoredEnvelope.model_validate(item)
-                                await self._handle_envelope(stored_env)
-                        elif resp.status == 404:
-                            if not self._missing_mailbox_warning_logged:
-                                self._logger.warning(
-                                    "Agent mailbox not found: create one using the agent inspector"
-                                )
-                                self._missing_mailbox_warning_logged = True
-                        else:
-                            self._logger.error(
-                                f"Failed to retrieve messages: {resp.status}:{(await resp.text())}"
-                            )
-            except (ClientConnectorError, asyncio.TimeoutError) as ex:
-                self._logger.warning(f"Failed to connect to mailbox server: {ex}")
-
-            except Exception as ex:
-                self._logger.exception(f"Got exception while checking mailbox: {ex}")
-
-            await asyncio.sleep(self._poll_interval)
-
-    async def _handle_envelope(self, stored_env: StoredEnvelope):
+                await dispatcher.dispatch_msg(
+                    sender=env.sender,
+                    destination=env.target,
+                    schema_digest=env.schema_digest,
+                    message=env.decode_payload(),
+                    session=env.session,
+                )
+            except QueueFullError as err:
+                # keep this and the following envelopes in the mailbox and retrieve
+                # them again later, so that they are still dispatched in order
+                self._logger.warning(f"Leaving envelopes in mailbox: {err}")
+                break
+            dispatched.append(stored_env.uuid)
+
+        # delete envelopes from server
+        deleted = await asyncio.gather(
+            *[bounded(self._delete_envelope(uuid)) for uuid in dispatched]
+        )
+        return sum(deleted)
+
+    async def _verify_envelope(self, stored_env: StoredEnvelope) -> Envelope | None:
         """
-        Handles an envelope received from the mailbox server.
-        Dispatches the incoming messages and adds the envelope to the deletion queue.
+        Validates and verifies an envelope received from the mailbox server.
 
         Args:
-            stored_env (StoredEnvelope): Envelope to handle
+            stored_env (StoredEnvelope): Envelope to verify
+
+        Returns:
+            Envelope | None: The envelope if it can be dispatched, otherwise None.
         """
         try:
             env = Envelope.model_validate(stored_env.envelope)
         except ValidationError:
             self._logger.warning("Received invalid envelope")
-            return
+            return None
 
         if not is_user_address(env.sender):  # verify signature if sent from agent
             try:
-                env.verify()
+                await verify_envelope(env, self._verification_pool)
             except Exception as err:
                 self._logger.warning(
                     "Received envelope that failed verification: %s", err
                 )
-                return
+                return None
 
         if not dispatcher.contains(env.target):
             self._logger.warning("Received envelope for unrecognized address")
-            return
+            return None
 
-        await dispatcher.dispatch_msg(
-            sender=env.sender,
-            destination=env.target,
-            schema_digest=env.schema_digest,
-            message=env.decode_payload(),
-            session=env.session,
-        )
-
-        # delete envelope from server
-        await self._delete_envelope(stored_env.uuid)
+        return env
 
-    async def _delete_envelope(self, uuid: UUID4):
+    async def _delete_envelope(self, uuid: UUID4) -> bool:
         """
         Deletes envelope from the mailbox server.
 
         Args:
             uuid (UUID4): UUID of the envelope to delete
+
+        Returns:
+            bool: True if the envelope was deleted.
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                agents_url = self._agentverse.agents_api
-                self._logger.debug(f"Deleting message: {str(uuid)}")
-                async with session.delete(
-                    f"{agents_url}/{self._identity.address}/mailbox/{str(uuid)}",
-                    headers={
-                        "Authorization": f"Agent {self.attestation}",
-                    },
-                ) as resp:
-                    if resp.status >= 300:
-                        self._logger.exception(
-                            f"Failed to delete envelope from inbox: {(await resp.text())}"
-                        )
+            agents_url = self._agentverse.agents_api
+            self._logger.debug(f"Deleting message: {str(uuid)}")
+            async with self._transport.session.delete(
+                f"{agents_url}/{self._identity.address}/mailbox/{str(uuid)}",
+                headers={
+                    "Authorization": f"Agent {self.attestation}",
+                },
+            ) as resp:
+                if resp.status >= 300:
+                    self._logger.error(
+                        f"Failed to delete envelope from inbox: {(await resp.text())}"
+                    )
+                    return False
+                return True
         except ClientConnectorError as ex:
             self._logger.warning(f"Failed to connect to mailbox server: {ex}")
         except Exception as ex:
             self._logger.exception(f"Got exception while deleting message: {ex}")
+        return False
 
     @property
     def attestation(self) -> str:
@@ -336,3 +603,84 @@ class MailboxClient:
             )
 
         return self._attestation
+
+
+class MailboxMultiplexer:
+    """
+    Polls the mailboxes of many agents (e.g. all mailbox agents of a Bureau) from a
+    single task instead of running a polling loop per agent.
+
+    The first polls are spread evenly over the base poll interval and the number of
+    concurrent polls is bounded, so that the requests of a large number of agents are
+    staggered rather than sent in bursts. Each mailbox keeps its own adaptive poll
+    interval, and all clients are expected to share the same HTTP transport. Long-poll
+    requests do not count towards the concurrency limit since they mostly wait.
+
+    Attributes:
+        _clients (list[MailboxClient]): The mailbox clients to poll.
+        _max_concurrency (int): The maximum number of concurrent short polls.
+    """
+
+    def __init__(
+        self,
+        clients: list[MailboxClient],
+        max_concurrency: int = MAILBOX_MULTIPLEXER_MAX_CONCURRENCY,
+        logger: logging.Logger | None = None,
+    ):
+        """
+        Initialize the mailbox multiplexer.
+
+        Args:
+            clients (list[MailboxClient]): The mailbox clients to poll.
+            max_concurrency (int): The maximum number of concurrent short polls.
+            logger (logging.Logger | None): The logger to use.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self._clients = clients
+        self._max_concurrency = max_concurrency
+        self._logger = logger or get_logger("mailbox")
+
+    async def run(self):
+        """Polls the mailboxes until cancelled."""
+        if not self._clients:
+            return
+        self._logger.info(
+            f"Starting mailbox multiplexer for {len(self._clients)} agents"
+        )
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        wakeup = asyncio.Event()
+        tasks: set[asyncio.Task] = set()
+
+        # stagger the first polls over the base poll interval
+        start = loop.time()
+        spacing = MAILBOX_POLL_INTERVAL_SECONDS / len(self._clients)
+        schedule = [(start + i * spacing, i) for i in range(len(self._clients))]
+
+        async def poll(index: int):
+            client = self._clients[index]
+            if client._long_poll_timeout is not None:
+                delay = await client._poll()
+            else:
+                async with semaphore:
+                    delay = await client._poll()
+            heapq.heappush(schedule, (loop.time() + delay, index))
+            wakeup.set()
+
+        try:
+            while True:
+                while schedule and schedule[0][0] <= loop.time():
+                    _, index = heapq.heappop(schedule)
+                    task = loop.create_task(poll(index))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+
+                wakeup.clear()
+                timeout = schedule[0][0] - loop.time() if schedule else None
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(wakeup.wait(), timeout)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
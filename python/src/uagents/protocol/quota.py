@@ -53,6 +53,17 @@ async def handle(ctx: Context, sender: str, msg: ExampleMessage3):
 agent.include(quota_protocol)
 ```
 
+By default the request counts are kept in the agent storage using fixed time windows.
+For agents handling many messages, an in-memory limiter avoids a storage write on every
+request. It can optionally snapshot its state to storage periodically:
+```python
+quota_protocol = QuotaProtocol(
+    storage_reference=agent.storage,
+    limiter=SlidingWindowRateLimiter(storage=agent.storage, snapshot_interval=60),
+    default_rate_limit=RateLimit(window_size_minutes=1, max_requests=3),
+)
+```
+
 Tip: The `AccessControlList` object can be used to set access control rules during
 runtime. This can be useful for dynamic access control rules based on the state of the
 agent or the network.
@@ -70,7 +81,9 @@ async def message_handler(ctx: Context, sender: str, msg: Message):
 
 import functools
 import time
+from abc import ABC, abstractmethod
 from collections.abc import Callable
+from typing import Any
 
 from pydantic import BaseModel
 from uagents_core.models import ErrorMessage
@@ -82,6 +95,8 @@ from uagents.types import MessageCallback
 
 WINDOW_SIZE_MINUTES = 60
 MAX_REQUESTS = 6
+RATE_LIMITER_EVICTION_INTERVAL_SECONDS = 60.0
+RATE_LIMITER_SNAPSHOT_KEY = "_quota_rate_limiter"
 
 
 class Usage(BaseModel):
@@ -103,6 +118,269 @@ class AccessControlList(BaseModel):
     bypass_rate_limit: set[str] = set()
 
 
+class RateLimiter(ABC):
+    """Interface for the backends keeping track of the requests made to rate limited handlers."""
+
+    @abstractmethod
+    def add_request(
+        self,
+        agent_address: str,
+        function_name: str,
+        window_size_minutes: int,
+        max_requests: int,
+    ) -> bool:
+        """
+        Record a request and check whether it is within the rate limit.
+
+        Args:
+            agent_address (str): The address of the agent making the request.
+            function_name (str): The name of the rate limited handler.
+            window_size_minutes (int): The size of the time window in minutes.
+            max_requests (int): The maximum number of requests per time window.
+
+        Returns:
+            bool: False if the maximum number of requests has been exceeded, True otherwise.
+        """
+        raise NotImplementedError
+
+
+class StorageRateLimiter(RateLimiter):
+    """
+    Rate limiter that keeps fixed time windows per agent and handler in a storage.
+    Every request reads and writes the usage of the requesting agent.
+    """
+
+    def __init__(self, storage: StorageAPI):
+        """
+        Initialize the StorageRateLimiter instance.
+
+        Args:
+            storage (StorageAPI): The storage to keep the usage in.
+        """
+        self.storage = storage
+
+    def _clean_usage(self, usage: dict[str, dict]) -> None:
+        """
+        Remove all time windows that are older than the current time window.
+
+        Args:
+            usage: The usage dictionary to clean
+        """
+        now = int(time.time())
+        for key in list(usage.keys()):
+            if (now - usage[key]["time_window_start"]) > usage[key][
+                "window_size_minutes"
+            ] * 60:
+                del usage[key]
+
+    def add_request(
+        self,
+        agent_address: str,
+        function_name: str,
+        window_size_minutes: int,
+        max_requests: int,
+    ) -> bool:
+        """
+        Add a request to the rate limiter if the current time is still within the
+        time window since the beginning of the most recent time window. Otherwise,
+        reset the time window and add the request.
+
+        Args:
+            agent_address: The address of the agent making the request.
+
+        Returns:
+            False if the maximum number of requests has been exceeded, True otherwise.
+        """
+        now = int(time.time())
+
+        usage = self.storage.get(agent_address) or {}
+
+        if function_name in usage:
+            quota = Usage(**usage[function_name])
+            if (now - quota.time_window_start) <= window_size_minutes * 60:
+                if quota.requests >= max_requests:
+                    return False
+                quota.requests += 1
+            else:
+                quota.time_window_start = now
+                quota.requests = 1
+            usage[function_name] = quota.model_dump()
+        else:
+            usage[function_name] = Usage(
+                time_window_start=now,
+                window_size_minutes=window_size_minutes,
+                requests=1,
+                max_requests=max_requests,
+            ).model_dump()
+
+        self._clean_usage(usage)
+
+        self.storage.set(agent_address, usage)
+
+        return True
+
+
+class InMemoryRateLimiter(RateLimiter):
+    """
+    Base class for rate limiters that keep their state in memory.
+
+    Each request only touches the state of the requesting agent and handler. Senders
+    that have been idle for longer than their time window are evicted periodically,
+    and the state can optionally be snapshot to a storage so that it survives restarts.
+
+    Attributes:
+        _state (dict[str, list[float]]): The limiter state per agent and handler.
+        _idle_timeout (dict[str, float]): The time after which each entry can be evicted.
+    """
+
+    def __init__(
+        self,
+        storage: StorageAPI | None = None,
+        snapshot_interval: float | None = None,
+        eviction_interval: float = RATE_LIMITER_EVICTION_INTERVAL_SECONDS,
+    ):
+        """
+        Initialize the in-memory rate limiter.
+
+        Args:
+            storage (StorageAPI | None): The storage to snapshot the state to.
+            snapshot_interval (float | None): The interval in seconds between snapshots.
+            Snapshots are disabled if None or if no storage is provided.
+            eviction_interval (float): The interval in seconds between evictions of
+            idle senders.
+        """
+        self._storage = storage
+        self._snapshot_interval = snapshot_interval
+        self._eviction_interval = eviction_interval
+        self._state: dict[str, list[float]] = {}
+        self._idle_timeout: dict[str, float] = {}
+        now = time.monotonic()
+        self._last_eviction = now
+        self._last_snapshot = now
+        if storage is not None and snapshot_interval is not None:
+            self._load_snapshot()
+
+    @property
+    def size(self) -> int:
+        """The number of senders whose requests are being tracked."""
+        return len(self._state)
+
+    @abstractmethod
+    def _allow(
+        self, state: list[float] | None, now: float, window: float, max_requests: int
+    ) -> tuple[bool, list[float]]:
+        """
+        Apply a request to the state of a single agent and handler.
+
+        Returns:
+            tuple[bool, list[float]]: Whether the request is allowed and the new state.
+        """
+        raise NotImplementedError
+
+    def add_request(
+        self,
+        agent_address: str,
+        function_name: str,
+        window_size_minutes: int,
+        max_requests: int,
+    ) -> bool:
+        if window_size_minutes <= 0:
+            # requests can not accumulate in an empty time window
+            return True
+        now = time.time()
+        window = window_size_minutes * 60
+        key = f"{agent_address}:{function_name}"
+        allowed, self._state[key] = self._allow(
+            self._state.get(key), now, window, max_requests
+        )
+        self._idle_timeout[key] = now + 2 * window
+        self._maintain()
+        return allowed
+
+    def evict(self) -> None:
+        """Remove the state of all senders that have been idle for their time window."""
+        now = time.time()
+        for key in [k for k, t in self._idle_timeout.items() if t < now]:
+            del self._state[key]
+            del self._idle_timeout[key]
+        self._last_eviction = time.monotonic()
+
+    def snapshot(self) -> None:
+        """Write the current state to the storage."""
+        if self._storage is None:
+            return
+        self._storage.set(
+            RATE_LIMITER_SNAPSHOT_KEY,
+            {"state": self._state, "idle_timeout": self._idle_timeout},
+        )
+        self._last_snapshot = time.monotonic()
+
+    def _maintain(self) -> None:
+        now = time.monotonic()
+        if now - self._last_eviction >= self._eviction_interval:
+            self.evict()
+        if (
+            self._snapshot_interval is not None
+            and now - self._last_snapshot >= self._snapshot_interval
+        ):
+            self.snapshot()
+
+    def _load_snapshot(self) -> None:
+        snapshot: dict[str, Any] | None = self._storage.get(RATE_LIMITER_SNAPSHOT_KEY)  # type: ignore
+        if not snapshot:
+            return
+        self._state = snapshot.get("state", {})
+        self._idle_timeout = snapshot.get("idle_timeout", {})
+        self.evict()
+
+
+class SlidingWindowRateLimiter(InMemoryRateLimiter):
+    """
+    In-memory rate limiter using a sliding window counter.
+
+    The number of requests in the sliding window is estimated from the counts of the
+    current and the previous fixed window, weighted by their overlap with the sliding
+    window, which avoids bursts of twice the limit at window boundaries.
+    """
+
+    def _allow(
+        self, state: list[float] | None, now: float, window: float, max_requests: int
+    ) -> tuple[bool, list[float]]:
+        index = now // window
+        if state is None or state[0] < index - 1:
+            previous, current = 0.0, 0.0
+        elif state[0] < index:
+            previous, current = state[2], 0.0
+        else:
+            previous, current = state[1], state[2]
+
+        weight = 1 - (now % window) / window
+        if previous * weight + current >= max_requests:
+            return False, [index, previous, current]
+        return True, [index, previous, current + 1]
+
+
+class TokenBucketRateLimiter(InMemoryRateLimiter):
+    """
+    In-memory rate limiter using a token bucket.
+
+    Each agent and handler has a bucket of `max_requests` tokens that refills
+    continuously over the time window, allowing short bursts up to the full limit.
+    """
+
+    def _allow(
+        self, state: list[float] | None, now: float, window: float, max_requests: int
+    ) -> tuple[bool, list[float]]:
+        if state is None:
+            tokens = float(max_requests)
+        else:
+            refill = (now - state[1]) * max_requests / window
+            tokens = min(float(max_requests), state[0] + refill)
+        if tokens < 1:
+            return False, [tokens, now]
+        return True, [tokens - 1, now]
+
+
 class QuotaProtocol(Protocol):
     def __init__(
         self,
@@ -113,6 +391,7 @@ class QuotaProtocol(Protocol):
         role: str | None = None,
         default_rate_limit: RateLimit | None = None,
         default_acl: AccessControlList | None = None,
+        limiter: RateLimiter | None = None,
     ):
         """
         Initialize a QuotaProtocol instance.
@@ -125,9 +404,12 @@ class QuotaProtocol(Protocol):
             role (str | None): The role of the protocol. Defaults to None.
             default_rate_limit (RateLimit | None): The default rate limit. Defaults to None.
             default_acl (AccessControlList | None): The access control list. Defaults to None.
+            limiter (RateLimiter | None): The rate limiter backend. Defaults to a
+            `StorageRateLimiter` using the storage reference.
         """
         super().__init__(name=name, version=version, spec=spec, role=role)
         self.storage_ref = storage_reference
+        self.limiter = limiter or StorageRateLimiter(storage_reference)
         self.default_rate_limit = default_rate_limit
         self.default_acl = default_acl
 
@@ -215,20 +497,6 @@ class QuotaProtocol(Protocol):
 
         return decorator  # type: ignore
 
-    def _clean_usage(self, usage: dict[str, dict]) -> None:
-        """
-        Remove all time windows that are older than the current time window.
-
-        Args:
-            usage: The usage dictionary to clean
-        """
-        now = int(time.time())
-        for key in list(usage.keys()):
-            if (now - usage[key]["time_window_start"]) > usage[key][
-                "window_size_minutes"
-            ] * 60:
-                del usage[key]
-
     def add_request(
         self,
         agent_address: str,
@@ -237,9 +505,7 @@ class QuotaProtocol(Protocol):
         max_requests: int,
     ) -> bool:
         """
-        Add a request to the rate limiter if the current time is still within the
-        time window since the beginning of the most recent time window. Otherwise,
-        reset the time window and add the request.
+        Add a request to the rate limiter backend.
 
         Args:
             agent_address: The address of the agent making the request.
@@ -247,30 +513,9 @@ class QuotaProtocol(Protocol):
         Returns:
             False if the maximum number of requests has been exceeded, True otherwise.
         """
-        now = int(time.time())
-
-        usage = self.storage_ref.get(agent_address) or {}
-
-        if function_name in usage:
-            quota = Usage(**usage[function_name])
-            if (now - quota.time_window_start) <= window_size_minutes * 60:
-                if quota.requests >= max_requests:
-                    return False
-                quota.requests += 1
-            else:
-                quota.time_window_start = now
-                quota.requests = 1
-            usage[function_name] = quota.model_dump()
-        else:
-            usage[function_name] = Usage(
-                time_window_start=now,
-                window_size_minutes=window_size_minutes,
-                requests=1,
-                max_requests=max_requests,
-            ).model_dump()
-
-        self._clean_usage(usage)
-
-        self.storage_ref.set(agent_address, usage)
-
-        return True
+        return self.limiter.add_request(
+            agent_address=agent_address,
+            function_name=function_name,
+            window_size_minutes=window_size_minutes,
+            max_requests=max_requests,
+        )
@@ -1,10 +1,17 @@
 """Endpoint Resolver."""
 
+import asyncio
 import logging
 import random
+import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+from typing import Any
 
 import aiohttp
 from pydantic import BaseModel
@@ -12,15 +19,26 @@ from uagents_core.helpers import weighted_random_sample
 from uagents_core.identity import parse_identifier
 
 from uagents.config import (
+    AGENT_SEARCH_CACHE_SIZE,
+    AGENT_SEARCH_CACHE_TTL_SECONDS,
     ALMANAC_API_URL,
     DEFAULT_MAX_ENDPOINTS,
+    LEDGER_CIRCUIT_FAILURE_THRESHOLD,
+    LEDGER_CIRCUIT_RESET_SECONDS,
+    LEDGER_QUERY_MAX_IN_FLIGHT,
+    LEDGER_QUERY_MAX_WORKERS,
+    LEDGER_QUERY_TIMEOUT_SECONDS,
     MAINNET_PREFIX,
+    RESOLVER_CACHE_FAILURE_TTL_SECONDS,
+    RESOLVER_CACHE_SIZE,
+    RESOLVER_CACHE_TTL_SECONDS,
     TESTNET_PREFIX,
 )
 from uagents.network import (
     get_almanac_contract,
     get_name_service_contract,
 )
+from uagents.transport import HttpTransport
 from uagents.types import AgentNetwork
 from uagents.utils import get_logger
 
@@ -116,6 +134,109 @@ def get_agent_address(name: str, network: AgentNetwork) -> str | None:
     return None
 
 
+class LedgerQueryError(Exception):
+    """Raised when a ledger query fails, times out or is skipped by the circuit breaker."""
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing dependency for a while after repeated failures.
+
+    After `failure_threshold` consecutive failures the breaker opens and rejects calls
+    for `reset_timeout` seconds. Afterwards calls are let through again and the first
+    success closes the breaker, while another failure opens it for another period.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = LEDGER_CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = LEDGER_CIRCUIT_RESET_SECONDS,
+    ):
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are currently rejected."""
+        if self._opened_at is None:
+            return False
+        return time.monotonic() - self._opened_at < self._reset_timeout
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._failures >= self._failure_threshold:
+            self._opened_at = time.monotonic()
+
+
+_ledger_executor = ThreadPoolExecutor(
+    max_workers=LEDGER_QUERY_MAX_WORKERS, thread_name_prefix="ledger-query"
+)
+_ledger_breakers: dict[str, CircuitBreaker] = {}
+_ledger_in_flight: dict[str, set[Future]] = {}
+
+
+async def run_ledger_query(
+    query: Callable[..., Any],
+    *args: Any,
+    network: AgentNetwork,
+    timeout: float = LEDGER_QUERY_TIMEOUT_SECONDS,
+) -> Any:
+    """
+    Run a blocking ledger query on the bounded ledger executor.
+
+    Queries are guarded by a per-network circuit breaker so that an unavailable ledger
+    node does not tie up the executor with calls that are bound to time out. As a timed
+    out query keeps its worker until it returns, the queries of each network are also
+    tracked until they complete and no more than `LEDGER_QUERY_MAX_IN_FLIGHT` of them
+    are submitted at a time.
+
+    Args:
+        query (Callable[..., Any]): The blocking query function.
+        *args (Any): The positional arguments for the query function.
+        network (AgentNetwork): The network the query is sent to.
+        timeout (float): The timeout for the query in seconds.
+
+    Returns:
+        Any: The query result.
+
+    Raises:
+        ValueError: If the query function raises a ValueError.
+        LedgerQueryError: If the query fails, times out, the circuit breaker is open or
+        too many queries to the network are still running.
+    """
+    breaker = _ledger_breakers.setdefault(network, CircuitBreaker())
+    if breaker.is_open:
+        raise LedgerQueryError(f"Ledger queries to {network} temporarily disabled")
+
+    in_flight = _ledger_in_flight.setdefault(network, set())
+    if len(in_flight) >= LEDGER_QUERY_MAX_IN_FLIGHT:
+        raise LedgerQueryError(f"Too many pending ledger queries to {network}")
+
+    future = _ledger_executor.submit(query, *args, network)
+    in_flight.add(future)
+    future.add_done_callback(in_flight.discard)
+    try:
+        # a query that has not started yet is cancelled on timeout
+        result = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+    except ValueError:
+        raise
+    except asyncio.TimeoutError as ex:
+        breaker.record_failure()
+        raise LedgerQueryError(f"Ledger query to {network} timed out") from ex
+    except Exception as ex:
+        breaker.record_failure()
+        raise LedgerQueryError(f"Ledger query to {network} failed: {ex}") from ex
+
+    breaker.record_success()
+    return result
+
+
 def build_identifier(
     prefix: str | None = None, name: str | None = None, address: str | None = None
 ) -> str:
@@ -142,6 +263,52 @@ def build_identifier(
     return identifier
 
 
+def _parse_expiry(expiry: str) -> float | None:
+    """Parse the expiry of an Almanac API record into a UNIX timestamp."""
+    try:
+        return datetime.fromisoformat(expiry.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True)
+class Resolution:
+    """
+    The record a destination resolves to, before its endpoints are sampled.
+
+    Attributes:
+        address (str | None): The address of the agent, None if it could not be resolved.
+        endpoints (list[str]): All endpoints of the agent.
+        weights (list[float] | None): The weights of the endpoints, None to sample them
+        uniformly.
+        max_endpoints (int | None): The number of endpoints to sample, None to use the
+        endpoints as they are.
+        expiry (float | None): When the record expires as a UNIX timestamp, if known.
+    """
+
+    address: str | None
+    endpoints: list[str]
+    weights: list[float] | None = None
+    max_endpoints: int | None = None
+    expiry: float | None = None
+
+    def sample(self) -> tuple[str | None, list[str]]:
+        """
+        Sample the endpoints to send a message to.
+
+        Returns:
+            tuple[str | None, list[str]]: The address (if available) and the sampled
+            endpoints.
+        """
+        if self.max_endpoints is None or not self.endpoints:
+            return self.address, list(self.endpoints)
+        return self.address, weighted_random_sample(
+            self.endpoints,
+            weights=self.weights,
+            k=min(self.max_endpoints, len(self.endpoints)),
+        )
+
+
 class Resolver(ABC):
     @abstractmethod
     async def resolve(self, destination: str) -> tuple[str | None, list[str]]:
@@ -156,10 +323,166 @@ class Resolver(ABC):
         """
         raise NotImplementedError
 
+    async def lookup(self, destination: str) -> Resolution:
+        """
+        Look up the record of the destination without sampling its endpoints, so that
+        it can be cached and sampled for every message. By default, the result of
+        `resolve` is used as it is.
+
+        Args:
+            destination (str): The destination name or address to look up.
+
+        Returns:
+            Resolution: The record of the destination.
+        """
+        address, endpoints = await self.resolve(destination)
+        return Resolution(address=address, endpoints=endpoints)
+
+    def invalidate(self, destination: str) -> None:
+        """
+        Drop any cached resolution for the destination.
+
+        Args:
+            destination (str): The destination name or address.
+        """
+        return None
+
+    async def resolve_many(
+        self, destinations: list[str]
+    ) -> dict[str, tuple[str | None, list[str]]]:
+        """
+        Resolve several destinations concurrently.
+
+        Args:
+            destinations (list[str]): The destination names or addresses to resolve.
+
+        Returns:
+            dict[str, tuple[str | None, list[str]]]: The address (if available) and
+            resolved endpoints of each destination.
+        """
+        results = await asyncio.gather(
+            *(self.resolve(destination) for destination in destinations)
+        )
+        return dict(zip(destinations, results, strict=True))
+
+
+class CachingResolver(Resolver):
+    """
+    Resolver that caches the results of another resolver.
+
+    The records looked up by the underlying resolver are cached and their endpoints
+    are sampled again on every resolution, so endpoint weights keep spreading the load.
+    Successful lookups are kept until the underlying record expires or the TTL
+    elapses, whichever comes first. Failed lookups are kept for a shorter time.
+    Concurrent lookups for the same destination share a single in-flight request
+    and the number of cached destinations is bounded (least recently used first out).
+    """
+
+    def __init__(
+        self,
+        resolver: Resolver,
+        max_size: int = RESOLVER_CACHE_SIZE,
+        ttl: float = RESOLVER_CACHE_TTL_SECONDS,
+        failure_ttl: float = RESOLVER_CACHE_FAILURE_TTL_SECONDS,
+    ):
+        """
+        Initialize the CachingResolver.
+
+        Args:
+            resolver (Resolver): The resolver to cache results for.
+            max_size (int): The maximum number of cached destinations.
+            ttl (float): The maximum time in seconds to cache a successful resolution.
+            failure_ttl (float): The time in seconds to cache a failed resolution.
+        """
+        self._resolver = resolver
+        self._max_size = max_size
+        self._ttl = ttl
+        self._failure_ttl = failure_ttl
+        self._entries: OrderedDict[str, tuple[Resolution, float]] = OrderedDict()
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    @property
+    def resolver(self) -> Resolver:
+        """The underlying resolver."""
+        return self._resolver
+
+    @property
+    def size(self) -> int:
+        """The number of cached destinations."""
+        return len(self._entries)
+
+    def _entry_ttl(self, resolution: Resolution) -> float:
+        if resolution.address is None or not resolution.endpoints:
+            return self._failure_ttl
+        ttl = self._ttl
+        if resolution.expiry is not None:
+            ttl = min(ttl, resolution.expiry - time.time())
+        return max(ttl, 0.0)
+
+    async def _lookup_and_store(self, destination: str) -> Resolution:
+        resolution = await self._resolver.lookup(destination)
+        ttl = self._entry_ttl(resolution)
+        if ttl > 0 and self._max_size > 0:
+            self._entries[destination] = (resolution, time.monotonic() + ttl)
+            self._entries.move_to_end(destination)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+        return resolution
+
+    async def lookup(self, destination: str) -> Resolution:
+        """
+        Look up the record of the destination in the cache or the underlying resolver.
+
+        Args:
+            destination (str): The destination name or address to look up.
+
+        Returns:
+            Resolution: The record of the destination.
+        """
+        entry = self._entries.get(destination)
+        if entry is not None:
+            resolution, expires_at = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(destination)
+                return resolution
+            del self._entries[destination]
+
+        lookup = self._in_flight.get(destination)
+        if lookup is None:
+            lookup = asyncio.ensure_future(self._lookup_and_store(destination))
+            self._in_flight[destination] = lookup
+            lookup.add_done_callback(lambda _: self._in_flight.pop(destination, None))
+
+        # shield the shared lookup from cancellation of any single caller
+        return await asyncio.shield(lookup)
+
+    async def resolve(self, destination: str) -> tuple[str | None, list[str]]:
+        """
+        Resolve the destination from the cache or the underlying resolver.
+
+        Args:
+            destination (str): The destination name or address to resolve.
+
+        Returns:
+            tuple[str | None, list[str]]: The address (if available) and resolved endpoints.
+        """
+        return (await self.lookup(destination)).sample()
+
+    def invalidate(self, destination: str) -> None:
+        self._entries.pop(destination, None)
+        self._resolver.invalidate(destination)
+
+    def clear(self) -> None:
+        """Drop all cached resolutions."""
+        self._entries.clear()
+
 
 class GlobalResolver(Resolver):
     def __init__(
-        self, max_endpoints: int | None = None, almanac_api_url: str | None = None
+        self,
+        max_endpoints: int | None = None,
+        almanac_api_url: str | None = None,
+        cache_size: int = RESOLVER_CACHE_SIZE,
     ):
         """
         Initialize the GlobalResolver.
@@ -167,6 +490,7 @@ class GlobalResolver(Resolver):
         Args:
             max_endpoints (int | None): The maximum number of endpoints to return.
             almanac_api_url (str | None): The url for almanac api
+            cache_size (int): The maximum number of cached resolutions (0 disables caching).
         """
         self._max_endpoints = max_endpoints or DEFAULT_MAX_ENDPOINTS
         self._almanac_api_resolver = AlmanacApiResolver(
@@ -175,6 +499,15 @@ class GlobalResolver(Resolver):
         self._name_service_resolver = NameServiceResolver(
             max_endpoints=self._max_endpoints, almanac_api_url=almanac_api_url
         )
+        self._address_resolver: Resolver = self._almanac_api_resolver
+        self._name_resolver: Resolver = self._name_service_resolver
+        if cache_size > 0:
+            self._address_resolver = CachingResolver(
+                self._almanac_api_resolver, max_size=cache_size
+            )
+            self._name_resolver = CachingResolver(
+                self._name_service_resolver, max_size=cache_size
+            )
 
     async def resolve(self, destination: str) -> tuple[str | None, list[str]]:
         """
@@ -190,13 +523,15 @@ class GlobalResolver(Resolver):
         prefix, _, address = parse_identifier(destination)
 
         if is_valid_prefix(prefix):
-            resolver = (
-                self._almanac_api_resolver if address else self._name_service_resolver
-            )
+            resolver = self._address_resolver if address else self._name_resolver
             return await resolver.resolve(destination)
 
         return None, []
 
+    def invalidate(self, destination: str) -> None:
+        self._address_resolver.invalidate(destination)
+        self._name_resolver.invalidate(destination)
+
 
 class AlmanacContractResolver(Resolver):
     def __init__(self, max_endpoints: int | None = None):
@@ -218,22 +553,45 @@ class AlmanacContractResolver(Resolver):
         Returns:
             tuple[str | None, list[str]]: The address and resolved endpoints.
         """
+        return (await self.lookup(destination)).sample()
+
+    async def lookup(self, destination: str) -> Resolution:
+        """
+        Look up the record of the destination in the Almanac contract.
+
+        Args:
+            destination (str): The destination address to look up.
+
+        Returns:
+            Resolution: The record of the destination.
+        """
         prefix, _, address = parse_identifier(destination)
 
         result: dict | None = None
-        if prefix == MAINNET_PREFIX:
-            result = query_record(agent_address=address, network="mainnet")
-        elif prefix == TESTNET_PREFIX:
-            result = query_record(agent_address=address, network="testnet")
-        elif prefix == "":
-            for network in ["mainnet", "testnet"]:
-                try:
-                    result = query_record(agent_address=address, network=network)
-                    if result is not None and result.get("record") is not None:
-                        break
-                except ValueError:
-                    if network == "testnet":
-                        raise
+        try:
+            if prefix == MAINNET_PREFIX:
+                result = await run_ledger_query(
+                    query_record, address, network="mainnet"
+                )
+            elif prefix == TESTNET_PREFIX:
+                result = await run_ledger_query(
+                    query_record, address, network="testnet"
+                )
+            elif prefix == "":
+                for network in ["mainnet", "testnet"]:
+                    try:
+                        result = await run_ledger_query(
+                            query_record, address, network=network
+                        )
+                        if result is not None and result.get("record") is not None:
+                            break
+                    except ValueError:
+                        if network == "testnet":
+                            raise
+                    except LedgerQueryError as ex:
+                        LOGGER.warning(f"Unable to query Almanac contract: {ex}")
+        except LedgerQueryError as ex:
+            LOGGER.warning(f"Unable to query Almanac contract: {ex}")
 
         if result is not None:
             record = result.get("record") or {}
@@ -242,15 +600,14 @@ class AlmanacContractResolver(Resolver):
             )
 
             if len(endpoint_list) > 0:
-                endpoints = [val.get("url") for val in endpoint_list]
-                weights = [val.get("weight") for val in endpoint_list]
-                return address, weighted_random_sample(
-                    items=endpoints,
-                    weights=weights,
-                    k=min(self._max_endpoints, len(endpoints)),
+                return Resolution(
+                    address=address,
+                    endpoints=[val.get("url") for val in endpoint_list],
+                    weights=[val.get("weight") for val in endpoint_list],
+                    max_endpoints=self._max_endpoints,
                 )
 
-        return None, []
+        return Resolution(address=None, endpoints=[])
 
 
 class AlmanacApiResolver(Resolver):
@@ -270,16 +627,17 @@ class AlmanacApiResolver(Resolver):
             max_endpoints=self._max_endpoints
         )
 
-    async def _api_resolve(self, destination: str) -> tuple[str | None, list[str]]:
+    async def _api_lookup(self, destination: str) -> Resolution:
         """
-        Resolve the destination using the Almanac API.
+        Look up the record of the destination using the Almanac API.
 
         Args:
-            destination (str): The destination address to resolve.
+            destination (str): The destination address to look up.
 
         Returns:
-            tuple[str | None, list[str]]: The address and resolved endpoints.
+            Resolution: The record of the destination.
         """
+        failed = Resolution(address=None, endpoints=[])
         try:
             prefix, _, address = parse_identifier(destination)
 
@@ -297,30 +655,30 @@ class AlmanacApiResolver(Resolver):
                         f"Failed to resolve agent {address} from {self._almanac_api_url}, "
                         "resolving via Almanac contract..."
                     )
-                    return None, []
+                    return failed
 
                 agent = await response.json()
 
             expiry_str = agent.get("expiry", None)
             if expiry_str is None:
-                return None, []
+                return failed
 
             endpoint_list = agent.get("endpoints", [])
 
             if len(endpoint_list) > 0:
-                endpoints = [val.get("url") for val in endpoint_list]
-                weights = [val.get("weight") for val in endpoint_list]
-                return address, weighted_random_sample(
-                    endpoints,
-                    weights=weights,
-                    k=min(self._max_endpoints, len(endpoints)),
+                return Resolution(
+                    address=address,
+                    endpoints=[val.get("url") for val in endpoint_list],
+                    weights=[val.get("weight") for val in endpoint_list],
+                    max_endpoints=self._max_endpoints,
+                    expiry=_parse_expiry(expiry_str),
                 )
         except Exception as e:
             LOGGER.error(
                 f"Error in AlmanacApiResolver when resolving {destination}: {e}"
             )
 
-        return None, []
+        return failed
 
     async def resolve(self, destination: str) -> tuple[str | None, list[str]]:
         """
@@ -333,12 +691,23 @@ class AlmanacApiResolver(Resolver):
         Returns:
             tuple[str | None, list[str]]: The address and resolved endpoints.
         """
-        address, endpoints = await self._api_resolve(destination)
-        return (
-            (address, endpoints)
-            if address is not None
-            else await self._almanac_contract_resolver.resolve(destination)
-        )
+        return (await self.lookup(destination)).sample()
+
+    async def lookup(self, destination: str) -> Resolution:
+        """
+        Look up the record of the destination using the Almanac API, falling back to
+        the Almanac contract.
+
+        Args:
+            destination (str): The destination address to look up.
+
+        Returns:
+            Resolution: The record of the destination.
+        """
+        resolution = await self._api_lookup(destination)
+        if resolution.address is not None:
+            return resolution
+        return await self._almanac_contract_resolver.lookup(destination)
 
 
 class NameServiceResolver(Resolver):
@@ -357,16 +726,17 @@ class NameServiceResolver(Resolver):
             almanac_api_url=almanac_api_url, max_endpoints=self._max_endpoints
         )
 
-    async def _api_resolve(self, destination: str) -> tuple[str | None, list[str]]:
+    async def _api_lookup(self, destination: str) -> Resolution:
         """
-        Resolve the destination using the Almanac Domains API.
+        Look up the record of the destination using the Almanac Domains API.
 
         Args:
-            destination (str): The agent identifier to resolve.
+            destination (str): The agent identifier to look up.
 
         Returns:
-            Tuple[Optional[str], List[str]]: The address (if available) and resolved endpoints.
+            Resolution: The record of the agent the name is assigned to.
         """
+        failed = Resolution(address=None, endpoints=[])
         try:
             prefix, domain, _ = parse_identifier(destination)
 
@@ -384,13 +754,13 @@ class NameServiceResolver(Resolver):
                         f"Failed to resolve name {domain} from {self._almanac_api_url}: "
                         f"{response.status}: {await response.text()}"
                     )
-                    return None, []
+                    return failed
 
                 domain_record = Domain.model_validate(await response.json())
 
             agent_records = domain_record.assigned_agents
             if len(agent_records) == 0:
-                return None, []
+                return failed
             elif len(agent_records) == 1:
                 address = agent_records[0].address
             else:
@@ -399,11 +769,11 @@ class NameServiceResolver(Resolver):
                 address = weighted_random_sample(addresses, weights=weights, k=1)[0]
 
             identifier = build_identifier(prefix=prefix, address=address)
-            return await self._almanac_api_resolver.resolve(identifier)
+            return await self._almanac_api_resolver.lookup(identifier)
 
         except Exception as ex:
             LOGGER.error(f"Error when resolving {destination}: {ex}")
-            return None, []
+            return failed
 
     async def resolve(self, destination: str) -> tuple[str | None, list[str]]:
         """
@@ -415,31 +785,50 @@ class NameServiceResolver(Resolver):
         Returns:
             tuple[str | None, list[str]]: The address (if available) and resolved endpoints.
         """
+        return (await self.lookup(destination)).sample()
+
+    async def lookup(self, destination: str) -> Resolution:
+        """
+        Look up the record of the agent the destination name is assigned to.
+
+        Args:
+            destination (str): The destination name to look up.
+
+        Returns:
+            Resolution: The record of the agent.
+        """
         prefix, name, _ = parse_identifier(destination)
 
-        api_result = await self._api_resolve(destination)
+        api_result = await self._api_lookup(destination)
 
         if api_result:
             return api_result
 
-        address: str | None = None
         if prefix == MAINNET_PREFIX:
-            address = get_agent_address(name, "mainnet")
+            networks = ["mainnet"]
         elif prefix == TESTNET_PREFIX:
-            address = get_agent_address(name, "testnet")
+            networks = ["testnet"]
         elif prefix == "":
-            for network in ["mainnet", "testnet"]:
-                address = get_agent_address(name, network)  # type: ignore
-                if address is not None:
-                    break
+            networks = ["mainnet", "testnet"]
         else:
             raise ValueError(f"Invalid prefix: {prefix}")
 
+        address: str | None = None
+        for network in networks:
+            try:
+                address = await run_ledger_query(
+                    get_agent_address, name, network=network
+                )
+            except LedgerQueryError as ex:
+                LOGGER.warning(f"Unable to query name service contract: {ex}")
+            if address is not None:
+                break
+
         if address is not None:
             identifier = build_identifier(prefix=prefix, address=address)
-            return await self._almanac_api_resolver.resolve(identifier)
+            return await self._almanac_api_resolver.lookup(identifier)
 
-        return None, []
+        return Resolution(address=None, endpoints=[])
 
 
 class RulesBasedResolver(Resolver):
@@ -474,3 +863,148 @@ class RulesBasedResolver(Resolver):
                 population=endpoints, k=min(self._max_endpoints, len(endpoints))
             )
         return destination, endpoints
+
+
+class AgentSearch:
+    """
+    Searches the Almanac API for the active agents supporting a protocol.
+
+    Results are cached per (Almanac API url, protocol digest) for a limited time and
+    concurrent searches for the same protocol share a single in-flight request, so
+    agents broadcasting on an interval do not query the API every time.
+    """
+
+    def __init__(
+        self,
+        transport: HttpTransport | None = None,
+        max_size: int = AGENT_SEARCH_CACHE_SIZE,
+        ttl: float = AGENT_SEARCH_CACHE_TTL_SECONDS,
+    ):
+        """
+        Initialize the AgentSearch.
+
+        Args:
+            transport (HttpTransport | None): The pooled HTTP transport to search with.
+            A new transport is created if not provided.
+            max_size (int): The maximum number of cached search results.
+            ttl (float): The time in seconds to cache a search result.
+        """
+        self._transport = transport or HttpTransport()
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries: OrderedDict[tuple[str, str], tuple[list[str], float]] = (
+            OrderedDict()
+        )
+        self._in_flight: dict[tuple[str, str], asyncio.Future] = {}
+
+    @property
+    def size(self) -> int:
+        """The number of cached search results."""
+        return len(self._entries)
+
+    def update_transport(self, transport: HttpTransport) -> None:
+        """
+        Replace the HTTP transport used to search agents.
+
+        Args:
+            transport (HttpTransport): The new transport.
+        """
+        self._transport = transport
+
+    def get_cached(
+        self, protocol_digest: str, almanac_api_url: str
+    ) -> list[str] | None:
+        """
+        Get the cached active agents for a protocol, if the result has not expired.
+
+        Args:
+            protocol_digest (str): The protocol digest, starting with "proto:".
+            almanac_api_url (str): The url of the Almanac API.
+
+        Returns:
+            list[str] | None: The agent addresses or None if not cached.
+        """
+        key = (almanac_api_url, protocol_digest)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        agents, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return list(agents)
+
+    def store(
+        self, protocol_digest: str, almanac_api_url: str, agents: list[str]
+    ) -> None:
+        """
+        Cache the active agents for a protocol.
+
+        Args:
+            protocol_digest (str): The protocol digest, starting with "proto:".
+            almanac_api_url (str): The url of the Almanac API.
+            agents (list[str]): The active agent addresses.
+        """
+        if self._ttl <= 0 or self._max_size <= 0:
+            return
+        key = (almanac_api_url, protocol_digest)
+        self._entries[key] = (list(agents), time.monotonic() + self._ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    async def _fetch(self, protocol_digest: str, almanac_api_url: str) -> list[str]:
+        session = self._transport.session
+        try:
+            async with session.post(
+                url=almanac_api_url + "/search",
+                json={"text": protocol_digest[6:]},
+            ) as response:
+                if response.status != 200:
+                    LOGGER.warning(
+                        f"Failed to search agents for {protocol_digest}: "
+                        f"status {response.status}"
+                    )
+                    return []
+                data = await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as ex:
+            LOGGER.warning(f"Failed to search agents for {protocol_digest}: {ex}")
+            return []
+
+        agents = [agent["address"] for agent in data if agent["status"] == "active"]
+        self.store(protocol_digest, almanac_api_url, agents)
+        return agents
+
+    async def search(
+        self, protocol_digest: str, almanac_api_url: str = ALMANAC_API_URL
+    ) -> list[str]:
+        """
+        Get the active agents for a protocol from the cache or the Almanac API.
+
+        Args:
+            protocol_digest (str): The protocol digest, starting with "proto:".
+            almanac_api_url (str): The url of the Almanac API.
+
+        Returns:
+            list[str]: The active agent addresses, empty if the search failed.
+        """
+        agents = self.get_cached(protocol_digest, almanac_api_url)
+        if agents is not None:
+            return agents
+
+        key = (almanac_api_url, protocol_digest)
+        search = self._in_flight.get(key)
+        if search is None:
+            search = asyncio.ensure_future(
+                self._fetch(protocol_digest, almanac_api_url)
+            )
+            self._in_flight[key] = search
+            search.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        # shield the shared search from cancellation of any single caller
+        return list(await asyncio.shield(search))
+
+    def clear(self) -> None:
+        """Drop all cached search results."""
+        self._entries.clear()
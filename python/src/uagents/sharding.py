@@ -0,0 +1,470 @@
+"""Bureau that spreads its agents across several worker processes."""
+
+import asyncio
+import contextlib
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import signal
+import socket
+import struct
+import tempfile
+import uuid
+from multiprocessing.connection import Connection
+from typing import Any
+
+from uagents_core.models import Model
+
+from uagents.agent import Agent, Bureau
+from uagents.asgi import HOST, ASGIServer
+from uagents.dispatch import Dispatcher, Sink, dispatcher
+from uagents.types import JsonStr, LocalMessage, RestMethod, message_json
+from uagents.utils import get_logger
+from uagents.workers import QueueFullError
+
+LOGGER: logging.Logger = get_logger("sharding")
+
+FRAME_HEADER = struct.Struct(">I")
+
+
+def shard_socket_path(socket_dir: str, index: int) -> str:
+    """
+    Get the path of the Unix-domain socket on which a shard receives local messages.
+
+    Args:
+        socket_dir (str): The directory holding the sockets of all shards.
+        index (int): The index of the shard.
+
+    Returns:
+        str: The socket path.
+    """
+    return os.path.join(socket_dir, f"shard-{index}.sock")
+
+
+async def _write_frame(writer: asyncio.StreamWriter, payload: dict[str, Any]):
+    data = json.dumps(payload).encode()
+    writer.write(FRAME_HEADER.pack(len(data)) + data)
+    await writer.drain()
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> dict[str, Any]:
+    (length,) = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    return json.loads(await reader.readexactly(length))
+
+
+async def _wait_readable(fd: int):
+    """Wait until a file descriptor (e.g. a pipe or a process sentinel) is readable."""
+    loop = asyncio.get_running_loop()
+    readable = loop.create_future()
+    loop.add_reader(fd, lambda: readable.done() or readable.set_result(None))
+    try:
+        await readable
+    finally:
+        loop.remove_reader(fd)
+
+
+async def _receive(conn: Connection) -> Any:
+    """Receive an object from a pipe without blocking the event loop."""
+    await _wait_readable(conn.fileno())
+    return conn.recv()
+
+
+class ShardClient:
+    """
+    Sends local messages to the agents of another shard over its Unix-domain socket.
+
+    Connections are kept open and reused, a new one is opened whenever all existing
+    connections are busy.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the shard client.
+
+        Args:
+            path (str): The Unix-domain socket path of the shard.
+        """
+        self._path = path
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def request(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """
+        Send a request to the shard and wait for its reply.
+
+        Args:
+            payload (dict[str, Any]): The request.
+
+        Returns:
+            dict[str, Any]: The reply of the shard.
+        """
+        if self._idle:
+            reader, writer = self._idle.pop()
+        else:
+            reader, writer = await asyncio.open_unix_connection(self._path)
+        try:
+            await _write_frame(writer, payload)
+            reply = await _read_frame(reader)
+        except BaseException:
+            writer.close()
+            raise
+        self._idle.append((reader, writer))
+        return reply
+
+    def close(self):
+        """Close all idle connections."""
+        for _, writer in self._idle:
+            writer.close()
+        self._idle.clear()
+
+
+class ShardSink(Sink):
+    """Sink standing in for an agent that runs on another shard."""
+
+    def __init__(self, address: str, client: ShardClient):
+        """
+        Initialize the shard sink.
+
+        Args:
+            address (str): The address of the agent on the other shard.
+            client (ShardClient): The client of the shard running the agent.
+        """
+        self._address = address
+        self._client = client
+
+    async def handle_message(
+        self,
+        sender: str,
+        schema_digest: str,
+        message: JsonStr | LocalMessage,
+        session: uuid.UUID,
+    ):
+        reply = await self._client.request(
+            {
+                "type": "message",
+                "sender": sender,
+                "destination": self._address,
+                "schema_digest": schema_digest,
+                "message": message_json(message),
+                "session": str(session),
+            }
+        )
+        if reply["status"] == "queue_full":
+            raise QueueFullError(reply["retry_after"])
+        if reply["status"] != "ok":
+            raise RuntimeError(f"Shard failed to handle message: {reply['detail']}")
+
+    async def handle_rest(
+        self, method: RestMethod, endpoint: str, message: Model | None
+    ) -> dict[str, Any] | None:
+        reply = await self._client.request(
+            {
+                "type": "rest",
+                "destination": self._address,
+                "method": method,
+                "endpoint": endpoint,
+                "message": message.json() if message is not None else None,
+            }
+        )
+        if reply["status"] != "ok":
+            raise RuntimeError(f"Shard failed to handle request: {reply['detail']}")
+        return reply["response"]
+
+
+class ShardListener:
+    """
+    Receives the local messages sent to the agents of this shard by other shards and
+    dispatches them as if they had been sent from within this process.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        server: ASGIServer,
+        local_dispatcher: Dispatcher | None = None,
+    ):
+        """
+        Initialize the shard listener.
+
+        Args:
+            path (str): The Unix-domain socket path to listen on.
+            server (ASGIServer): The server holding the REST endpoints of the agents.
+            local_dispatcher (Dispatcher | None): The dispatcher of the local agents.
+            Defaults to the process-wide dispatcher.
+        """
+        self._path = path
+        self._server = server
+        self._dispatcher = local_dispatcher or dispatcher
+        self._unix_server: asyncio.AbstractServer | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+
+    async def start(self):
+        """Start listening on the Unix-domain socket."""
+        self._unix_server = await asyncio.start_unix_server(
+            self._handle_connection, path=self._path
+        )
+
+    async def close(self):
+        """Stop listening and close the socket."""
+        if self._unix_server is not None:
+            self._unix_server.close()
+            for writer in self._writers:
+                writer.close()
+            await self._unix_server.wait_closed()
+            self._unix_server = None
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        self._writers.add(writer)
+        try:
+            while True:
+                request = await _read_frame(reader)
+                await _write_frame(writer, await self._handle_request(request))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _handle_request(self, request: dict[str, Any]) -> dict[str, Any]:
+        try:
+            if request["type"] == "message":
+                await self._dispatcher.dispatch_msg(
+                    sender=request["sender"],
+                    destination=request["destination"],
+                    schema_digest=request["schema_digest"],
+                    message=request["message"],
+                    session=uuid.UUID(request["session"]),
+                )
+                return {"status": "ok"}
+            return {"status": "ok", "response": await self._handle_rest(request)}
+        except QueueFullError as err:
+            return {"status": "queue_full", "retry_after": err.retry_after}
+        except Exception as ex:
+            LOGGER.exception(f"Failed to handle request from another shard: {ex}")
+            return {"status": "error", "detail": str(ex)}
+
+    async def _handle_rest(self, request: dict[str, Any]) -> dict[str, Any] | None:
+        details = self._server._rest_handler_map[  # pylint: disable=protected-access
+            (request["destination"], request["method"], request["endpoint"])
+        ]
+        message = None
+        if request["message"] is not None and details.request_model is not None:
+            message = details.request_model.parse_raw(request["message"])
+        response = await self._dispatcher.dispatch_rest(
+            destination=request["destination"],
+            method=request["method"],
+            endpoint=request["endpoint"],
+            message=message,
+        )
+        if isinstance(response, Model):
+            return json.loads(response.json())
+        return response
+
+
+class ShardedBureau(Bureau):
+    # pylint: disable=protected-access
+    """
+    A Bureau that spreads its agents across several worker processes (shards).
+
+    The parent process binds the listening socket and forks one process per shard,
+    all of which accept connections on the shared socket. Since any shard may receive
+    an envelope for any agent of the bureau, and agents send to each other directly,
+    every shard registers a sink for the agents of the other shards which forwards
+    the messages over a Unix-domain socket, bypassing the public endpoint. Messages
+    between agents on different shards keep the semantics of local dispatch,
+    including synchronous responses and full message queues.
+
+    The parent process coordinates the shards: it starts the agents once all shards
+    are listening, registers all agents in batches and shuts the shards down when it
+    is stopped or when any shard exits.
+
+    Shards are forked, so this requires a platform supporting the "fork" start method.
+    Synchronous queries (`query` / `send_sync_message`) are only answered if the reply
+    is sent by an agent of the shard that received the query.
+
+    Attributes:
+        _num_shards (int): The number of worker processes.
+        _shards (list[list[Agent]]): The agents of each shard.
+    """
+
+    def __init__(
+        self, agents: list[Agent] | None = None, shards: int | None = None, **kwargs
+    ):
+        """
+        Initialize a ShardedBureau instance.
+
+        Args:
+            agents (list[Agent] | None): The list of agents to be managed by the bureau.
+            shards (int | None): The number of worker processes. Defaults to the number
+            of CPUs.
+            **kwargs: The arguments of `Bureau`.
+        """
+        self._num_shards = shards or os.cpu_count() or 1
+        if self._num_shards < 1:
+            raise ValueError("shards must be at least 1")
+        super().__init__(agents=agents, **kwargs)
+
+    @property
+    def _shards(self) -> list[list[Agent]]:
+        return [self._agents[i :: self._num_shards] for i in range(self._num_shards)]
+
+    def _bind(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((HOST, self._port))
+        sock.listen(socket.SOMAXCONN)
+        sock.set_inheritable(True)
+        return sock
+
+    async def run_async(self):
+        """Run the agents managed by the bureau in one process per shard."""
+        shards = [agents for agents in self._shards if agents]
+        if len(shards) <= 1:
+            await super().run_async()
+            return
+
+        context = multiprocessing.get_context("fork")
+        sock = self._bind()
+        socket_dir = tempfile.mkdtemp(prefix="uagents-bureau-")
+        processes: list[multiprocessing.process.BaseProcess] = []
+        conns: list[Connection] = []
+        registration: asyncio.Task | None = None
+        try:
+            for index in range(len(shards)):
+                parent_conn, child_conn = context.Pipe()
+                process = context.Process(
+                    target=self._run_shard,
+                    args=(index, shards, child_conn, sock, socket_dir),
+                    name=f"bureau-shard-{index}",
+                )
+                process.start()
+                child_conn.close()
+                processes.append(process)
+                conns.append(parent_conn)
+            self._logger.info(f"Started {len(processes)} shards")
+
+            # start the agents only when every shard can receive local messages
+            for conn in conns:
+                await _receive(conn)
+            for conn in conns:
+                conn.send("start")
+            for conn in conns:
+                for info in await _receive(conn):
+                    agent = next(a for a in self._agents if a.address == info.address)
+                    self._registration_policy.add_agent(info, agent._identity)
+            registration = self._loop.create_task(self._schedule_registration())
+
+            exits = [
+                asyncio.ensure_future(_wait_readable(process.sentinel))
+                for process in processes
+            ]
+            try:
+                await asyncio.wait(exits, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for wait in exits:
+                    wait.cancel()
+            self._logger.warning("A shard exited, shutting down the bureau")
+        except (asyncio.CancelledError, KeyboardInterrupt, EOFError):
+            pass
+        finally:
+            self._logger.info("Shutting down bureau...")
+            if registration is not None:
+                registration.cancel()
+                await asyncio.gather(registration, return_exceptions=True)
+            await self._stop_shards(processes)
+            for conn in conns:
+                conn.close()
+            sock.close()
+            shutil.rmtree(socket_dir, ignore_errors=True)
+            await self._transport.close()
+            self._logger.info("Shutting down bureau...complete.")
+
+    def run(self):
+        """Run the bureau until it is interrupted or terminated."""
+        main = self._loop.create_task(self.run_async())
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            self._loop.add_signal_handler(sig, main.cancel)
+        try:
+            with contextlib.suppress(asyncio.CancelledError):
+                self._loop.run_until_complete(main)
+        finally:
+            if not self._loop.is_closed():
+                for sig in (signal.SIGINT, signal.SIGTERM):
+                    self._loop.remove_signal_handler(sig)
+                self._loop.close()
+
+    async def _stop_shards(self, processes: list[multiprocessing.process.BaseProcess]):
+        """Ask all shards to shut down gracefully and kill those that do not."""
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        waits = [
+            asyncio.ensure_future(_wait_readable(process.sentinel))
+            for process in processes
+            if process.is_alive()
+        ]
+        if waits:
+            _, pending = await asyncio.wait(waits, timeout=self._shutdown_timeout)
+            for wait in pending:
+                wait.cancel()
+        for process in processes:
+            if process.is_alive():
+                self._logger.warning(f"Killing shard {process.name}")
+                process.kill()
+            process.join()
+
+    def _run_shard(
+        self,
+        index: int,
+        shards: list[list[Agent]],
+        conn: Connection,
+        sock: socket.socket,
+        socket_dir: str,
+    ):
+        """Entry point of a shard process."""
+        # the parent process coordinates the shutdown of all shards
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._server._loop = loop
+        self._agents = shards[index]
+        for agent in self._agents:
+            agent.update_loop(loop)
+
+        clients: list[ShardClient] = []
+        for peer, agents in enumerate(shards):
+            if peer == index:
+                continue
+            client = ShardClient(shard_socket_path(socket_dir, peer))
+            clients.append(client)
+            for agent in agents:
+                dispatcher.unregister(agent.address, agent)
+                dispatcher.register(agent.address, ShardSink(agent.address, client))
+
+        main = loop.create_task(self._serve_shard(index, conn, sock, socket_dir))
+        loop.add_signal_handler(signal.SIGTERM, main.cancel)
+        try:
+            with contextlib.suppress(asyncio.CancelledError):
+                loop.run_until_complete(main)
+        finally:
+            for client in clients:
+                client.close()
+            loop.close()
+
+    async def _serve_shard(
+        self, index: int, conn: Connection, sock: socket.socket, socket_dir: str
+    ):
+        listener = ShardListener(shard_socket_path(socket_dir, index), self._server)
+        await listener.start()
+        try:
+            conn.send("listening")
+            await _receive(conn)
+            coros = self._start_agents(sock=sock)
+            conn.send([agent.info for agent in self._agents])
+            await self._run_until_shutdown(coros)
+        finally:
+            await listener.close()
@@ -1,11 +1,29 @@
+import asyncio
+import atexit
 import json
 import os
+import threading
 from abc import ABC, abstractmethod
-from typing import Any
+from collections.abc import Callable
+from concurrent.futures import Executor
+from typing import Any, Literal, TypeVar
 
 from cosmpy.aerial.wallet import PrivateKey
 from uagents_core.identity import Identity
 
+from uagents.config import (
+    STORAGE_COMPACTION_THRESHOLD,
+    STORAGE_FLUSH_BATCH_SIZE,
+    STORAGE_FLUSH_INTERVAL_SECONDS,
+)
+from uagents.utils import get_logger
+
+LOGGER = get_logger("storage")
+
+FsyncPolicy = Literal["always", "batch", "never"]
+
+T = TypeVar("T")
+
 
 class StorageAPI(ABC):
     """Interface for a key-value like storage system."""
@@ -30,6 +48,125 @@ class StorageAPI(ABC):
     def clear(self) -> None:
         raise NotImplementedError
 
+    def close(self) -> None:  # noqa: B027
+        """Persist any buffered changes and release resources."""
+        pass
+
+
+class AsyncStorageAPI(ABC):
+    """Interface for a key-value like storage system that does not block the event loop."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Any | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def has(self, key: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set(self, key: str, value: Any) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def remove(self, key: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def clear(self) -> None:
+        raise NotImplementedError
+
+    async def get_many(self, keys: list[str]) -> dict[str, Any | None]:
+        """Get the values associated with multiple keys."""
+        return {key: await self.get(key) for key in keys}
+
+    async def set_many(self, items: dict[str, Any]) -> None:
+        """Set multiple key-value pairs."""
+        for key, value in items.items():
+            await self.set(key, value)
+
+    async def remove_many(self, keys: list[str]) -> None:
+        """Remove multiple keys."""
+        for key in keys:
+            await self.remove(key)
+
+    async def close(self) -> None:  # noqa: B027
+        """Persist any buffered changes and release resources."""
+        pass
+
+
+class ExecutorStorageAdapter(AsyncStorageAPI):
+    """
+    Exposes a synchronous `StorageAPI` through the `AsyncStorageAPI` interface by
+    running its operations on an executor. Operations are serialized, and each batch
+    operation is executed as a single call on the executor.
+
+    Attributes:
+        _storage (StorageAPI): The wrapped storage.
+        _executor (Executor | None): The executor to use (None for the loop's default).
+    """
+
+    def __init__(self, storage: StorageAPI, executor: Executor | None = None):
+        """
+        Initialize the ExecutorStorageAdapter instance.
+
+        Args:
+            storage (StorageAPI): The synchronous storage to wrap.
+            executor (Executor | None): The executor to run storage operations on.
+            Defaults to the default executor of the running loop.
+        """
+        self._storage = storage
+        self._executor = executor
+        self._lock = threading.Lock()
+
+    @property
+    def storage(self) -> StorageAPI:
+        """The wrapped synchronous storage."""
+        return self._storage
+
+    def _locked(self, func: Callable[..., T], *args) -> T:
+        with self._lock:
+            return func(*args)
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._locked, func, *args)
+
+    async def get(self, key: str) -> Any | None:
+        return await self._run(self._storage.get, key)
+
+    async def has(self, key: str) -> bool:
+        return await self._run(self._storage.has, key)
+
+    async def set(self, key: str, value: Any) -> None:
+        await self._run(self._storage.set, key, value)
+
+    async def remove(self, key: str) -> None:
+        await self._run(self._storage.remove, key)
+
+    async def clear(self) -> None:
+        await self._run(self._storage.clear)
+
+    async def get_many(self, keys: list[str]) -> dict[str, Any | None]:
+        return await self._run(lambda: {key: self._storage.get(key) for key in keys})
+
+    async def set_many(self, items: dict[str, Any]) -> None:
+        def _set_many():
+            for key, value in items.items():
+                self._storage.set(key, value)
+
+        await self._run(_set_many)
+
+    async def remove_many(self, keys: list[str]) -> None:
+        def _remove_many():
+            for key in keys:
+                self._storage.remove(key)
+
+        await self._run(_remove_many)
+
+    async def close(self) -> None:
+        await self._run(self._storage.close)
+
 
 class KeyValueStore(StorageAPI):
     """
@@ -61,6 +198,8 @@ class KeyValueStore(StorageAPI):
         """
         self._data = {}
         self._name = name or "my"
+        # the store may be used from the loop and from an executor at the same time
+        self._lock = threading.Lock()
 
         cwd = cwd or os.getcwd()
         self._path = os.path.join(cwd, f"{self._name}_data.json")
@@ -75,17 +214,20 @@ class KeyValueStore(StorageAPI):
         return key in self._data
 
     def set(self, key: str, value: Any) -> None:
-        self._data[key] = value
-        self._save()
+        with self._lock:
+            self._data[key] = value
+            self._save()
 
     def remove(self, key: str) -> None:
-        if key in self._data:
-            del self._data[key]
-            self._save()
+        with self._lock:
+            if key in self._data:
+                del self._data[key]
+                self._save()
 
     def clear(self) -> None:
-        self._data.clear()
-        self._save()
+        with self._lock:
+            self._data.clear()
+            self._save()
 
     def _load(self) -> None:
         with open(self._path, encoding="utf-8") as file:
@@ -96,6 +238,190 @@ class KeyValueStore(StorageAPI):
             json.dump(self._data, file, ensure_ascii=False, indent=4)
 
 
+class AppendOnlyKeyValueStore(StorageAPI):
+    """
+    A write-behind key-value store that appends mutations to a log file.
+
+    The store keeps its data in memory. Every mutation is appended as a JSON line to
+    `<name>_data.log` in batches, so the cost of a write does not depend on the size
+    of the store. Once the log grows beyond the compaction threshold (or the number of
+    live keys, if larger), the data is written to the `<name>_data.json` snapshot and
+    the log is truncated. The snapshot uses the same format as `KeyValueStore`, so
+    existing stores can be opened directly.
+
+    On startup the snapshot is loaded and the log replayed on top of it. A partially
+    written last log line (e.g. after a crash) is discarded.
+
+    Attributes:
+        _data (dict): The in-memory data.
+        _path (str): The file path of the snapshot.
+        _log_path (str): The file path of the mutation log.
+        _fsync (FsyncPolicy): When written data is synced to disk: after every
+        mutation ("always"), after every batched flush ("batch") or never ("never").
+        _pending (list[str]): Serialized mutations not yet written to the log.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        cwd: str | None = None,
+        fsync: FsyncPolicy = "batch",
+        flush_interval: float = STORAGE_FLUSH_INTERVAL_SECONDS,
+        flush_batch_size: int = STORAGE_FLUSH_BATCH_SIZE,
+        compaction_threshold: int = STORAGE_COMPACTION_THRESHOLD,
+    ):
+        """
+        Initialize the AppendOnlyKeyValueStore instance.
+
+        Args:
+            name (str): The name associated with the store.
+            cwd (str | None): The current working directory. Defaults to None.
+            fsync (FsyncPolicy): The fsync policy, one of "always", "batch" or "never".
+            flush_interval (float): The maximum time in seconds mutations are buffered.
+            flush_batch_size (int): The number of buffered mutations that triggers a flush.
+            compaction_threshold (int): The minimum number of log entries before the log
+            is compacted into the snapshot.
+        """
+        self._data: dict[str, Any] = {}
+        self._name = name or "my"
+
+        cwd = cwd or os.getcwd()
+        self._path = os.path.join(cwd, f"{self._name}_data.json")
+        self._log_path = os.path.join(cwd, f"{self._name}_data.log")
+
+        self._fsync = fsync
+        self._flush_interval = flush_interval
+        self._flush_batch_size = 1 if fsync == "always" else max(1, flush_batch_size)
+        self._compaction_threshold = compaction_threshold
+        self._pending: list[str] = []
+        self._log_entries = 0
+        self._lock = threading.RLock()
+        self._timer: threading.Timer | None = None
+        self._closed = False
+
+        self._load()
+        atexit.register(self.close)
+
+    def get(self, key: str) -> Any | None:
+        return self._data.get(key)
+
+    def has(self, key: str) -> bool:
+        return key in self._data
+
+    def set(self, key: str, value: Any) -> None:
+        entry = json.dumps(
+            {"op": "set", "key": key, "value": value}, ensure_ascii=False
+        )
+        with self._lock:
+            self._data[key] = value
+            self._append(entry)
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            if key in self._data:
+                del self._data[key]
+                self._append(
+                    json.dumps({"op": "remove", "key": key}, ensure_ascii=False)
+                )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._append(json.dumps({"op": "clear"}))
+
+    def flush(self) -> None:
+        """Write all buffered mutations to the log, compacting it if necessary."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+
+            pending, self._pending = self._pending, []
+            with open(self._log_path, "a", encoding="utf-8") as file:
+                file.write("\n".join(pending) + "\n")
+                if self._fsync != "never":
+                    file.flush()
+                    os.fsync(file.fileno())
+            self._log_entries += len(pending)
+
+            if self._log_entries >= max(self._compaction_threshold, len(self._data)):
+                self.compact()
+
+    def compact(self) -> None:
+        """Write the current data to the snapshot and truncate the log."""
+        with self._lock:
+            self._pending.clear()
+            tmp_path = f"{self._path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(self._data, file, ensure_ascii=False)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, self._path)
+
+            # entries left in the log after a crash at this point are replayed on top
+            # of the new snapshot on startup, which yields the same data
+            with open(self._log_path, "w", encoding="utf-8"):
+                pass
+            self._log_entries = 0
+
+    def close(self) -> None:
+        """Flush all buffered mutations."""
+        with self._lock:
+            if self._closed:
+                return
+            self.flush()
+            self._closed = True
+        atexit.unregister(self.close)
+
+    def _append(self, entry: str) -> None:
+        self._closed = False
+        self._pending.append(entry)
+        if len(self._pending) >= self._flush_batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = threading.Timer(self._flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _load(self) -> None:
+        if os.path.isfile(self._path):
+            with open(self._path, encoding="utf-8") as file:
+                self._data = json.load(file)
+
+        if not os.path.isfile(self._log_path):
+            return
+
+        valid_size = 0
+        with open(self._log_path, "rb") as file:
+            for line in file:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("Incomplete log entry")
+                    entry = json.loads(line)
+                except ValueError:
+                    LOGGER.warning(f"Discarding corrupt entries in {self._log_path}")
+                    break
+                self._replay(entry)
+                valid_size += len(line)
+                self._log_entries += 1
+
+        # drop any partially written tail so new entries start on a clean line
+        if valid_size != os.path.getsize(self._log_path):
+            with open(self._log_path, "r+b") as file:
+                file.truncate(valid_size)
+
+    def _replay(self, entry: dict[str, Any]) -> None:
+        op = entry.get("op")
+        if op == "set":
+            self._data[entry["key"]] = entry["value"]
+        elif op == "remove":
+            self._data.pop(entry["key"], None)
+        elif op == "clear":
+            self._data.clear()
+
+
 def load_all_keys() -> dict:
     """
     Load all private keys from the private keys file.
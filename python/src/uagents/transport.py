@@ -0,0 +1,243 @@
+"""Pooled HTTP transport for outbound agent communication."""
+
+import asyncio
+import contextlib
+
+import aiohttp
+
+from uagents.compression import (
+    ContentEncoding,
+    accepted_encodings,
+    supported_encodings,
+)
+from uagents.config import (
+    HTTP_COMPRESSION_THRESHOLD_BYTES,
+    HTTP_CONNECT_TIMEOUT_SECONDS,
+    HTTP_CONNECTION_LIMIT,
+    HTTP_CONNECTION_LIMIT_PER_HOST,
+    HTTP_KEEPALIVE_TIMEOUT_SECONDS,
+    HTTP_REQUEST_TIMEOUT_SECONDS,
+)
+from uagents.wire import JSON_CONTENT_TYPE, MSGPACK_CONTENT_TYPE, msgpack_available
+
+
+class HttpTransport:
+    """
+    A long-lived HTTP client with connection pooling and keep-alive.
+
+    The underlying `aiohttp.ClientSession` is created lazily on first use and bound
+    to the running event loop. If the transport is used from a different loop (or
+    after it has been closed) a new session is created transparently and the session
+    of the previous loop is closed.
+
+    The transport can be used as an async context manager that closes it on exit.
+
+    The transport also keeps track of the envelope encodings each endpoint accepts.
+    With binary envelopes enabled, envelopes are sent msgpack encoded unless the
+    endpoint has rejected that encoding before. Likewise, with compression enabled,
+    request bodies of at least the compression threshold are compressed for the
+    endpoints that advertised the encoding in the accept-encoding header of a response,
+    unless the endpoint has rejected a compressed body before and accepted it
+    uncompressed.
+
+    Attributes:
+        _limit (int): The maximum number of simultaneous connections.
+        _limit_per_host (int): The maximum number of simultaneous connections per host.
+        _keepalive_timeout (float): The time in seconds idle connections are kept open.
+        _timeout (aiohttp.ClientTimeout): The default timeout applied to requests.
+        _session (aiohttp.ClientSession | None): The pooled client session.
+        _binary_envelopes (bool): Whether to send envelopes msgpack encoded.
+        _json_endpoints (set[str]): The endpoints that only accept JSON envelopes.
+        _compression (ContentEncoding | None): The encoding to compress bodies with.
+        _compression_threshold (int): The minimum size in bytes of compressed bodies.
+        _accepted_encodings (dict[str, set[str]]): The content codings each endpoint
+        advertised to accept.
+        _uncompressed_endpoints (set[str]): The endpoints that only accept
+        uncompressed bodies.
+    """
+
+    def __init__(
+        self,
+        limit: int = HTTP_CONNECTION_LIMIT,
+        limit_per_host: int = HTTP_CONNECTION_LIMIT_PER_HOST,
+        keepalive_timeout: float = HTTP_KEEPALIVE_TIMEOUT_SECONDS,
+        connect_timeout: float = HTTP_CONNECT_TIMEOUT_SECONDS,
+        request_timeout: float = HTTP_REQUEST_TIMEOUT_SECONDS,
+        binary_envelopes: bool = False,
+        compression: ContentEncoding | None = None,
+        compression_threshold: int = HTTP_COMPRESSION_THRESHOLD_BYTES,
+    ):
+        """
+        Initialize the HTTP transport.
+
+        Args:
+            limit (int): The maximum number of simultaneous connections.
+            limit_per_host (int): The maximum number of simultaneous connections per host.
+            keepalive_timeout (float): The time in seconds idle connections are kept open.
+            connect_timeout (float): The timeout in seconds for establishing a connection.
+            request_timeout (float): The total timeout in seconds for a single request.
+            binary_envelopes (bool): Send envelopes in the compact msgpack encoding to
+            the endpoints that accept it. Requires the `msgpack` package.
+            compression (ContentEncoding | None): Compress request bodies with this
+            content encoding ("gzip" or "zstd") for the endpoints that accept it. zstd
+            requires the `zstandard` package.
+            compression_threshold (int): The minimum size in bytes of request bodies
+            to compress, as compressing small bodies costs more than it saves.
+        """
+        if binary_envelopes and not msgpack_available():
+            raise RuntimeError("msgpack is not installed")
+        if compression is not None and compression not in supported_encodings():
+            raise RuntimeError(f"{compression} compression is not available")
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._keepalive_timeout = keepalive_timeout
+        self._timeout = aiohttp.ClientTimeout(
+            total=request_timeout, connect=connect_timeout
+        )
+        self._session: aiohttp.ClientSession | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._closing: set[asyncio.Task] = set()
+        self._binary_envelopes = binary_envelopes
+        self._json_endpoints: set[str] = set()
+        self._compression = compression
+        self._compression_threshold = compression_threshold
+        self._accepted_encodings: dict[str, set[str]] = {}
+        self._uncompressed_endpoints: set[str] = set()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """
+        Get the pooled client session, creating it on the running loop if necessary.
+
+        Returns:
+            aiohttp.ClientSession: The client session.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            if self._session is not None and not self._session.closed:
+                # release the connections of the session of the previous loop
+                task = loop.create_task(_close_session(self._session, self._loop))
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+            connector = aiohttp.TCPConnector(
+                limit=self._limit,
+                limit_per_host=self._limit_per_host,
+                keepalive_timeout=self._keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=self._timeout
+            )
+            self._loop = loop
+        return self._session
+
+    @property
+    def accepted_envelope_types(self) -> str:
+        """The value of the accept header for requests that return envelopes."""
+        if self._binary_envelopes:
+            return f"{MSGPACK_CONTENT_TYPE}, {JSON_CONTENT_TYPE}"
+        return JSON_CONTENT_TYPE
+
+    def envelope_content_type(self, endpoint: str) -> str:
+        """
+        Get the content type to send envelopes to an endpoint with.
+
+        Args:
+            endpoint (str): The endpoint.
+
+        Returns:
+            str: The content type.
+        """
+        if self._binary_envelopes and endpoint not in self._json_endpoints:
+            return MSGPACK_CONTENT_TYPE
+        return JSON_CONTENT_TYPE
+
+    def disable_binary_envelopes(self, endpoint: str) -> None:
+        """
+        Send envelopes to an endpoint JSON encoded from now on.
+
+        Args:
+            endpoint (str): The endpoint that rejected the binary encoding.
+        """
+        self._json_endpoints.add(endpoint)
+
+    def request_encoding(self, endpoint: str, size: int) -> ContentEncoding | None:
+        """
+        Get the content encoding to compress a request body to an endpoint with.
+
+        Args:
+            endpoint (str): The endpoint.
+            size (int): The size of the body in bytes.
+
+        Returns:
+            ContentEncoding | None: The content encoding, or None to send the body
+            uncompressed.
+        """
+        if (
+            self._compression is None
+            or size < self._compression_threshold
+            or endpoint in self._uncompressed_endpoints
+            or self._compression not in self._accepted_encodings.get(endpoint, ())
+        ):
+            return None
+        return self._compression
+
+    def update_accepted_encodings(
+        self, endpoint: str, accept_encoding: str | None
+    ) -> None:
+        """
+        Remember the content codings an endpoint advertised in a response.
+
+        Args:
+            endpoint (str): The endpoint.
+            accept_encoding (str | None): The accept-encoding header of the response,
+            responses without the header are ignored.
+        """
+        if accept_encoding is not None:
+            self._accepted_encodings[endpoint] = accepted_encodings(accept_encoding)
+
+    def disable_compression(self, endpoint: str) -> None:
+        """
+        Send request bodies to an endpoint uncompressed from now on.
+
+        Args:
+            endpoint (str): The endpoint that only accepts uncompressed bodies.
+        """
+        self._uncompressed_endpoints.add(endpoint)
+
+    @property
+    def closed(self) -> bool:
+        """Whether the transport currently has no open session."""
+        return self._session is None or self._session.closed
+
+    async def close(self) -> None:
+        """Close the underlying session and release all pooled connections."""
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await _close_session(session, self._loop)
+        loop = asyncio.get_running_loop()
+        closing = [task for task in self._closing if task.get_loop() is loop]
+        if closing:
+            await asyncio.gather(*closing, return_exceptions=True)
+
+    async def __aenter__(self) -> "HttpTransport":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+async def _close_session(
+    session: aiohttp.ClientSession, loop: asyncio.AbstractEventLoop | None
+) -> None:
+    """Close a session from any loop, including one other than the session's own."""
+    if loop is None or loop is asyncio.get_running_loop():
+        await session.close()
+    elif loop.is_running():
+        # the session's loop runs in another thread, close the session there
+        await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+        )
+    else:
+        # the connections of a finished loop are closed without waiting for them
+        with contextlib.suppress(RuntimeError):
+            await session.close()
@@ -1,5 +1,7 @@
+import heapq
 import logging
 import time
+from collections import deque
 from collections.abc import Awaitable, Callable
 from typing import TYPE_CHECKING, Any, Literal
 
@@ -18,6 +20,7 @@ from uagents_core.types import (  # noqa: F401 - these classes were previously d
 )
 
 from uagents.config import (
+    MESSAGE_HISTORY_BUCKET_SECONDS,
     MESSAGE_HISTORY_MESSAGE_LIMIT,
     MESSAGE_HISTORY_RETENTION_SECONDS,
 )
@@ -43,6 +46,8 @@ RestHandlerMap = dict[tuple[RestMethod, str], RestHandler]
 
 AgentNetwork = Literal["mainnet", "testnet"]
 
+SESSIONS_KEY = "message-history:sessions"
+
 
 class RestHandlerDetails(BaseModel):
     method: RestMethod
@@ -51,6 +56,53 @@ class RestHandlerDetails(BaseModel):
     response_model: type[Model | BaseModel]
 
 
+class LocalMessage:
+    """
+    A message passed as a model object to an agent in the same process.
+
+    The model is copied when the message is created unless its class is immutable, so
+    the sender can keep using it. The message is only serialized if its JSON is needed,
+    e.g. for the message history or to forward it out of the process.
+
+    Attributes:
+        model (Model): The message.
+    """
+
+    __slots__ = ("model", "_json")
+
+    def __init__(self, model: Model):
+        config = model.__config__
+        immutable = config.frozen or not config.allow_mutation
+        self.model = model if immutable else model.copy(deep=True)
+        self._json: JsonStr | None = None
+
+    @property
+    def json(self) -> JsonStr:
+        if self._json is None:
+            self._json = self.model.model_dump_json()
+        return self._json
+
+    def __str__(self) -> str:
+        return self.json
+
+
+def message_json(message: JsonStr | LocalMessage) -> JsonStr:
+    """Get the JSON content of a message, serializing it if it is a local message."""
+    return message.json if isinstance(message, LocalMessage) else message
+
+
+def parse_message(model_class: type[Model], message: JsonStr | LocalMessage) -> Model:
+    """
+    Recover a message model, without parsing if it is a local message of the same class.
+
+    Raises:
+        ValidationError: If the message does not conform to the model.
+    """
+    if isinstance(message, LocalMessage) and type(message.model) is model_class:
+        return message.model
+    return model_class.parse_raw(message_json(message))
+
+
 class MsgInfo(BaseModel):
     """
     Represents a message digest containing a message and its schema digest and sender.
@@ -105,6 +157,11 @@ class SessionHistoryInfo(BaseModel):
 class EnvelopeHistory:
     """
     Stores message history for an agent optionally using cache and/or storage.
+
+    The session index and the total message count are kept in memory, so adding an
+    entry only updates the affected session. Sessions are grouped into time buckets
+    by their latest timestamp, so applying the retention policy only touches buckets
+    that may contain expired sessions.
     """
 
     def __init__(
@@ -127,12 +184,43 @@ class EnvelopeHistory:
             retention_period (int): The retention period in seconds.
             message_limit (int): The message limit.
         """
-        self._cache: list[EnvelopeHistoryEntry] | None = [] if use_cache else None
+        self._cache: deque[EnvelopeHistoryEntry] | None = deque() if use_cache else None
         self._storage: StorageAPI | None = storage if use_storage else None
         self._logger = logger or logging.getLogger(__name__)
         self._retention_period = retention_period
         self._message_limit = message_limit
 
+        # in-memory index of the stored sessions
+        self._sessions: dict[str, JsonStr] = {}
+        self._session_info: dict[str, SessionHistoryInfo] = {}
+        self._total_messages = 0
+        self._buckets: dict[int, set[str]] = {}
+        self._bucket_heap: list[int] = []
+        if self._storage is not None:
+            self._load_sessions()
+
+    def _load_sessions(self) -> None:
+        assert self._storage is not None
+        self._sessions = dict(self._storage.get(SESSIONS_KEY) or {})
+        for session, info_json in self._sessions.items():
+            info = SessionHistoryInfo.model_validate_json(info_json)
+            self._session_info[session] = info
+            self._total_messages += info.message_count
+            self._add_to_bucket(session, info.latest_timestamp)
+
+    def _add_to_bucket(self, session: str, timestamp: int) -> None:
+        bucket = timestamp // MESSAGE_HISTORY_BUCKET_SECONDS
+        if bucket not in self._buckets:
+            self._buckets[bucket] = set()
+            heapq.heappush(self._bucket_heap, bucket)
+        self._buckets[bucket].add(session)
+
+    def _remove_from_bucket(self, session: str, timestamp: int) -> None:
+        bucket = timestamp // MESSAGE_HISTORY_BUCKET_SECONDS
+        sessions = self._buckets.get(bucket)
+        if sessions is not None:
+            sessions.discard(session)
+
     def add_entry(self, entry: EnvelopeHistoryEntry) -> None:
         """
         Add an envelope entry to the message history.
@@ -161,15 +249,18 @@ class EnvelopeHistory:
         self, session: UUID4, info_update: SessionHistoryInfo
     ) -> None:
         if self._storage is not None:
-            all_sessions = self._storage.get("message-history:sessions") or {}
-            total_msgs = 0
-            for info_json in all_sessions.values():
-                info = SessionHistoryInfo.model_validate_json(info_json)
-                total_msgs += info.message_count
-            if total_msgs >= self._message_limit:
+            if self._total_messages >= self._message_limit:
                 raise RuntimeError("Message history storage limit exceeded!")
-            all_sessions.update({str(session): info_update.model_dump_json()})
-            self._storage.set("message-history:sessions", all_sessions)
+            session_id = str(session)
+            previous = self._session_info.get(session_id)
+            if previous is not None:
+                self._total_messages -= previous.message_count
+                self._remove_from_bucket(session_id, previous.latest_timestamp)
+            self._session_info[session_id] = info_update
+            self._total_messages += info_update.message_count
+            self._add_to_bucket(session_id, info_update.latest_timestamp)
+            self._sessions[session_id] = info_update.model_dump_json()
+            self._storage.set(SESSIONS_KEY, self._sessions)
 
     def _get_key(self, session: UUID4 | str) -> str:
         return f"message-history:session:{str(session)}"
@@ -183,7 +274,7 @@ class EnvelopeHistory:
         """
         if self._cache is None:
             raise ValueError("EnvelopeHistory cache is not set")
-        return EnvelopeHistoryResponse(envelopes=self._cache)
+        return EnvelopeHistoryResponse(envelopes=list(self._cache))
 
     def get_session_messages(self, session: UUID4) -> list[EnvelopeHistoryEntry]:
         """
@@ -206,24 +297,36 @@ class EnvelopeHistory:
 
         # apply retention policy to cache
         if self._cache is not None:
-            for e in self._cache:
-                if e.timestamp < cutoff_time:
-                    self._cache.remove(e)
-                else:
-                    break
-            if len(self._cache) > self._message_limit:
-                self._cache = self._cache[-self._message_limit :]
-
-        # apply retention policy to storage
+            while self._cache and self._cache[0].timestamp < cutoff_time:
+                self._cache.popleft()
+            while len(self._cache) > self._message_limit:
+                self._cache.popleft()
+
+        # apply retention policy to storage, only visiting buckets that can
+        # contain sessions older than the cutoff time
         if self._storage is not None:
-            all_sessions = self._storage.get("message-history:sessions") or {}
-            sessions_to_remove = []
-            for session, info_json in all_sessions.items():
-                info = SessionHistoryInfo.model_validate_json(info_json)
-                if info.latest_timestamp < cutoff_time:
-                    self._storage.remove(self._get_key(session))
-                    sessions_to_remove.append(session)
-            for session in sessions_to_remove:
-                del all_sessions[session]
-
-            self._storage.set("message-history:sessions", all_sessions)
+            cutoff_bucket = int(cutoff_time) // MESSAGE_HISTORY_BUCKET_SECONDS
+            removed = False
+            while self._bucket_heap and self._bucket_heap[0] <= cutoff_bucket:
+                bucket = self._bucket_heap[0]
+                sessions = self._buckets[bucket]
+                for session in list(sessions):
+                    info = self._session_info[session]
+                    if info.latest_timestamp < cutoff_time:
+                        self._remove_session(session)
+                        removed = True
+                if sessions and bucket == cutoff_bucket:
+                    break  # the remaining sessions in the bucket have not expired yet
+                heapq.heappop(self._bucket_heap)
+                if not sessions:
+                    del self._buckets[bucket]
+            if removed:
+                self._storage.set(SESSIONS_KEY, self._sessions)
+
+    def _remove_session(self, session: str) -> None:
+        assert self._storage is not None
+        info = self._session_info.pop(session)
+        self._remove_from_bucket(session, info.latest_timestamp)
+        self._total_messages -= info.message_count
+        del self._sessions[session]
+        self._storage.remove(self._get_key(session))
@@ -0,0 +1,247 @@
+"""Off-loop signature verification for inbound envelopes."""
+
+import asyncio
+import math
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+
+from uagents_core.envelope import Envelope
+from uagents_core.identity import Identity
+
+from uagents.config import VERIFICATION_BATCH_SIZE, VERIFICATION_POOL_MAX_WORKERS
+
+VerificationItem = tuple[str, bytes, str]
+
+
+def _verify_batch(items: list[VerificationItem]) -> list[Exception | None]:
+    """
+    Verify a batch of signatures. Runs inside a worker thread or process.
+
+    Args:
+        items (list[VerificationItem]): The (sender, digest, signature) items to verify.
+
+    Returns:
+        list[Exception | None]: None for every valid signature, otherwise the error raised.
+    """
+    results: list[Exception | None] = []
+    for sender, digest, signature in items:
+        try:
+            if Identity.verify_digest(sender, digest, signature):
+                results.append(None)
+            else:
+                results.append(ValueError("Signature verification failed"))
+        except Exception as ex:
+            results.append(ex)
+    return results
+
+
+@dataclass
+class VerificationPoolMetrics:
+    """Snapshot of the state of a verification pool."""
+
+    queue_depth: int
+    in_flight: int
+    verified: int
+    failed: int
+    batches: int
+    avg_latency: float
+    max_latency: float
+
+
+class VerificationPool:
+    """
+    Verifies envelope signatures in a worker pool so that the event loop keeps
+    accepting connections while CPU-bound ECDSA checks are running.
+
+    Envelopes submitted within the same event loop iteration are grouped into
+    batches before being handed to the executor. A thread pool only scales across
+    cores with a backend that releases the GIL (e.g. the native coincurve backend),
+    otherwise a process pool should be used.
+
+    Attributes:
+        _max_workers (int): The number of worker threads or processes.
+        _use_processes (bool): Whether a process pool is used instead of threads.
+        _max_batch_size (int): The maximum number of signatures per batch.
+        _executor (Executor | None): The lazily created executor.
+        _queue (list): Items waiting to be submitted to the executor.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = VERIFICATION_POOL_MAX_WORKERS,
+        use_processes: bool = False,
+        max_batch_size: int = VERIFICATION_BATCH_SIZE,
+    ):
+        """
+        Initialize the verification pool.
+
+        Args:
+            max_workers (int): The number of worker threads or processes.
+            use_processes (bool): Use a process pool instead of a thread pool.
+            max_batch_size (int): The maximum number of signatures verified per batch.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self._max_workers = max_workers
+        self._use_processes = use_processes
+        self._max_batch_size = max_batch_size
+        self._executor: Executor | None = None
+        self._queue: list[tuple[VerificationItem, asyncio.Future, float]] = []
+        self._flush_scheduled = False
+        self._in_flight = 0
+        self._verified = 0
+        self._failed = 0
+        self._batches = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+
+    @property
+    def metrics(self) -> VerificationPoolMetrics:
+        """
+        Get the current queue depth and latency metrics of the pool.
+
+        Returns:
+            VerificationPoolMetrics: The metrics snapshot. Latencies are in seconds and
+            measured from submission until the result is available.
+        """
+        completed = self._verified + self._failed
+        return VerificationPoolMetrics(
+            queue_depth=len(self._queue),
+            in_flight=self._in_flight,
+            verified=self._verified,
+            failed=self._failed,
+            batches=self._batches,
+            avg_latency=self._total_latency / completed if completed else 0.0,
+            max_latency=self._max_latency,
+        )
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = (
+                ProcessPoolExecutor(max_workers=self._max_workers)
+                if self._use_processes
+                else ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="verify"
+                )
+            )
+        return self._executor
+
+    async def verify(self, envelope: Envelope) -> bool:
+        """
+        Verify the envelope's signature in the pool.
+
+        Args:
+            envelope (Envelope): The envelope to verify.
+
+        Returns:
+            bool: True if the signature is valid.
+
+        Raises:
+            ValueError: If the signature is missing.
+            ecdsa.BadSignatureError: If the signature is invalid.
+        """
+        if envelope.signature is None:
+            raise ValueError("Envelope signature is missing")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        item = (envelope.sender, envelope._digest(), envelope.signature)  # pylint: disable=protected-access
+        self._queue.append((item, future, time.monotonic()))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            loop.call_soon(self._flush)
+        return await future
+
+    def _flush(self):
+        """Split the queued items into batches and submit them to the executor."""
+        self._flush_scheduled = False
+        queue, self._queue = self._queue, []
+        if not queue:
+            return
+
+        # spread the work over all workers without exceeding the batch size
+        batch_size = min(
+            self._max_batch_size, math.ceil(len(queue) / self._max_workers)
+        )
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        for start in range(0, len(queue), batch_size):
+            batch = queue[start : start + batch_size]
+            self._in_flight += len(batch)
+            self._batches += 1
+            try:
+                result = loop.run_in_executor(
+                    executor, _verify_batch, [item for item, _, _ in batch]
+                )
+            except RuntimeError as ex:  # executor has been shut down
+                result = loop.create_future()
+                result.set_exception(ex)
+            result.add_done_callback(
+                lambda fut, batch=batch: self._complete_batch(batch, fut)
+            )
+
+    def _complete_batch(
+        self,
+        batch: list[tuple[VerificationItem, asyncio.Future, float]],
+        result: asyncio.Future,
+    ):
+        """Resolve the futures of a finished batch and record its metrics."""
+        self._in_flight -= len(batch)
+        if result.cancelled():  # the pool was shut down
+            for _, future, _ in batch:
+                future.cancel()
+            return
+
+        now = time.monotonic()
+        errors: list[Exception | None]
+        if result.exception() is not None:
+            errors = [result.exception()] * len(batch)  # type: ignore
+        else:
+            errors = result.result()
+
+        for (_, future, submitted), error in zip(batch, errors, strict=True):
+            latency = now - submitted
+            self._total_latency += latency
+            self._max_latency = max(self._max_latency, latency)
+            if error is None:
+                self._verified += 1
+            else:
+                self._failed += 1
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(True)
+            else:
+                future.set_exception(error)
+
+    def shutdown(self, wait: bool = False):
+        """
+        Shut down the worker pool. A new pool is created if the pool is used again.
+
+        Args:
+            wait (bool): Whether to wait for running verifications to finish.
+        """
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+async def verify_envelope(
+    envelope: Envelope, pool: VerificationPool | None = None
+) -> bool:
+    """
+    Verify the envelope's signature, using the verification pool if provided.
+
+    Args:
+        envelope (Envelope): The envelope to verify.
+        pool (VerificationPool | None): The pool to verify in, or None to verify inline.
+
+    Returns:
+        bool: True if the signature is valid.
+    """
+    if pool is None:
+        return envelope.verify()
+    return await pool.verify(envelope)
@@ -0,0 +1,150 @@
+"""Wire encodings of envelopes exchanged with agent servers."""
+
+import base64
+import uuid
+from typing import Any
+
+from uagents_core.envelope import Envelope
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional binary encoding
+    msgpack = None
+
+JSON_CONTENT_TYPE = "application/json"
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+
+_OPTIONAL_FIELDS = ("protocol_digest", "expires", "nonce", "signature")
+
+
+def msgpack_available() -> bool:
+    """Whether the binary (msgpack) envelope encoding can be used."""
+    return msgpack is not None
+
+
+def supported_content_types() -> list[str]:
+    """
+    Get the content types envelopes can be encoded with, preferred first.
+
+    Returns:
+        list[str]: The content types.
+    """
+    if msgpack is None:
+        return [JSON_CONTENT_TYPE]
+    return [MSGPACK_CONTENT_TYPE, JSON_CONTENT_TYPE]
+
+
+def is_msgpack(content_type: str | bytes) -> bool:
+    """Whether a content type header denotes the binary envelope encoding."""
+    if isinstance(content_type, bytes):
+        content_type = content_type.decode(errors="replace")
+    return content_type.split(";")[0].strip().lower() == MSGPACK_CONTENT_TYPE
+
+
+def _pack_envelope(env: Envelope) -> dict[str, Any]:
+    """
+    Get the fields of an envelope in the binary encoding.
+
+    The session is packed as its 16 bytes and the payload as the raw message bytes,
+    i.e. the bytes the JSON encoding carries base64-encoded. The digest of an envelope
+    is always computed over the base64 form of the payload, so an envelope has the same
+    signature in both encodings and can be re-encoded without being signed again.
+    """
+    fields: dict[str, Any] = {
+        "version": env.version,
+        "sender": env.sender,
+        "target": env.target,
+        "session": env.session.bytes,
+        "schema_digest": env.schema_digest,
+    }
+    for name in _OPTIONAL_FIELDS:
+        value = getattr(env, name)
+        if value is not None:
+            fields[name] = value
+    if env.payload is not None:
+        fields["payload"] = base64.b64decode(env.payload)
+    return fields
+
+
+def _unpack_envelope(fields: Any) -> dict[str, Any]:
+    """Convert the fields of an envelope in the binary encoding to the JSON form."""
+    if not isinstance(fields, dict):
+        raise ValueError("envelope must be a map")
+    fields = dict(fields)
+    if isinstance(fields.get("session"), bytes):
+        fields["session"] = uuid.UUID(bytes=fields["session"])
+    if isinstance(fields.get("payload"), bytes):
+        fields["payload"] = base64.b64encode(fields["payload"]).decode()
+    return fields
+
+
+def _unpackb(data: bytes) -> Any:
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+    try:
+        return msgpack.unpackb(data, raw=False, timestamp=3)
+    except Exception as err:
+        raise ValueError(f"Invalid msgpack data: {err}") from err
+
+
+def encode_envelope(env: Envelope, content_type: str = JSON_CONTENT_TYPE) -> bytes:
+    """
+    Encode an envelope for sending.
+
+    Args:
+        env (Envelope): The envelope.
+        content_type (str): The content type to encode the envelope with.
+
+    Returns:
+        bytes: The encoded envelope.
+    """
+    if not is_msgpack(content_type):
+        return env.model_dump_json().encode()
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+    return msgpack.packb(_pack_envelope(env), use_bin_type=True)
+
+
+def decode_envelope(
+    data: bytes, content_type: str | bytes = JSON_CONTENT_TYPE
+) -> Envelope:
+    """
+    Decode a received envelope.
+
+    Args:
+        data (bytes): The encoded envelope.
+        content_type (str | bytes): The content type the envelope is encoded with.
+
+    Returns:
+        Envelope: The envelope.
+
+    Raises:
+        ValueError: If the data is not a valid envelope. This is a
+        `pydantic.ValidationError` if the data could be decoded but does not match the
+        envelope schema.
+    """
+    if not is_msgpack(content_type):
+        return Envelope.model_validate_json(data or b"")
+    return Envelope.model_validate(_unpack_envelope(_unpackb(data)))
+
+
+def decode_stored_envelopes(data: bytes) -> list[Any]:
+    """
+    Decode a msgpack encoded list of stored envelopes retrieved from a mailbox.
+
+    Args:
+        data (bytes): The encoded list.
+
+    Returns:
+        list[Any]: The stored envelopes, with the envelopes converted to the JSON form.
+
+    Raises:
+        ValueError: If the data is not a list of stored envelopes.
+    """
+    items = _unpackb(data)
+    if not isinstance(items, list):
+        raise ValueError("stored envelopes must be a list")
+    for item in items:
+        if isinstance(item, dict) and isinstance(item.get("envelope"), dict):
+            item["envelope"] = _unpack_envelope(item["envelope"])
+    return items
@@ -0,0 +1,286 @@
+"""Worker pool for processing the inbound messages of an agent."""
+
+import asyncio
+import logging
+import math
+import time
+import uuid
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Literal
+
+from uagents.config import MESSAGE_QUEUE_MAX_RETRY_AFTER_SECONDS, MESSAGE_WORKERS
+from uagents.types import JsonStr, LocalMessage
+from uagents.utils import get_logger
+
+# (schema_digest, sender, message, session)
+MessageItem = tuple[str, str, JsonStr | LocalMessage, uuid.UUID]
+MessageProcessor = Callable[
+    [str, str, JsonStr | LocalMessage, uuid.UUID], Awaitable[None]
+]
+MessagePriority = Callable[[MessageItem], int]
+
+# what to do with a new message when the queue is full
+QueuePolicy = Literal["block", "reject", "drop_oldest"]
+
+
+class QueueFullError(Exception):
+    """Raised when a message is rejected because the message queue is full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Message queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class MessageWorkerPoolMetrics:
+    """Snapshot of the state of a message worker pool."""
+
+    queue_depth: int
+    max_queue_depth: int
+    in_flight: int
+    processed: int
+    failed: int
+    rejected: int
+    dropped: int
+
+
+class MessageWorkerPool:
+    """
+    Processes queued inbound messages with a fixed number of workers.
+
+    If ordering is enabled, messages with the same (sender, session) key are processed
+    one after another in the order they were queued, while messages of different
+    dialogues are processed in parallel. A message whose key is already being processed
+    is handed over to the worker processing that key, so the other workers never block
+    on it.
+
+    Messages are taken from the queue by priority (lowest value first) and in order
+    within the same priority. When a bounded queue is full, a new message either waits
+    for space ("block"), is rejected with a QueueFullError carrying a retry hint
+    ("reject"), or replaces the oldest message of the lowest priority ("drop_oldest").
+
+    Attributes:
+        _process (MessageProcessor): The coroutine function that processes a message.
+        _num_workers (int): The number of workers.
+        _max_queue_size (int): The maximum number of queued messages, 0 for unbounded.
+        _ordered (bool): Whether messages are ordered per (sender, session).
+        _policy (QueuePolicy): What to do with a new message when the queue is full.
+        _priority (MessagePriority | None): Returns the priority of a message.
+        _queues (dict[int, deque]): The messages waiting for a worker, by priority.
+        _parked (dict): Messages waiting for their key to be released, by key.
+    """
+
+    def __init__(
+        self,
+        process: MessageProcessor,
+        num_workers: int = MESSAGE_WORKERS,
+        max_queue_size: int = 0,
+        ordered: bool = True,
+        policy: QueuePolicy = "block",
+        priority: MessagePriority | None = None,
+        logger: logging.Logger | None = None,
+    ):
+        """
+        Initialize the message worker pool.
+
+        Args:
+            process (MessageProcessor): The coroutine function that processes a message.
+            num_workers (int): The number of workers.
+            max_queue_size (int): The maximum number of messages waiting to be processed
+            or being processed. 0 means unbounded.
+            ordered (bool): Whether messages with the same (sender, session) key are
+            processed in order.
+            policy (QueuePolicy): What to do with a new message when the queue is full.
+            priority (MessagePriority | None): Returns the priority of a message, lower
+            values are processed first. All messages have the same priority if not set.
+            logger (logging.Logger | None): The logger to use.
+        """
+        if num_workers < 1:
+            raise ValueError("num_workers must be at least 1")
+        if max_queue_size < 0:
+            raise ValueError("max_queue_size must not be negative")
+        self._process = process
+        self._num_workers = num_workers
+        self._max_queue_size = max_queue_size
+        self._ordered = ordered
+        self._logger = logger or get_logger("workers")
+        self._policy = policy
+        self._priority = priority
+        self._queues: dict[int, deque[MessageItem]] = {}
+        self._num_queued = 0
+        self._available = asyncio.Semaphore(0)
+        self._slots: asyncio.Semaphore | None = (
+            asyncio.Semaphore(max_queue_size) if max_queue_size > 0 else None
+        )
+        self._parked: dict[tuple[str, uuid.UUID], deque[MessageItem]] = {}
+        self._num_parked = 0
+        self._max_queue_depth = 0
+        self._in_flight = 0
+        self._processed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._dropped = 0
+        self._avg_processing_time = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of messages waiting to be processed."""
+        return self._num_queued + self._num_parked
+
+    @property
+    def retry_after(self) -> int:
+        """An estimate of the seconds until the current queue has been processed."""
+        estimate = self.queue_depth * self._avg_processing_time / self._num_workers
+        return min(max(1, math.ceil(estimate)), MESSAGE_QUEUE_MAX_RETRY_AFTER_SECONDS)
+
+    @property
+    def metrics(self) -> MessageWorkerPoolMetrics:
+        """
+        Get the current queue depth and processing metrics of the pool.
+
+        Returns:
+            MessageWorkerPoolMetrics: The metrics snapshot.
+        """
+        return MessageWorkerPoolMetrics(
+            queue_depth=self.queue_depth,
+            max_queue_depth=self._max_queue_depth,
+            in_flight=self._in_flight,
+            processed=self._processed,
+            failed=self._failed,
+            rejected=self._rejected,
+            dropped=self._dropped,
+        )
+
+    async def put(self, item: MessageItem):
+        """
+        Add a message to the queue, applying the queue policy if the queue is full.
+
+        Args:
+            item (MessageItem): The (schema_digest, sender, message, session) item.
+
+        Raises:
+            QueueFullError: If the queue is full and the policy is "reject".
+        """
+        priority = self._priority(item) if self._priority is not None else 0
+        replaced = False
+        if self._slots is not None:
+            if not self._slots.locked() or self._policy == "block":
+                await self._slots.acquire()
+            elif self._policy == "reject":
+                self._rejected += 1
+                raise QueueFullError(self.retry_after)
+            elif self._drop_oldest(priority):
+                replaced = True  # the message takes the place of the dropped one
+            else:
+                self._dropped += 1  # only more important messages are queued
+                self._logger.warning("Message queue is full, dropping new message")
+                return
+        self._queues.setdefault(priority, deque()).append(item)
+        self._num_queued += 1
+        if not replaced:
+            self._available.release()
+        self._max_queue_depth = max(self._max_queue_depth, self.queue_depth)
+
+    def _drop_oldest(self, priority: int) -> bool:
+        """
+        Drop the oldest queued message of the lowest priority to make space for a
+        message with the given priority.
+
+        Returns:
+            bool: True if a message was dropped.
+        """
+        levels = [level for level, items in self._queues.items() if items]
+        if not levels or max(levels) < priority:
+            return False
+        self._queues[max(levels)].popleft()
+        self._num_queued -= 1
+        self._dropped += 1
+        self._logger.warning("Message queue is full, dropping oldest message")
+        return True
+
+    def _get_nowait(self) -> MessageItem:
+        priority = min(level for level, items in self._queues.items() if items)
+        self._num_queued -= 1
+        return self._queues[priority].popleft()
+
+    async def _get(self) -> MessageItem:
+        await self._available.acquire()
+        return self._get_nowait()
+
+    async def _run(self, item: MessageItem):
+        self._in_flight += 1
+        start = time.monotonic()
+        try:
+            await self._process(*item)
+        except Exception as ex:
+            self._failed += 1
+            self._logger.exception(f"Exception while processing message: {ex}")
+        finally:
+            self._in_flight -= 1
+            self._processed += 1
+            # exponentially weighted moving average used for the retry hint
+            elapsed = time.monotonic() - start
+            self._avg_processing_time += 0.1 * (elapsed - self._avg_processing_time)
+            if self._slots is not None:
+                self._slots.release()
+
+    async def _run_to_completion(self, item: MessageItem):
+        """Process a message, letting it finish even if the worker is cancelled."""
+        task = asyncio.ensure_future(self._run(item))
+        try:
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            await task
+            raise
+
+    async def _worker(self):
+        while True:
+            item = await self._get()
+            if not self._ordered:
+                await self._run_to_completion(item)
+                continue
+
+            key = (item[1], item[3])
+            parked = self._parked.get(key)
+            if parked is not None:  # another worker is processing this key
+                parked.append(item)
+                self._num_parked += 1
+                continue
+
+            parked = self._parked[key] = deque()
+            await self._run_to_completion(item)
+            while parked:
+                item = parked.popleft()
+                self._num_parked -= 1
+                await self._run_to_completion(item)
+            del self._parked[key]
+
+    async def run(self):
+        """
+        Run the workers until cancelled. Messages being processed are completed and
+        the remaining queued messages are processed before returning.
+        """
+        workers = [
+            asyncio.create_task(self._worker()) for _ in range(self._num_workers)
+        ]
+        try:
+            await asyncio.gather(*workers)
+        except (asyncio.CancelledError, KeyboardInterrupt):
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            await self._drain()
+
+    async def _drain(self):
+        """Process all remaining messages sequentially, keeping them in order."""
+        # parked messages were queued before any queued message with the same key
+        parked, self._parked = self._parked, {}
+        for items in parked.values():
+            while items:
+                item = items.popleft()
+                self._num_parked -= 1
+                await self._run(item)
+        while self._num_queued:
+            await self._run(self._get_nowait())
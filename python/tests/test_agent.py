@@ -2,7 +2,7 @@
 import unittest
 from collections.abc import Callable
 
-from uagents import Agent, Context, Model
+from uagents import Agent, Context, Model, Protocol
 from uagents.resolver import GlobalResolver
 from uagents.types import RestHandlerDetails
 
@@ -127,3 +127,30 @@ class TestAgent(unittest.TestCase):
         self.assertEqual(handler.method, "POST")
         self.assertEqual(handler.request_model, Message)
         self.assertEqual(handler.response_model, Response)
+
+    def test_agent_message_routes(self):
+        agent = Agent(
+            name="bob", seed="bob routes phrase", enable_agent_inspector=False
+        )
+        proto = Protocol(name="routes", version="0.1.0")
+
+        @proto.on_message(Message)
+        async def _(_ctx: Context, _sender: str, _msg: Message):
+            pass
+
+        @proto.on_message(Query, allow_unverified=True)
+        async def _(_ctx: Context, _sender: str, _msg: Query):
+            pass
+
+        agent.include(proto)
+        message_route = agent._message_routes[MESSAGE_DIGEST]
+        query_route = agent._message_routes[QUERY_DIGEST]
+        self.assertIs(message_route.model, Message)
+        self.assertTrue(message_route.signed)
+        self.assertFalse(query_route.signed)
+        self.assertEqual(message_route.protocol, (proto.digest, proto))
+        self.assertEqual(
+            agent.get_message_protocol(QUERY_DIGEST), (proto.digest, proto)
+        )
+        self.assertIsNone(agent.get_message_protocol("model:unknown"))
+        self.assertIs(agent._build_context().agent, agent._build_context().agent)
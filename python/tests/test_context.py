@@ -1,22 +1,30 @@
 # pylint: disable=protected-access
 import asyncio
 import unittest
+import uuid
+from typing import Any
+from unittest.mock import patch
 
 from aioresponses import aioresponses
 from uagents_core.envelope import Envelope
 
 from uagents import Agent, Protocol
 from uagents.agent import AgentRepresentation
+from uagents.config import ALMANAC_API_URL
 from uagents.context import (
+    Context,
     DeliveryStatus,
     ExternalContext,
+    InternalContext,
     Model,
     MsgInfo,
     MsgStatus,
 )
 from uagents.crypto import Identity
 from uagents.dispatch import dispatcher
-from uagents.resolver import RulesBasedResolver
+from uagents.resolver import AgentSearch, RulesBasedResolver
+from uagents.storage import StorageAPI
+from uagents.types import SESSIONS_KEY, EnvelopeHistory, EnvelopeHistoryEntry
 
 
 class Incoming(Model):
@@ -595,6 +603,183 @@ class TestContextSendMethods(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(status, exp_msg_status)
         self.assertEqual(len(dispatcher.pending_responses), 0)
 
+    @aioresponses()
+    async def test_get_agents_by_protocol_async_is_cached(self, mocked_responses):
+        search_url = f"{ALMANAC_API_URL}/search"
+        mocked_responses.post(
+            search_url,
+            payload=[
+                {"address": self.bob.address, "status": "active"},
+                {"address": self.clyde.address, "status": "inactive"},
+            ],
+        )
+        context = self.alice._build_context()
+
+        results = await asyncio.gather(
+            context.get_agents_by_protocol_async("proto:digest"),
+            context.get_agents_by_protocol_async("proto:digest"),
+        )
+        self.assertEqual(results, [[self.bob.address], [self.bob.address]])
+        # cached results are shared with later contexts and the sync lookup
+        context = self.alice._build_context()
+        self.assertEqual(
+            await context.get_agents_by_protocol_async("proto:digest"),
+            [self.bob.address],
+        )
+        self.assertEqual(
+            context.get_agents_by_protocol("proto:digest"), [self.bob.address]
+        )
+        self.assertEqual(len(mocked_responses.requests), 1)
+        self.assertEqual(await context.get_agents_by_protocol_async("digest"), [])
+
+    @aioresponses()
+    async def test_broadcast(self, mocked_responses):
+        unknown = Identity.generate().address
+        mocked_responses.post(
+            f"{ALMANAC_API_URL}/search",
+            payload=[
+                {"address": address, "status": "active"}
+                for address in (
+                    self.alice.address,
+                    self.bob.address,
+                    self.clyde.address,
+                    unknown,
+                )
+            ],
+        )
+        mocked_responses.post(endpoints[0], status=200)
+        context = self.alice._build_context()
+
+        with patch.object(
+            self.alice._resolver, "resolve", wraps=self.alice._resolver.resolve
+        ) as resolve:
+            statuses = await context.broadcast("proto:digest", msg, max_concurrency=1)
+
+        # each remote agent is resolved once, the sends reuse the results
+        self.assertEqual(
+            sorted(call.args[0] for call in resolve.call_args_list),
+            sorted([self.clyde.address, unknown]),
+        )
+
+        self.assertEqual(
+            [(status.destination, status.status) for status in statuses],
+            [
+                (self.bob.address, DeliveryStatus.DELIVERED),
+                (self.clyde.address, DeliveryStatus.DELIVERED),
+                (unknown, DeliveryStatus.FAILED),
+            ],
+        )
+
+    async def test_context_subclass_has_default_agent_search(self):
+        members = {name: None for name in Context.__abstractmethods__}
+        members["get_agents_by_protocol"] = lambda self, digest, limit, logger: [
+            self.agent.address
+        ]
+        members["agent"] = self.alice
+        context = type("SearchContext", (Context,), members)()
+
+        self.assertEqual(
+            await context.get_agents_by_protocol_async("proto:digest"),
+            [self.alice.address],
+        )
+
+    def test_empty_agent_search_is_kept(self):
+        search = AgentSearch()
+        context = InternalContext(
+            agent=self.alice._representation,
+            storage=self.alice._storage,
+            ledger=self.alice._ledger,
+            resolver=self.alice._resolver,
+            dispenser=self.alice._dispenser,
+            agent_search=search,
+        )
+        self.assertEqual(search.size, 0)
+        self.assertIs(context._agent_search, search)
+
+
+class FrozenMessage(Model):
+    message: str
+
+    class Config:
+        frozen = True
+
+
+class TestLocalMessages(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.alice = Agent(
+            name="alice",
+            seed="alice local recovery phrase",
+            enable_agent_inspector=False,
+            serialize_local_messages=False,
+        )
+        self.bob = Agent(
+            name="bob", seed="bob local recovery phrase", enable_agent_inspector=False
+        )
+        self.received: list[Model] = []
+
+        @self.bob.on_message(Message)
+        async def _(ctx, sender, message):
+            self.received.append(message)
+            await ctx.send(sender, incoming)
+
+        @self.bob.on_message(FrozenMessage)
+        async def _(ctx, sender, message):
+            self.received.append(message)
+
+        self.bob.include(self.bob._protocol)
+        self.loop = asyncio.get_event_loop()
+        self.loop.create_task(self.bob._process_message_queue())
+
+    async def test_local_message_is_not_serialized(self):
+        message = Message(message="hey")
+        context = self.alice._build_context()
+        with patch.object(Message, "json", side_effect=AssertionError):
+            result = await context.send(self.bob.address, message)
+            await asyncio.sleep(0.1)
+
+        self.assertEqual(result.status, DeliveryStatus.DELIVERED)
+        self.assertEqual(self.received, [message])
+        # the receiver gets a copy the sender can not modify
+        self.assertIsNot(self.received[0], message)
+
+    async def test_frozen_local_message_is_passed_as_is(self):
+        message = FrozenMessage(message="hey")
+        context = self.alice._build_context()
+        await context.send(self.bob.address, message)
+        await asyncio.sleep(0.1)
+
+        self.assertEqual(len(self.received), 1)
+        self.assertIs(self.received[0], message)
+
+    async def test_send_and_receive_local_messages(self):
+        context = self.alice._build_context()
+        response, status = await context.send_and_receive(
+            self.bob.address, msg, response_type=Incoming, timeout=5
+        )
+
+        self.assertEqual(status.status, DeliveryStatus.DELIVERED)
+        self.assertEqual(response, incoming)
+
+    async def test_local_message_is_serialized_for_history(self):
+        self.alice._message_history = EnvelopeHistory(
+            storage=self.alice._storage, use_storage=True
+        )
+        context = self.alice._build_context()
+        await context.send(self.bob.address, msg)
+
+        entries = context.session_history()
+        assert entries is not None
+        self.assertEqual(entries[0].payload, msg.json())
+
+    async def test_outbound_messages_are_serialized(self):
+        context = self.alice._build_context()
+        await context.send(self.bob.address, msg)
+
+        self.assertEqual(
+            context.outbound_messages,
+            {self.bob.address: [(msg.json(), Model.build_schema_digest(msg))]},
+        )
+
 
 class TestMessageHistory(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
@@ -749,3 +934,89 @@ class TestMessageHistory(unittest.IsolatedAsyncioTestCase):
 
         stored_msgs = message_history.get_session_messages(ctx.session)
         self.assertEqual(len(stored_msgs), 2)
+
+
+class DictStorage(StorageAPI):
+    def __init__(self):
+        self.data: dict[str, Any] = {}
+
+    def get(self, key: str) -> Any | None:
+        return self.data.get(key)
+
+    def has(self, key: str) -> bool:
+        return key in self.data
+
+    def set(self, key: str, value: Any) -> None:
+        self.data[key] = value
+
+    def remove(self, key: str) -> None:
+        self.data.pop(key, None)
+
+    def clear(self) -> None:
+        self.data.clear()
+
+
+class TestEnvelopeHistory(unittest.TestCase):
+    def setUp(self):
+        self.now = 100_000
+        patcher = patch("uagents.types.time.time", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.storage = DictStorage()
+
+    def entry(self, session: uuid.UUID) -> EnvelopeHistoryEntry:
+        return EnvelopeHistoryEntry(
+            timestamp=self.now,
+            version=1,
+            sender="agent1qsender",
+            target="agent1qtarget",
+            session=session,
+            schema_digest="model:digest",
+        )
+
+    def test_retention_only_removes_expired_sessions(self):
+        history = EnvelopeHistory(
+            self.storage, use_storage=True, retention_period=300, message_limit=10
+        )
+        old, recent = uuid.uuid4(), uuid.uuid4()
+        history.add_entry(self.entry(old))
+        self.now += 200
+        history.add_entry(self.entry(recent))
+        history.add_entry(self.entry(recent))
+        self.assertEqual(history._total_messages, 3)
+
+        self.now += 150
+        history.apply_retention_policy()
+        self.assertEqual(history.get_session_messages(old), [])
+        self.assertEqual(len(history.get_session_messages(recent)), 2)
+        self.assertEqual(list(self.storage.get(SESSIONS_KEY)), [str(recent)])
+        self.assertEqual(history._total_messages, 2)
+
+        self.now += 300
+        history.apply_retention_policy()
+        self.assertEqual(history.get_session_messages(recent), [])
+        self.assertEqual(self.storage.get(SESSIONS_KEY), {})
+        self.assertEqual(history._total_messages, 0)
+
+    def test_index_restored_from_storage(self):
+        history = EnvelopeHistory(self.storage, use_storage=True, message_limit=3)
+        session = uuid.uuid4()
+        for _ in range(2):
+            history.add_entry(self.entry(session))
+
+        restored = EnvelopeHistory(self.storage, use_storage=True, message_limit=3)
+        self.assertEqual(restored._total_messages, 2)
+        restored.add_entry(self.entry(session))
+        restored.add_entry(self.entry(session))
+        self.assertEqual(len(restored.get_session_messages(session)), 3)
+
+    def test_cache_is_bounded(self):
+        history = EnvelopeHistory(self.storage, retention_period=10, message_limit=3)
+        for _ in range(5):
+            history.add_entry(self.entry(uuid.uuid4()))
+            self.now += 4
+        self.assertEqual(len(history.get_cached_messages().envelopes), 3)
+
+        self.now += 4
+        history.apply_retention_policy()
+        self.assertEqual(len(history.get_cached_messages().envelopes), 1)
@@ -0,0 +1,247 @@
+import asyncio
+import unittest
+import uuid
+from unittest.mock import patch
+
+from uagents_core.envelope import Envelope
+from uagents_core.types import DeliveryStatus, MsgStatus
+
+from uagents.communication import BatchNotSupportedError, Dispenser, batch_url
+from uagents.crypto import Identity
+
+SENDER = Identity.generate().address
+
+
+def make_envelope(target: str, nonce: int) -> Envelope:
+    return Envelope(
+        version=1,
+        sender=SENDER,
+        target=target,
+        session=uuid.uuid4(),
+        schema_digest="model:test",
+        nonce=nonce,
+    )
+
+
+class TestDispenser(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.sent: list[tuple[str, int]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def fake_send(self, envelope: Envelope, endpoints, sync, transport):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.05 if envelope.target == "slow" else 0.01)
+        self.in_flight -= 1
+        self.sent.append((envelope.target, envelope.nonce))
+        return MsgStatus(
+            status=DeliveryStatus.DELIVERED,
+            detail="ok",
+            destination=envelope.target,
+            endpoint=endpoints[0],
+            session=envelope.session,
+        )
+
+    async def dispense(self, dispenser: Dispenser, envelopes: list[Envelope]):
+        futures = []
+        for env in envelopes:
+            fut = asyncio.get_running_loop().create_future()
+            dispenser.add_envelope(env, ["http://localhost"], fut)
+            futures.append(fut)
+        task = asyncio.create_task(dispenser.run())
+        results = await asyncio.gather(*futures)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return results
+
+    async def test_sequential_by_default(self):
+        dispenser = Dispenser()
+        envelopes = [make_envelope(t, i) for i, t in enumerate(["a", "b", "a", "c"])]
+        with patch("uagents.communication.send_exchange_envelope", self.fake_send):
+            await self.dispense(dispenser, envelopes)
+        self.assertEqual(self.max_in_flight, 1)
+        self.assertEqual([n for _, n in self.sent], [0, 1, 2, 3])
+
+    async def test_concurrent_preserves_destination_order(self):
+        dispenser = Dispenser(max_concurrency=4)
+        targets = ["slow", "a", "slow", "b", "a", "slow"]
+        envelopes = [make_envelope(t, i) for i, t in enumerate(targets)]
+        with patch("uagents.communication.send_exchange_envelope", self.fake_send):
+            results = await self.dispense(dispenser, envelopes)
+
+        self.assertTrue(all(r.status == DeliveryStatus.DELIVERED for r in results))
+        self.assertGreater(self.max_in_flight, 1)
+        self.assertLessEqual(self.max_in_flight, 4)
+        for target in set(targets):
+            nonces = [n for t, n in self.sent if t == target]
+            self.assertEqual(nonces, sorted(nonces))
+        # fast destinations are not held up by the slow one
+        self.assertNotEqual(self.sent[0][0], "slow")
+        self.assertEqual(dispenser.num_pending, 0)
+
+    async def test_concurrency_limit_without_ordering(self):
+        dispenser = Dispenser(max_concurrency=2, preserve_order=False)
+        envelopes = [make_envelope("a", i) for i in range(6)]
+        with patch("uagents.communication.send_exchange_envelope", self.fake_send):
+            await self.dispense(dispenser, envelopes)
+        self.assertEqual(self.max_in_flight, 2)
+        self.assertEqual(len(self.sent), 6)
+
+    async def test_backpressure(self):
+        dispenser = Dispenser(max_pending=2)
+        loop = asyncio.get_running_loop()
+        dispenser.add_envelope(
+            make_envelope("a", 0), ["http://localhost"], loop.create_future()
+        )
+        dispenser.add_envelope(
+            make_envelope("a", 1), ["http://localhost"], loop.create_future()
+        )
+
+        waiter = asyncio.create_task(dispenser.wait_for_capacity())
+        await asyncio.sleep(0.01)
+        self.assertFalse(waiter.done())
+
+        with patch("uagents.communication.send_exchange_envelope", self.fake_send):
+            task = asyncio.create_task(dispenser.run())
+            await asyncio.wait_for(waiter, timeout=1)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+class TestDispenserBatching(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.batches: list[tuple[str, list[int]]] = []
+        self.sent: list[int] = []
+
+    async def fake_send_batch(self, envelopes: list[Envelope], endpoint, transport):
+        self.batches.append((endpoint, [env.nonce for env in envelopes]))
+        return [
+            MsgStatus(
+                status=DeliveryStatus.DELIVERED,
+                detail="ok",
+                destination=env.target,
+                endpoint=endpoint,
+                session=env.session,
+            )
+            for env in envelopes
+        ]
+
+    async def fake_send(self, envelope: Envelope, endpoints, sync, transport):
+        self.sent.append(envelope.nonce)
+        return MsgStatus(
+            status=DeliveryStatus.DELIVERED,
+            detail="ok",
+            destination=envelope.target,
+            endpoint=endpoints[0],
+            session=envelope.session,
+        )
+
+    async def dispense(
+        self,
+        dispenser: Dispenser,
+        items: list[tuple[Envelope, str]],
+        other_endpoints: list[str] | None = None,
+    ) -> list[MsgStatus]:
+        futures = []
+        for env, endpoint in items:
+            fut = asyncio.get_running_loop().create_future()
+            dispenser.add_envelope(env, [endpoint, *(other_endpoints or [])], fut)
+            futures.append(fut)
+        with (
+            patch("uagents.communication.send_exchange_envelope", self.fake_send),
+            patch(
+                "uagents.communication.send_exchange_envelope_batch",
+                self.fake_send_batch,
+            ),
+        ):
+            task = asyncio.create_task(dispenser.run())
+            results = await asyncio.gather(*futures)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        return results
+
+    async def test_envelopes_coalesced_per_endpoint(self):
+        dispenser = Dispenser(batch_window=0.05, max_batch_size=3)
+        endpoints = ["http://a/submit"] * 4 + ["http://b/submit"] * 2
+        items = [(make_envelope("x", i), e) for i, e in enumerate(endpoints)]
+        results = await self.dispense(dispenser, items)
+
+        self.assertTrue(all(r.status == DeliveryStatus.DELIVERED for r in results))
+        self.assertCountEqual(
+            self.batches,
+            [
+                ("http://a/submit", [0, 1, 2]),
+                ("http://b/submit", [4, 5]),
+            ],
+        )
+        # a single envelope left in its window is sent on its own
+        self.assertEqual(self.sent, [3])
+        self.assertEqual(dispenser.num_pending, 0)
+
+    async def test_endpoints_without_batch_support(self):
+        dispenser = Dispenser(batch_window=0.05)
+        items = [(make_envelope("x", i), "http://a/mailbox") for i in range(3)]
+        await self.dispense(dispenser, items)
+
+        self.assertEqual(self.batches, [])
+        self.assertEqual(self.sent, [0, 1, 2])
+
+    async def test_fallback_when_batch_not_supported(self):
+        async def unsupported(envelopes, endpoint, transport):
+            raise BatchNotSupportedError(endpoint)
+
+        self.fake_send_batch = unsupported  # type: ignore
+        dispenser = Dispenser(batch_window=0.05)
+        items = [(make_envelope("x", i), "http://a/submit") for i in range(3)]
+        results = await self.dispense(dispenser, items)
+
+        self.assertTrue(all(r.status == DeliveryStatus.DELIVERED for r in results))
+        self.assertEqual(self.sent, [0, 1, 2])
+        self.assertIn("http://a/submit", dispenser._unbatched_endpoints)
+
+    async def test_fallback_when_batch_fails(self):
+        async def broken(envelopes, endpoint, transport):
+            raise RuntimeError("connection reset")
+
+        self.fake_send_batch = broken  # type: ignore
+        dispenser = Dispenser(batch_window=0.05)
+        items = [(make_envelope("x", i), "http://a/submit") for i in range(3)]
+        results = await self.dispense(dispenser, items)
+
+        self.assertTrue(all(r.status == DeliveryStatus.DELIVERED for r in results))
+        self.assertEqual(self.sent, [0, 1, 2])
+        self.assertEqual(dispenser.num_pending, 0)
+
+    async def test_failed_items_are_sent_to_other_endpoints(self):
+        retried: list[tuple[int, list[str]]] = []
+        send_batch, send = self.fake_send_batch, self.fake_send
+
+        async def partially_failed(envelopes, endpoint, transport):
+            statuses = await send_batch(envelopes, endpoint, transport)
+            statuses[1].status = DeliveryStatus.FAILED
+            return statuses
+
+        async def fake_send(envelope, endpoints, sync, transport):
+            retried.append((envelope.nonce, endpoints))
+            return await send(envelope, endpoints, sync, transport)
+
+        self.fake_send_batch = partially_failed  # type: ignore
+        self.fake_send = fake_send  # type: ignore
+        dispenser = Dispenser(batch_window=0.05)
+        items = [(make_envelope("x", i), "http://a/submit") for i in range(3)]
+        results = await self.dispense(dispenser, items, ["http://b/submit"])
+
+        self.assertTrue(all(r.status == DeliveryStatus.DELIVERED for r in results))
+        self.assertEqual(retried, [(1, ["http://b/submit"])])
+        self.assertEqual(dispenser.num_pending, 0)
+
+    def test_batch_url(self):
+        self.assertEqual(
+            batch_url("http://agent:8000/submit"), "http://agent:8000/submit/batch"
+        )
+        self.assertIsNone(batch_url("https://agentverse.ai/v1/proxy"))
+
+
+if __name__ == "__main__":
+    unittest.main()
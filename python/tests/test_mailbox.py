@@ -0,0 +1,299 @@
+# pylint: disable=protected-access
+import asyncio
+import contextlib
+import re
+import unittest
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from aioresponses import aioresponses
+from uagents_core.config import AgentverseConfig
+from uagents_core.envelope import Envelope
+
+from uagents import Model
+from uagents.config import MAILBOX_LONG_POLL_HEADER
+from uagents.crypto import Identity
+from uagents.mailbox import MailboxClient, MailboxMultiplexer, PollScheduler
+from uagents.transport import HttpTransport
+from uagents.workers import QueueFullError
+
+
+class Message(Model):
+    message: str
+
+
+def make_item(sender: Identity, target: str, text: str, signed: bool = True) -> dict:
+    message = Message(message=text)
+    env = Envelope(
+        version=1,
+        sender=sender.address,
+        target=target,
+        session=uuid.uuid4(),
+        schema_digest=Model.build_schema_digest(message),
+    )
+    env.encode_payload(message.model_dump_json())
+    if signed:
+        env.sign(sender)
+    now = datetime.now(timezone.utc).isoformat()
+    return {
+        "uuid": str(uuid.uuid4()),
+        "envelope": env.model_dump(mode="json"),
+        "received_at": now,
+        "expires_at": now,
+    }
+
+
+class TestMailboxClient(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.sender = Identity.generate()
+        self.identity = Identity.generate()
+        self.agentverse = AgentverseConfig()
+        self.transport = HttpTransport()
+        self.client = MailboxClient(
+            self.identity, self.agentverse, transport=self.transport, max_concurrency=2
+        )
+        self.mailbox_url = (
+            f"{self.agentverse.agents_api}/{self.identity.address}/mailbox"
+        )
+        self.dispatched: list[str] = []
+
+    async def asyncTearDown(self):
+        await self.transport.close()
+
+    async def fake_dispatch(self, sender, destination, schema_digest, message, session):
+        self.dispatched.append(Message.parse_raw(message).message)
+
+    @aioresponses()
+    async def test_page_is_dispatched_in_order_and_deleted(self, mocked):
+        items = [
+            make_item(self.sender, self.identity.address, str(i)) for i in range(5)
+        ]
+        items.insert(2, make_item(self.sender, self.identity.address, "bad", False))
+        mocked.get(self.mailbox_url, status=200, payload=items)
+        mocked.delete(re.compile(f"{self.mailbox_url}/.*"), status=200, repeat=True)
+
+        with (
+            patch("uagents.mailbox.dispatcher.contains", return_value=True),
+            patch("uagents.mailbox.dispatcher.dispatch_msg", self.fake_dispatch),
+        ):
+            _, processed = await self.client._check_mailbox()
+
+        self.assertEqual(processed, 5)
+        self.assertEqual(self.dispatched, ["0", "1", "2", "3", "4"])
+        deleted = [
+            str(url)
+            for (method, url), _ in mocked.requests.items()
+            if method == "DELETE"
+        ]
+        self.assertEqual(len(deleted), 5)
+        self.assertNotIn(f"{self.mailbox_url}/{items[2]['uuid']}", deleted)
+
+    @aioresponses()
+    async def test_failed_deletion_is_not_counted(self, mocked):
+        items = [
+            make_item(self.sender, self.identity.address, str(i)) for i in range(2)
+        ]
+        mocked.get(self.mailbox_url, status=200, payload=items)
+        mocked.delete(f"{self.mailbox_url}/{items[0]['uuid']}", status=200)
+        mocked.delete(f"{self.mailbox_url}/{items[1]['uuid']}", status=500)
+
+        with (
+            patch("uagents.mailbox.dispatcher.contains", return_value=True),
+            patch("uagents.mailbox.dispatcher.dispatch_msg", self.fake_dispatch),
+        ):
+            _, processed = await self.client._check_mailbox()
+
+        self.assertEqual(processed, 1)
+        self.assertEqual(self.dispatched, ["0", "1"])
+
+    @aioresponses()
+    async def test_full_queue_leaves_rest_of_page(self, mocked):
+        items = [
+            make_item(self.sender, self.identity.address, str(i)) for i in range(4)
+        ]
+        mocked.get(self.mailbox_url, status=200, payload=items)
+        mocked.delete(re.compile(f"{self.mailbox_url}/.*"), status=200, repeat=True)
+
+        async def dispatch(sender, destination, schema_digest, message, session):
+            if Message.parse_raw(message).message == "1":
+                raise QueueFullError("queue is full")
+            await self.fake_dispatch(
+                sender, destination, schema_digest, message, session
+            )
+
+        with (
+            patch("uagents.mailbox.dispatcher.contains", return_value=True),
+            patch("uagents.mailbox.dispatcher.dispatch_msg", dispatch),
+        ):
+            _, processed = await self.client._check_mailbox()
+
+        self.assertEqual(processed, 1)
+        self.assertEqual(self.dispatched, ["0"])
+        deleted = [
+            str(url)
+            for (method, url), _ in mocked.requests.items()
+            if method == "DELETE"
+        ]
+        self.assertEqual(deleted, [f"{self.mailbox_url}/{items[0]['uuid']}"])
+
+    @aioresponses()
+    async def test_missing_mailbox(self, mocked):
+        mocked.get(self.mailbox_url, status=404)
+        self.assertEqual(await self.client._check_mailbox(), (0, 0))
+        self.assertTrue(self.client._missing_mailbox_warning_logged)
+
+    @aioresponses()
+    async def test_long_poll_backs_off_unless_held(self, mocked):
+        self.client._scheduler = PollScheduler(interval=1, max_interval=1, jitter=0)
+        self.client._long_poll_timeout = 5
+        url = re.compile(f"{self.mailbox_url}.*")
+        mocked.get(url, status=500)
+        mocked.get(url, status=404)
+        mocked.get(url, status=200, payload=[], headers={MAILBOX_LONG_POLL_HEADER: "5"})
+
+        # neither errors nor an immediate empty answer may cause a tight loop
+        self.assertEqual([await self.client._poll() for _ in range(3)], [1, 1, 1])
+
+
+class TestPollScheduler(unittest.TestCase):
+    def test_backoff_and_reset(self):
+        scheduler = PollScheduler(interval=1, max_interval=5, jitter=0, page_size=10)
+        self.assertEqual(
+            [scheduler.next_delay(0, 0) for _ in range(5)], [1, 2, 4, 5, 5]
+        )
+        self.assertEqual(scheduler.next_delay(10, 10), 0)
+        self.assertEqual(scheduler.next_delay(3, 3), 1)
+        self.assertEqual(scheduler.failure(), 1)
+        self.assertEqual(scheduler.failure(), 2)
+
+    def test_jitter(self):
+        scheduler = PollScheduler(interval=1, max_interval=1, jitter=0.2)
+        delays = [scheduler.next_delay(0, 0) for _ in range(100)]
+        self.assertTrue(all(0.8 <= delay <= 1.2 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+        self.assertLessEqual(scheduler.initial_delay(), 0.2)
+
+
+class LongPollMailboxServer:
+    """Local stand-in for a mailbox server that supports long-polling."""
+
+    def __init__(self, wait: float):
+        self.wait = wait
+        self.items: list[dict] = []
+        self.new_items = asyncio.Event()
+        self.waits: list[str | None] = []
+        app = web.Application()
+        app.router.add_get("/{path:.*}/mailbox", self.get)
+        app.router.add_delete("/{path:.*}/mailbox/{uuid}", self.delete)
+        self.server = TestServer(app)
+
+    async def get(self, request: web.Request) -> web.Response:
+        self.waits.append(request.query.get("wait"))
+        if not self.items and "wait" in request.query:
+            self.new_items.clear()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    self.new_items.wait(), float(request.query["wait"])
+                )
+        return web.json_response(
+            self.items, headers={MAILBOX_LONG_POLL_HEADER: str(self.wait)}
+        )
+
+    async def delete(self, request: web.Request) -> web.Response:
+        uuid_ = request.match_info["uuid"]
+        self.items = [item for item in self.items if item["uuid"] != uuid_]
+        return web.Response()
+
+    def add(self, item: dict):
+        self.items.append(item)
+        self.new_items.set()
+
+
+class TestLongPoll(unittest.IsolatedAsyncioTestCase):
+    async def test_long_poll_delivers_without_local_backoff(self):
+        stand_in = LongPollMailboxServer(wait=5)
+        await stand_in.server.start_server()
+        self.addAsyncCleanup(stand_in.server.close)
+
+        identity = Identity.generate()
+        transport = HttpTransport()
+        self.addAsyncCleanup(transport.close)
+        client = MailboxClient(
+            identity,
+            AgentverseConfig(
+                base_url=f"{stand_in.server.host}:{stand_in.server.port}",
+                http_prefix="http",
+            ),
+            transport=transport,
+            scheduler=PollScheduler(interval=10, max_interval=10, jitter=0),
+        )
+
+        dispatched = asyncio.Event()
+
+        async def fake_dispatch(sender, destination, schema_digest, message, session):
+            dispatched.set()
+
+        with (
+            patch("uagents.mailbox.dispatcher.contains", return_value=True),
+            patch("uagents.mailbox.dispatcher.dispatch_msg", fake_dispatch),
+            patch.object(client._scheduler, "initial_delay", return_value=0),
+        ):
+            task = asyncio.create_task(client._check_mailbox_loop())
+            await asyncio.sleep(0.2)
+            self.assertEqual(client._long_poll_timeout, 5)
+
+            stand_in.add(make_item(Identity.generate(), identity.address, "hello"))
+            # the local poll interval is 10 seconds, only the long poll can deliver
+            await asyncio.wait_for(dispatched.wait(), timeout=2)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        self.assertEqual(stand_in.waits[0], None)
+        self.assertEqual(stand_in.waits[1], "5.0")
+
+
+class TestMailboxMultiplexer(unittest.IsolatedAsyncioTestCase):
+    async def test_polls_are_staggered_and_bounded(self):
+        clients = [
+            MailboxClient(Identity.generate(), AgentverseConfig()) for _ in range(6)
+        ]
+        loop = asyncio.get_running_loop()
+        polls: dict[int, list[float]] = {i: [] for i in range(len(clients))}
+        in_flight = 0
+        max_in_flight = 0
+
+        def fake_poll(index: int):
+            async def _poll() -> float:
+                nonlocal in_flight, max_in_flight
+                polls[index].append(loop.time())
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+                await asyncio.sleep(0.05)
+                in_flight -= 1
+                return 0.0 if index == 0 else 10.0
+
+            return _poll
+
+        for i, client in enumerate(clients):
+            client._poll = fake_poll(i)
+
+        multiplexer = MailboxMultiplexer(clients, max_concurrency=2)
+        task = asyncio.create_task(multiplexer.run())
+        await asyncio.sleep(1.2)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        self.assertLessEqual(max_in_flight, 2)
+        first_polls = [polls[i][0] for i in range(len(clients))]
+        self.assertEqual(first_polls, sorted(first_polls))
+        self.assertGreater(first_polls[-1] - first_polls[0], 0.5)
+        # a client with a backlog is polled again right away, the others wait
+        self.assertGreater(len(polls[0]), 5)
+        self.assertTrue(all(len(polls[i]) == 1 for i in range(1, len(clients))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 from enum import Enum
 from typing import Literal
+from unittest.mock import patch
 
 from uagents import Model
 
@@ -61,6 +62,24 @@ class TestModelDigest(unittest.TestCase):
 
         self.assertEqual(result, target_digest, "Digest mismatch")
 
+    def test_digest_is_cached_per_class(self):
+        class Parent(Model):
+            value: str
+
+        class Child(Parent):
+            extra: int
+
+        parent_digest = Model.build_schema_digest(Parent)
+        self.assertEqual(Model.build_schema_digest(Parent(value="a")), parent_digest)
+
+        with patch.object(Parent, "schema_json") as mock_schema:
+            self.assertEqual(Model.build_schema_digest(Parent), parent_digest)
+            mock_schema.assert_not_called()
+
+        child_digest = Model.build_schema_digest(Child(value="a", extra=1))
+        self.assertNotEqual(child_digest, parent_digest)
+        self.assertEqual(Model.build_schema_digest(Child), child_digest)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,9 +2,26 @@ import asyncio
 import hashlib
 import unittest
 
+import ecdsa
+import pytest
+from uagents_core import identity
+from uagents_core.identity import (
+    CoincurveBackend,
+    EcdsaBackend,
+    _encode_bech32,
+    get_verification_backend,
+    set_verification_backend,
+)
+
 from uagents import Agent
 from uagents.crypto import Identity
 
+try:
+    CoincurveBackend()
+    BACKENDS = [EcdsaBackend(), CoincurveBackend()]
+except RuntimeError:
+    BACKENDS = [EcdsaBackend()]
+
 
 def encode(message: str) -> bytes:
     hasher = hashlib.sha256()
@@ -43,5 +60,67 @@ class TestVerify(unittest.TestCase):
         self.assertEqual(result, True, "Verification failed")
 
 
+class TestVerificationBackends(unittest.TestCase):
+    def setUp(self):
+        self._backend = get_verification_backend()
+
+    def tearDown(self):
+        set_verification_backend(self._backend)
+
+    def test_backends_agree(self):
+        alice = Identity.generate()
+        digest = encode("hello there bob")
+        signature = alice.sign_digest(digest)
+        for backend in BACKENDS:
+            with self.subTest(backend=backend.name):
+                set_verification_backend(backend)
+                self.assertTrue(
+                    Identity.verify_digest(alice.address, digest, signature)
+                )
+                with self.assertRaises(ecdsa.BadSignatureError):
+                    Identity.verify_digest(alice.address, encode("tampered"), signature)
+
+    def test_high_s_signature(self):
+        alice = Identity.generate()
+        digest = encode("hello there bob")
+        order = ecdsa.SECP256k1.order
+        raw = alice._sk.sign_digest(digest)  # pylint: disable=protected-access
+        r, s = ecdsa.util.sigdecode_string(raw, order)
+        s = order - s if s < order // 2 else s
+        signature = _encode_bech32("sig", ecdsa.util.sigencode_string(r, s, order))
+        for backend in BACKENDS:
+            with self.subTest(backend=backend.name):
+                set_verification_backend(backend)
+                self.assertTrue(
+                    Identity.verify_digest(alice.address, digest, signature)
+                )
+
+    def test_coincurve_backend(self):
+        pytest.importorskip("coincurve")
+        self.assertEqual(identity._default_backend().name, "coincurve")  # pylint: disable=protected-access
+
+        alice = Identity.generate()
+        digest = encode("hello there bob")
+        set_verification_backend(CoincurveBackend())
+        self.assertTrue(
+            Identity.verify_digest(alice.address, digest, alice.sign_digest(digest))
+        )
+        with self.assertRaises(ecdsa.BadSignatureError):
+            Identity.verify_digest(
+                alice.address, digest, _encode_bech32("sig", b"\x00" * 63)
+            )
+
+    def test_verifying_keys_are_cached(self):
+        alice = Identity.generate()
+        digest = encode("hello there bob")
+        signature = alice.sign_digest(digest)
+        set_verification_backend(EcdsaBackend())
+        for _ in range(3):
+            Identity.verify_digest(alice.address, digest, signature)
+        info = identity._load_verifying_key.cache_info()  # pylint: disable=protected-access
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 2)
+
+
 if __name__ == "__main__":
     unittest.main()
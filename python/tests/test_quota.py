@@ -0,0 +1,122 @@
+import unittest
+from typing import Any
+from unittest.mock import patch
+
+from uagents.protocol.quota import (
+    RATE_LIMITER_SNAPSHOT_KEY,
+    QuotaProtocol,
+    RateLimit,
+    SlidingWindowRateLimiter,
+    StorageRateLimiter,
+    TokenBucketRateLimiter,
+)
+from uagents.storage import StorageAPI
+
+SENDER = "agent1qexample"
+
+
+class MemoryStorage(StorageAPI):
+    def __init__(self):
+        self.data: dict[str, Any] = {}
+        self.writes = 0
+
+    def get(self, key: str) -> Any | None:
+        return self.data.get(key)
+
+    def has(self, key: str) -> bool:
+        return key in self.data
+
+    def set(self, key: str, value: Any) -> None:
+        self.writes += 1
+        self.data[key] = value
+
+    def remove(self, key: str) -> None:
+        self.data.pop(key, None)
+
+    def clear(self) -> None:
+        self.data.clear()
+
+
+class TestRateLimiters(unittest.TestCase):
+    def setUp(self):
+        self.now = 6000.0
+        patcher = patch("uagents.protocol.quota.time.time", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def requests(self, limiter, count: int, max_requests: int = 3) -> list[bool]:
+        return [
+            limiter.add_request(SENDER, "handler", 1, max_requests)
+            for _ in range(count)
+        ]
+
+    def test_storage_limiter(self):
+        storage = MemoryStorage()
+        limiter = StorageRateLimiter(storage)
+        self.assertEqual(self.requests(limiter, 4), [True, True, True, False])
+        self.assertEqual(storage.get(SENDER)["handler"]["requests"], 3)
+        self.now += 61
+        self.assertEqual(self.requests(limiter, 1), [True])
+
+    def test_sliding_window(self):
+        limiter = SlidingWindowRateLimiter()
+        self.assertEqual(self.requests(limiter, 4), [True, True, True, False])
+
+        # half way into the next window, half of the previous requests still count
+        self.now += 90
+        self.assertEqual(self.requests(limiter, 3), [True, True, False])
+
+        self.now += 120
+        self.assertEqual(self.requests(limiter, 4), [True, True, True, False])
+
+    def test_token_bucket(self):
+        limiter = TokenBucketRateLimiter()
+        self.assertEqual(self.requests(limiter, 4), [True, True, True, False])
+        self.now += 20
+        self.assertEqual(self.requests(limiter, 2), [True, False])
+        self.now += 60
+        self.assertEqual(self.requests(limiter, 4), [True, True, True, False])
+
+    def test_eviction_and_snapshot(self):
+        storage = MemoryStorage()
+        limiter = SlidingWindowRateLimiter(
+            storage=storage, snapshot_interval=0, eviction_interval=3600
+        )
+        self.requests(limiter, 3)
+        self.assertEqual(limiter.size, 1)
+        self.assertIn(RATE_LIMITER_SNAPSHOT_KEY, storage.data)
+
+        restored = SlidingWindowRateLimiter(storage=storage, snapshot_interval=0)
+        self.assertEqual(self.requests(restored, 1), [False])
+
+        self.now += 121
+        limiter.evict()
+        self.assertEqual(limiter.size, 0)
+
+    def test_protocol_uses_limiter(self):
+        storage = MemoryStorage()
+        proto = QuotaProtocol(
+            storage_reference=storage,
+            limiter=TokenBucketRateLimiter(),
+            default_rate_limit=RateLimit(window_size_minutes=1, max_requests=1),
+        )
+        self.assertTrue(proto.add_request(SENDER, "handler", 1, 1))
+        self.assertFalse(proto.add_request(SENDER, "handler", 1, 1))
+        self.assertEqual(storage.writes, 0)
+
+    def test_empty_limiter_is_kept(self):
+        limiter = SlidingWindowRateLimiter()
+        proto = QuotaProtocol(storage_reference=MemoryStorage(), limiter=limiter)
+        self.assertIs(proto.limiter, limiter)
+
+    def test_empty_window_is_not_limited(self):
+        for limiter in (SlidingWindowRateLimiter(), TokenBucketRateLimiter()):
+            self.assertEqual(
+                [limiter.add_request(SENDER, "handler", 0, 1) for _ in range(3)],
+                [True, True, True],
+            )
+            self.assertEqual(limiter.size, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,273 @@
+import asyncio
+import time
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from aioresponses import aioresponses
+
+from uagents import Agent
+from uagents.crypto import Identity
+from uagents.resolver import (
+    AlmanacApiResolver,
+    AlmanacContractResolver,
+    CachingResolver,
+    CircuitBreaker,
+    GlobalResolver,
+    LedgerQueryError,
+    Resolution,
+    Resolver,
+    run_ledger_query,
+)
+
+
+class CountingResolver(Resolver):
+    def __init__(self, delay: float = 0.0, expiry: float | None = None):
+        self.calls: list[str] = []
+        self._delay = delay
+        self._expiry = expiry
+
+    async def resolve(self, destination: str) -> tuple[str | None, list[str]]:
+        return (await self.lookup(destination)).sample()
+
+    async def lookup(self, destination: str) -> Resolution:
+        self.calls.append(destination)
+        await asyncio.sleep(self._delay)
+        if destination.startswith("unknown"):
+            return Resolution(address=None, endpoints=[])
+        return Resolution(
+            address=destination,
+            endpoints=[f"http://{destination}/submit"],
+            expiry=self._expiry,
+        )
+
+
+class WeightedResolver(Resolver):
+    def __init__(self):
+        self.calls = 0
+
+    async def resolve(self, destination: str) -> tuple[str | None, list[str]]:
+        return (await self.lookup(destination)).sample()
+
+    async def lookup(self, destination: str) -> Resolution:
+        self.calls += 1
+        return Resolution(
+            address=destination,
+            endpoints=["http://a/submit", "http://b/submit"],
+            weights=[1, 1],
+            max_endpoints=1,
+        )
+
+
+class TestCachingResolver(unittest.IsolatedAsyncioTestCase):
+    async def test_caches_successful_resolution(self):
+        inner = CountingResolver()
+        resolver = CachingResolver(inner)
+        for _ in range(3):
+            address, endpoints = await resolver.resolve("alice")
+            self.assertEqual(address, "alice")
+            self.assertEqual(endpoints, ["http://alice/submit"])
+        self.assertEqual(inner.calls, ["alice"])
+
+    async def test_failures_use_failure_ttl(self):
+        inner = CountingResolver()
+        resolver = CachingResolver(inner, ttl=60, failure_ttl=0)
+        await resolver.resolve("unknown")
+        await resolver.resolve("unknown")
+        self.assertEqual(inner.calls, ["unknown", "unknown"])
+
+        resolver = CachingResolver(inner, ttl=0, failure_ttl=60)
+        await resolver.resolve("unknown-2")
+        await resolver.resolve("unknown-2")
+        self.assertEqual(inner.calls.count("unknown-2"), 1)
+
+    async def test_respects_record_expiry(self):
+        inner = CountingResolver(expiry=time.time() - 1)
+        resolver = CachingResolver(inner, ttl=60)
+        await resolver.resolve("alice")
+        await resolver.resolve("alice")
+        self.assertEqual(len(inner.calls), 2)
+
+    async def test_samples_cached_endpoints_on_every_resolve(self):
+        inner = WeightedResolver()
+        resolver = CachingResolver(inner)
+        selected = set()
+        for _ in range(50):
+            address, endpoints = await resolver.resolve("alice")
+            self.assertEqual(address, "alice")
+            self.assertEqual(len(endpoints), 1)
+            selected.update(endpoints)
+        self.assertEqual(inner.calls, 1)
+        self.assertEqual(selected, {"http://a/submit", "http://b/submit"})
+
+    async def test_plain_resolver_results_are_kept(self):
+        class PlainResolver(Resolver):
+            async def resolve(self, destination: str):
+                return destination, ["http://b/submit", "http://a/submit"]
+
+        resolver = CachingResolver(PlainResolver())
+        for _ in range(5):
+            self.assertEqual(
+                await resolver.resolve("alice"),
+                ("alice", ["http://b/submit", "http://a/submit"]),
+            )
+
+    async def test_coalesces_concurrent_lookups(self):
+        inner = CountingResolver(delay=0.05)
+        resolver = CachingResolver(inner)
+        results = await asyncio.gather(*[resolver.resolve("alice") for _ in range(10)])
+        self.assertEqual(inner.calls, ["alice"])
+        self.assertTrue(all(r == ("alice", ["http://alice/submit"]) for r in results))
+
+    async def test_lru_eviction(self):
+        inner = CountingResolver()
+        resolver = CachingResolver(inner, max_size=2)
+        await resolver.resolve("a")
+        await resolver.resolve("b")
+        await resolver.resolve("a")
+        await resolver.resolve("c")
+        self.assertEqual(resolver.size, 2)
+        await resolver.resolve("a")
+        await resolver.resolve("b")
+        self.assertEqual(inner.calls, ["a", "b", "c", "b"])
+
+    async def test_invalidate(self):
+        inner = CountingResolver()
+        resolver = CachingResolver(inner)
+        await resolver.resolve("alice")
+        resolver.invalidate("alice")
+        await resolver.resolve("alice")
+        self.assertEqual(inner.calls, ["alice", "alice"])
+
+    async def test_global_resolver_cache_can_be_disabled(self):
+        resolver = GlobalResolver(cache_size=0)
+        self.assertIs(resolver._address_resolver, resolver._almanac_api_resolver)
+        resolver = GlobalResolver()
+        self.assertIsInstance(resolver._address_resolver, CachingResolver)
+
+    def test_agent_keeps_empty_caching_resolver(self):
+        resolver = CachingResolver(CountingResolver())
+        agent = Agent(
+            name="alice", seed="alice caching resolver phrase", resolve=resolver
+        )
+        self.assertIs(agent._resolver, resolver)
+
+
+class TestAlmanacApiResolver(unittest.IsolatedAsyncioTestCase):
+    @aioresponses()
+    async def test_lookup_returns_record_expiry(self, mocked_responses):
+        address = Identity.generate().address
+        expiry = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        mocked_responses.get(
+            f"https://almanac.test/agents/{address}",
+            payload={
+                "expiry": "2030-01-01T00:00:00Z",
+                "endpoints": [
+                    {"url": "http://a/submit", "weight": 1},
+                    {"url": "http://b/submit", "weight": 2},
+                ],
+            },
+        )
+        resolver = AlmanacApiResolver(
+            max_endpoints=1, almanac_api_url="https://almanac.test"
+        )
+
+        resolution = await resolver.lookup(address)
+
+        self.assertEqual(resolution.address, address)
+        self.assertEqual(resolution.endpoints, ["http://a/submit", "http://b/submit"])
+        self.assertEqual(resolution.weights, [1, 2])
+        self.assertEqual(resolution.expiry, expiry.timestamp())
+        self.assertEqual(len(resolution.sample()[1]), 1)
+
+
+def blocking_query(_value: str, _network: str) -> dict:
+    time.sleep(0.2)
+    return {"record": None}
+
+
+def failing_query(_value: str, _network: str) -> dict:
+    raise ConnectionError("ledger unavailable")
+
+
+class TestLedgerQueries(unittest.IsolatedAsyncioTestCase):
+    def test_circuit_breaker(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        self.assertFalse(breaker.is_open)
+        breaker.record_failure()
+        self.assertTrue(breaker.is_open)
+        breaker.record_success()
+        self.assertFalse(breaker.is_open)
+
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        self.assertFalse(breaker.is_open)
+
+    async def test_query_does_not_block_event_loop(self):
+        with patch.dict("uagents.resolver._ledger_breakers", clear=True):
+            query = asyncio.create_task(
+                run_ledger_query(blocking_query, "addr", network="testnet")
+            )
+            start = time.monotonic()
+            await asyncio.sleep(0.01)
+            self.assertLess(time.monotonic() - start, 0.1)
+            self.assertEqual(await query, {"record": None})
+
+    async def test_query_failures_open_circuit(self):
+        with patch.dict("uagents.resolver._ledger_breakers", clear=True):
+            for _ in range(3):
+                with self.assertRaises(LedgerQueryError):
+                    await run_ledger_query(failing_query, "addr", network="testnet")
+            with (
+                patch("uagents.resolver.query_record") as mock_query,
+                self.assertRaises(LedgerQueryError),
+            ):
+                await run_ledger_query(mock_query, "addr", network="testnet")
+            mock_query.assert_not_called()
+
+    async def test_stalled_queries_limit_submissions(self):
+        with (
+            patch.dict("uagents.resolver._ledger_breakers", clear=True),
+            patch.dict("uagents.resolver._ledger_in_flight", clear=True),
+        ):
+            for _ in range(2):
+                with self.assertRaises(LedgerQueryError):
+                    await run_ledger_query(
+                        blocking_query, "addr", network="testnet", timeout=0.01
+                    )
+            with (
+                patch("uagents.resolver.query_record") as mock_query,
+                self.assertRaises(LedgerQueryError),
+            ):
+                await run_ledger_query(mock_query, "addr", network="testnet")
+            mock_query.assert_not_called()
+
+            # other networks are not affected by the stalled queries
+            self.assertEqual(
+                await run_ledger_query(blocking_query, "addr", network="mainnet"),
+                {"record": None},
+            )
+
+            # the stalled queries release their slots when they return
+            await asyncio.sleep(0.3)
+            self.assertEqual(
+                await run_ledger_query(blocking_query, "addr", network="testnet"),
+                {"record": None},
+            )
+
+    async def test_contract_resolver_handles_ledger_failure(self):
+        resolver = AlmanacContractResolver()
+        with (
+            patch.dict("uagents.resolver._ledger_breakers", clear=True),
+            patch("uagents.resolver.query_record", failing_query),
+        ):
+            address, endpoints = await resolver.resolve(
+                f"test-agent://{Identity.generate().address}"
+            )
+        self.assertIsNone(address)
+        self.assertEqual(endpoints, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -388,3 +388,24 @@ async def test_rest_bureau():
             ),
         ]
     )
+
+
+async def test_rest_route_index():
+    server = Agent(name="carol")._server
+    server.add_rest_endpoint(agent.address, "GET", "/indexed", None, Response)
+    server.update_rest_endpoints(
+        {
+            (bob.address, "GET", "/indexed"): server._rest_handler_map[
+                (agent.address, "GET", "/indexed")
+            ]
+        }
+    )
+
+    assert server.has_rest_endpoint("GET", "/indexed")
+    assert not server.has_rest_endpoint("POST", "/indexed")
+    assert server._get_rest_handler_details("POST", "/submit") == {}
+
+    handlers = server._get_rest_handler_details("GET", "/indexed")
+    assert set(handlers) == {agent.address, bob.address}
+    handlers.popitem()
+    assert len(server._get_rest_handler_details("GET", "/indexed")) == 2
@@ -1,5 +1,6 @@
 # pylint: disable=protected-access
 import asyncio
+import gzip
 import json
 import unittest
 import uuid
@@ -9,9 +10,12 @@ from uagents_core.envelope import Envelope
 from uagents_core.identity import generate_user_address
 
 from uagents import Agent, Model
+from uagents.asgi import BodyTooLargeError, _read_asgi_body
 from uagents.communication import enclose_response
+from uagents.compression import supported_encodings
 from uagents.config import RESPONSE_TIME_HINT_SECONDS
 from uagents.crypto import Identity
+from uagents.wire import MSGPACK_CONTENT_TYPE, encode_envelope, msgpack_available
 
 
 class Message(Model):
@@ -262,6 +266,40 @@ class TestServer(unittest.IsolatedAsyncioTestCase):
             ]
         )
 
+    @unittest.skipUnless(msgpack_available(), "msgpack is not installed")
+    async def test_message_success_msgpack(self):
+        message = Message(message="hello")
+        env = Envelope(
+            version=1,
+            sender=self.bob.address,
+            target=self.agent.address,
+            session=uuid.uuid4(),
+            schema_digest=Model.build_schema_digest(message),
+        )
+        env.encode_payload(message.model_dump_json())
+        env.sign(self.bob._identity)
+
+        mock_send = AsyncMock()
+        with (
+            patch("uagents.asgi._read_asgi_body") as mock_receive,
+            patch("uagents.asgi.dispatcher.dispatch_msg") as mock_dispatch,
+        ):
+            mock_receive.return_value = encode_envelope(env, MSGPACK_CONTENT_TYPE)
+            await self.agent._server(
+                scope={
+                    "type": "http",
+                    "method": "POST",
+                    "path": "/submit",
+                    "headers": {b"content-type": b"application/msgpack"},
+                },
+                receive=None,
+                send=mock_send,
+            )
+        self.assertEqual(mock_send.call_args_list[0].args[0]["status"], 200)
+        self.assertEqual(
+            mock_dispatch.call_args.kwargs["message"], message.model_dump_json()
+        )
+
     async def test_message_fail_wrong_headers(self):
         message = Message(message="hello")
         env = Envelope(
@@ -672,6 +710,232 @@ class TestServer(unittest.IsolatedAsyncioTestCase):
             ]
         )
 
+    async def test_read_body_in_chunks(self):
+        chunks = [
+            {"body": b"ab", "more_body": True},
+            {"body": b"cd", "more_body": True},
+            {"body": b"e", "more_body": False},
+        ]
+        receive = AsyncMock(side_effect=chunks)
+        self.assertEqual(await _read_asgi_body(receive), b"abcde")
+
+        receive = AsyncMock(side_effect=chunks)
+        with self.assertRaises(BodyTooLargeError):
+            await _read_asgi_body(receive, max_size=3)
+        self.assertEqual(receive.await_count, 2)
+
+    async def test_message_fail_payload_too_large(self):
+        self.agent._server._max_body_size = 10
+        for headers, body in [
+            ({b"content-type": b"application/json", b"content-length": b"100"}, b""),
+            ({b"content-type": b"application/json"}, b"x" * 100),
+        ]:
+            mock_send = AsyncMock()
+            receive = AsyncMock(return_value={"body": body, "more_body": False})
+            await self.agent._server(
+                scope={
+                    "type": "http",
+                    "method": "POST",
+                    "path": "/submit",
+                    "headers": headers,
+                },
+                receive=receive,
+                send=mock_send,
+            )
+            mock_send.assert_has_calls(
+                [
+                    call(
+                        {
+                            "type": "http.response.start",
+                            "status": 413,
+                            "headers": [[b"content-type", b"application/json"]],
+                        }
+                    ),
+                    call(
+                        {
+                            "type": "http.response.body",
+                            "body": b'{"error": "payload too large"}',
+                        }
+                    ),
+                ]
+            )
+
+    async def submit_compressed(self, body: bytes, encoding: bytes):
+        mock_send = AsyncMock()
+        with (
+            patch("uagents.asgi._read_asgi_body") as mock_receive,
+            patch("uagents.asgi.dispatcher.dispatch_msg") as mock_dispatch,
+        ):
+            mock_receive.return_value = body
+            await self.agent._server(
+                scope={
+                    "type": "http",
+                    "method": "POST",
+                    "path": "/submit",
+                    "headers": {
+                        b"content-type": b"application/json",
+                        b"content-encoding": encoding,
+                    },
+                },
+                receive=None,
+                send=mock_send,
+            )
+        return mock_send, mock_dispatch
+
+    async def test_message_success_gzip(self):
+        env = self.make_envelope(self.agent.address)
+
+        mock_send, mock_dispatch = await self.submit_compressed(
+            gzip.compress(env.model_dump_json().encode()), b"gzip"
+        )
+
+        self.assertEqual(mock_send.call_args_list[0].args[0]["status"], 200)
+        self.assertEqual(
+            mock_dispatch.call_args.kwargs["message"], env.decode_payload()
+        )
+
+    async def test_message_fail_decompressed_too_large(self):
+        self.agent._server._max_body_size = 1024
+        mock_send, mock_dispatch = await self.submit_compressed(
+            gzip.compress(b" " * (1024 * 1024)), b"gzip"
+        )
+
+        self.assertEqual(mock_send.call_args_list[0].args[0]["status"], 413)
+        mock_dispatch.assert_not_called()
+
+    async def test_message_fail_compression(self):
+        for encoding, body, status in [
+            (b"br", b"compressed", 415),
+            (b"gzip", b"not gzip", 400),
+        ]:
+            mock_send, _ = await self.submit_compressed(body, encoding)
+            self.assertEqual(mock_send.call_args_list[0].args[0]["status"], status)
+
+    async def test_message_fail_queue_full(self):
+        agent = Agent(
+            name="carol",
+            seed="carol queue full phrase",
+            message_queue_size=1,
+            message_queue_policy="reject",
+        )
+        message = Message(message="hello")
+        responses = []
+        for _ in range(2):
+            env = Envelope(
+                version=1,
+                sender=self.bob.address,
+                target=agent.address,
+                session=uuid.uuid4(),
+                schema_digest=Model.build_schema_digest(message),
+            )
+            env.encode_payload(message.model_dump_json())
+            env.sign(self.bob._identity)
+
+            mock_send = AsyncMock()
+            with patch("uagents.asgi._read_asgi_body") as mock_receive:
+                mock_receive.return_value = env.model_dump_json().encode()
+                await agent._server(
+                    scope={
+                        "type": "http",
+                        "method": "POST",
+                        "path": "/submit",
+                        "headers": {b"content-type": b"application/json"},
+                    },
+                    receive=None,
+                    send=mock_send,
+                )
+            responses.append(mock_send.call_args_list[0].args[0])
+
+        self.assertEqual(responses[0]["status"], 200)
+        self.assertEqual(responses[1]["status"], 503)
+        self.assertIn([b"retry-after", b"1"], responses[1]["headers"])
+        self.assertEqual(agent.message_metrics.rejected, 1)
+
+    def make_envelope(self, target: str, sign: bool = True) -> Envelope:
+        message = Message(message="hello")
+        env = Envelope(
+            version=1,
+            sender=self.bob.address,
+            target=target,
+            session=uuid.uuid4(),
+            schema_digest=Model.build_schema_digest(message),
+        )
+        env.encode_payload(message.model_dump_json())
+        if sign:
+            env.sign(self.bob._identity)
+        return env
+
+    async def submit_batch(
+        self, body: bytes, content_type: bytes, headers: dict | None = None
+    ):
+        mock_send = AsyncMock()
+        with patch("uagents.asgi._read_asgi_body") as mock_receive:
+            mock_receive.return_value = body
+            await self.agent._server(
+                scope={
+                    "type": "http",
+                    "method": "POST",
+                    "path": "/submit/batch",
+                    "headers": {b"content-type": content_type, **(headers or {})},
+                },
+                receive=None,
+                send=mock_send,
+            )
+        return mock_send
+
+    async def test_batch_reports_status_per_envelope(self):
+        envelopes = [
+            self.make_envelope(self.agent.address),
+            self.make_envelope(self.agent.address, sign=False),
+            self.make_envelope(Identity.generate().address),
+        ]
+        items = [env.model_dump_json() for env in envelopes] + ['{"a": 1}']
+        body = "[" + ",".join(items) + "]"
+
+        mock_send = await self.submit_batch(body.encode(), b"application/json")
+
+        self.assertEqual(mock_send.call_args_list[0].args[0]["status"], 200)
+        results = json.loads(mock_send.call_args_list[1].args[0]["body"])["results"]
+        self.assertEqual(
+            [r["status"] for r in results],
+            ["delivered", "failed", "failed", "failed"],
+        )
+        self.assertEqual(results[2]["detail"], "unable to route envelope")
+        self.assertEqual(results[3]["detail"], "contents do not match envelope schema")
+
+    async def test_batch_ndjson(self):
+        envelopes = [self.make_envelope(self.agent.address) for _ in range(3)]
+        body = "\n".join(env.model_dump_json() for env in envelopes) + "\n"
+
+        mock_send = await self.submit_batch(body.encode(), b"application/x-ndjson")
+
+        results = json.loads(mock_send.call_args_list[1].args[0]["body"])["results"]
+        self.assertEqual([r["status"] for r in results], ["delivered"] * 3)
+
+    async def test_batch_fail_not_an_array(self):
+        mock_send = await self.submit_batch(b'{"version": 1}', b"application/json")
+
+        self.assertEqual(mock_send.call_args_list[0].args[0]["status"], 400)
+
+    async def test_batch_response_compressed(self):
+        self.agent._server._response_compression_threshold = 64
+        envelopes = [self.make_envelope(self.agent.address) for _ in range(5)]
+        body = "[" + ",".join(env.model_dump_json() for env in envelopes) + "]"
+
+        mock_send = await self.submit_batch(
+            body.encode(), b"application/json", {b"accept-encoding": b"gzip"}
+        )
+
+        start = mock_send.call_args_list[0].args[0]
+        self.assertIn([b"content-encoding", b"gzip"], start["headers"])
+        self.assertIn(
+            [b"accept-encoding", ", ".join(supported_encodings()).encode()],
+            start["headers"],
+        )
+        body = gzip.decompress(mock_send.call_args_list[1].args[0]["body"])
+        results = json.loads(body)["results"]
+        self.assertEqual([r["status"] for r in results], ["delivered"] * 5)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,170 @@
+# pylint: disable=protected-access
+import asyncio
+import multiprocessing
+import os
+import shutil
+import socket
+import tempfile
+import unittest
+import uuid
+from unittest.mock import AsyncMock, patch
+
+from uagents import Agent, Context, Model
+from uagents.asgi import ASGIServer
+from uagents.dispatch import Dispatcher, Sink
+from uagents.sharding import (
+    ShardClient,
+    ShardedBureau,
+    ShardListener,
+    ShardSink,
+    _receive,
+    shard_socket_path,
+)
+from uagents.workers import QueueFullError
+
+
+class Message(Model):
+    text: str
+
+
+class RecordingSink(Sink):
+    def __init__(self, queue_full: bool = False):
+        self.messages: list[tuple[str, str, str, uuid.UUID]] = []
+        self.queue_full = queue_full
+
+    async def handle_message(self, sender, schema_digest, message, session):
+        if self.queue_full:
+            raise QueueFullError(7)
+        self.messages.append((sender, schema_digest, message, session))
+
+    async def handle_rest(self, method, endpoint, message):
+        return {"echo": message.text}
+
+
+class TestShardRouting(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.socket_dir = tempfile.mkdtemp()
+        self.path = shard_socket_path(self.socket_dir, 0)
+        self.dispatcher = Dispatcher()
+        self.server = ASGIServer(port=0, loop=asyncio.get_running_loop(), queries={})
+        self.listener = ShardListener(self.path, self.server, self.dispatcher)
+        await self.listener.start()
+        self.client = ShardClient(self.path)
+
+    async def asyncTearDown(self):
+        self.client.close()
+        await self.listener.close()
+        shutil.rmtree(self.socket_dir)
+
+    async def test_message_is_dispatched_on_other_shard(self):
+        sink = RecordingSink()
+        self.dispatcher.register("agent1", sink)
+        session = uuid.uuid4()
+
+        shard_sink = ShardSink("agent1", self.client)
+        await shard_sink.handle_message("agent2", "digest", '{"text": "hi"}', session)
+        await shard_sink.handle_message("agent2", "digest", '{"text": "yo"}', session)
+
+        self.assertEqual(
+            sink.messages,
+            [
+                ("agent2", "digest", '{"text": "hi"}', session),
+                ("agent2", "digest", '{"text": "yo"}', session),
+            ],
+        )
+
+    async def test_full_queue_is_reported_to_sender(self):
+        self.dispatcher.register("agent1", RecordingSink(queue_full=True))
+
+        shard_sink = ShardSink("agent1", self.client)
+        with self.assertRaises(QueueFullError) as ctx:
+            await shard_sink.handle_message("agent2", "digest", "{}", uuid.uuid4())
+        self.assertEqual(ctx.exception.retry_after, 7)
+
+    async def test_rest_request_is_handled_on_other_shard(self):
+        agent = Agent(name="rest")
+        self.server.add_rest_endpoint(agent.address, "POST", "/echo", Message, Message)
+        self.dispatcher.register(agent.address, RecordingSink())
+
+        shard_sink = ShardSink(agent.address, self.client)
+        response = await shard_sink.handle_rest("POST", "/echo", Message(text="hi"))
+
+        self.assertEqual(response, {"echo": "hi"})
+
+
+class Ping(Model):
+    text: str
+
+
+class Pong(Model):
+    text: str
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestShardedBureau(unittest.IsolatedAsyncioTestCase):
+    def test_agents_are_spread_across_shards(self):
+        agents = [Agent(name=f"agent{i}") for i in range(5)]
+        bureau = ShardedBureau(agents=agents, shards=2)
+
+        shards = bureau._shards
+        self.assertEqual([len(shard) for shard in shards], [3, 2])
+        self.assertCountEqual(
+            [agent.address for shard in shards for agent in shard],
+            [agent.address for agent in agents],
+        )
+
+    def test_invalid_number_of_shards(self):
+        with self.assertRaises(ValueError):
+            ShardedBureau(shards=-1)
+
+    @unittest.skipUnless(
+        "fork" in multiprocessing.get_all_start_methods(), "fork is not supported"
+    )
+    async def test_message_round_trip_between_shards(self):
+        alice = Agent(name="alice", seed="alice sharding phrase")
+        bob = Agent(name="bob", seed="bob sharding phrase")
+        received, sent = multiprocessing.get_context("fork").Pipe(duplex=False)
+        self.addCleanup(received.close)
+
+        @alice.on_event("startup")
+        async def _(ctx: Context):
+            await ctx.send(bob.address, Ping(text="ping"))
+
+        @alice.on_message(Pong)
+        async def _(ctx: Context, sender: str, msg: Pong):
+            sent.send((os.getpid(), sender, msg.text))
+
+        @bob.on_message(Ping)
+        async def _(ctx: Context, sender: str, msg: Ping):
+            sent.send((os.getpid(), sender, msg.text))
+            await ctx.send(sender, Pong(text="pong"))
+
+        bureau = ShardedBureau(
+            agents=[alice, bob],
+            shards=2,
+            port=free_port(),
+            loop=asyncio.get_running_loop(),
+            shutdown_timeout=5,
+        )
+        self.assertEqual(bureau._shards, [[alice], [bob]])
+        # the almanac is not reachable from the tests
+        with patch("uagents.agent.update_agent_status", AsyncMock()):
+            task = asyncio.create_task(bureau.run_async())
+            try:
+                ping = await asyncio.wait_for(_receive(received), timeout=30)
+                pong = await asyncio.wait_for(_receive(received), timeout=30)
+            finally:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        sent.close()
+
+        self.assertEqual(ping[1:], (alice.address, "ping"))
+        self.assertEqual(pong[1:], (bob.address, "pong"))
+        # the agents ran in two different processes, neither of them this one
+        self.assertNotEqual(ping[0], pong[0])
+        self.assertNotIn(os.getpid(), (ping[0], pong[0]))
@@ -1,8 +1,19 @@
+import asyncio
 import json
 import os
+import tempfile
+import time
 import unittest
+from typing import Any
 
-from uagents.storage import KeyValueStore
+from uagents import Agent
+from uagents.context import Context
+from uagents.storage import (
+    AppendOnlyKeyValueStore,
+    ExecutorStorageAdapter,
+    KeyValueStore,
+    StorageAPI,
+)
 
 
 class TestStorage(unittest.TestCase):
@@ -45,5 +56,134 @@ class TestStorage(unittest.TestCase):
         return super().tearDown()
 
 
+class TestAppendOnlyStorage(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cwd = tmp.name
+        self.snapshot = os.path.join(self.cwd, "test_data.json")
+        self.log = os.path.join(self.cwd, "test_data.log")
+        return super().setUp()
+
+    def open_store(self, **kwargs) -> AppendOnlyKeyValueStore:
+        store = AppendOnlyKeyValueStore("test", cwd=self.cwd, **kwargs)
+        self.addCleanup(store.close)
+        return store
+
+    def test_write_behind_and_reload(self):
+        storage = self.open_store(flush_batch_size=3, flush_interval=60)
+        storage.set("a", 1)
+        storage.set("b", {"nested": [1, 2]})
+        self.assertEqual(storage.get("a"), 1)
+        self.assertFalse(os.path.isfile(self.log), "writes should be buffered")
+
+        storage.remove("a")
+        with open(self.log, encoding="utf-8") as file:
+            self.assertEqual(len(file.readlines()), 3)
+
+        storage.set("c", "value")
+        storage.close()
+
+        storage = self.open_store()
+        self.assertFalse(storage.has("a"))
+        self.assertEqual(storage.get("b"), {"nested": [1, 2]})
+        self.assertEqual(storage.get("c"), "value")
+
+    def test_compaction(self):
+        storage = self.open_store(fsync="always", compaction_threshold=4)
+        for i in range(4):
+            storage.set("counter", i)
+        self.assertEqual(os.path.getsize(self.log), 0)
+        with open(self.snapshot, encoding="utf-8") as file:
+            self.assertEqual(json.load(file), {"counter": 3})
+
+        storage.clear()
+        storage.set("other", True)
+        storage = self.open_store()
+        self.assertIsNone(storage.get("counter"))
+        self.assertTrue(storage.get("other"))
+
+    def test_recovers_from_torn_write(self):
+        with open(self.snapshot, "w", encoding="utf-8") as file:
+            json.dump({"existing": "value"}, file)
+        with open(self.log, "w", encoding="utf-8") as file:
+            file.write(json.dumps({"op": "set", "key": "a", "value": 1}) + "\n")
+            file.write('{"op": "set", "key": "b", "va')
+
+        storage = self.open_store(fsync="always")
+        self.assertEqual(storage.get("existing"), "value")
+        self.assertEqual(storage.get("a"), 1)
+        self.assertFalse(storage.has("b"))
+
+        storage.set("b", 2)
+        storage = self.open_store()
+        self.assertEqual(storage.get("b"), 2)
+
+
+class SlowStorage(StorageAPI):
+    def __init__(self, delay: float):
+        self._data = {}
+        self._delay = delay
+
+    def get(self, key: str) -> Any | None:
+        return self._data.get(key)
+
+    def has(self, key: str) -> bool:
+        return key in self._data
+
+    def set(self, key: str, value: Any) -> None:
+        time.sleep(self._delay)
+        self._data[key] = value
+
+    def remove(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class TestAsyncStorage(unittest.IsolatedAsyncioTestCase):
+    async def test_executor_adapter(self):
+        storage = ExecutorStorageAdapter(SlowStorage(delay=0))
+        await storage.set("a", 1)
+        await storage.set_many({"b": 2, "c": 3})
+        self.assertEqual(await storage.get("a"), 1)
+        self.assertTrue(await storage.has("b"))
+        self.assertEqual(
+            await storage.get_many(["a", "b", "x"]), {"a": 1, "b": 2, "x": None}
+        )
+        await storage.remove_many(["a", "b"])
+        self.assertEqual(storage.storage.get("c"), 3)
+        self.assertFalse(storage.storage.has("a"))
+        await storage.clear()
+        self.assertIsNone(await storage.get("c"))
+
+    async def test_adapter_does_not_block_loop(self):
+        storage = ExecutorStorageAdapter(SlowStorage(delay=0.2))
+        write = asyncio.create_task(storage.set("a", 1))
+        start = time.monotonic()
+        await asyncio.sleep(0.01)
+        self.assertLess(time.monotonic() - start, 0.1)
+        await write
+        self.assertEqual(await storage.get("a"), 1)
+
+    async def test_context_exposes_async_storage(self):
+        storage = SlowStorage(delay=0)
+        agent = Agent(name="alice", seed="alice async storage phrase", storage=storage)
+        ctx = agent._build_context()  # pylint: disable=protected-access
+        await ctx.async_storage.set("key", "value")
+        self.assertEqual(ctx.storage.get("key"), "value")
+
+    async def test_context_subclass_has_default_async_storage(self):
+        storage = SlowStorage(delay=0)
+        members = {name: None for name in Context.__abstractmethods__}
+        members["storage"] = storage
+        ctx = type("StorageContext", (Context,), members)()
+
+        await ctx.async_storage.set("key", "value")
+        self.assertEqual(storage.get("key"), "value")
+        self.assertIs(ctx.async_storage, ctx.async_storage)
+
+
 if __name__ == "__main__":
     unittest.main()
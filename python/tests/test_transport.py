@@ -0,0 +1,232 @@
+import asyncio
+import unittest
+import uuid
+from unittest.mock import patch
+
+from aioresponses import aioresponses
+from uagents_core.envelope import Envelope
+from uagents_core.types import DeliveryStatus
+
+from uagents import Agent, Bureau
+from uagents.communication import send_exchange_envelope
+from uagents.crypto import Identity
+from uagents.transport import HttpTransport
+from uagents.wire import (
+    JSON_CONTENT_TYPE,
+    MSGPACK_CONTENT_TYPE,
+    decode_envelope,
+    encode_envelope,
+    msgpack_available,
+)
+
+ENDPOINT = "http://localhost:8000/submit"
+
+
+def make_envelope(sender: Identity) -> Envelope:
+    env = Envelope(
+        version=1,
+        sender=sender.address,
+        target=Identity.generate().address,
+        session=uuid.uuid4(),
+        schema_digest="model:test",
+    )
+    env.encode_payload("{}")
+    env.sign(sender)
+    return env
+
+
+class TestHttpTransport(unittest.IsolatedAsyncioTestCase):
+    async def test_session_is_reused(self):
+        transport = HttpTransport()
+        self.assertTrue(transport.closed)
+        session = transport.session
+        self.assertIs(transport.session, session)
+        await transport.close()
+        self.assertTrue(transport.closed)
+        self.assertIsNot(transport.session, session)
+        await transport.close()
+
+    @aioresponses()
+    async def test_send_exchange_envelope_uses_transport(self, mocked_responses):
+        mocked_responses.post(ENDPOINT, status=200, repeat=True)
+        transport = HttpTransport()
+        sender = Identity.generate()
+
+        for _ in range(3):
+            result = await send_exchange_envelope(
+                make_envelope(sender), [ENDPOINT], transport=transport
+            )
+            self.assertEqual(result.status, DeliveryStatus.DELIVERED)
+
+        self.assertFalse(transport.closed)
+        await transport.close()
+
+    @aioresponses()
+    async def test_standalone_send_closes_transport(self, mocked_responses):
+        mocked_responses.post(ENDPOINT, status=200)
+        with patch.object(
+            HttpTransport, "close", autospec=True, side_effect=HttpTransport.close
+        ) as close:
+            result = await send_exchange_envelope(
+                make_envelope(Identity.generate()), [ENDPOINT]
+            )
+
+        self.assertEqual(result.status, DeliveryStatus.DELIVERED)
+        close.assert_awaited_once()
+
+    def test_bureau_shares_transport(self):
+        transport = HttpTransport()
+        alice = Agent(name="alice", seed="alice transport phrase")
+        bob = Agent(name="bob", seed="bob transport phrase")
+        bureau = Bureau(agents=[alice, bob], transport=transport)
+
+        self.assertIs(bureau._transport, transport)
+        self.assertIs(alice._dispenser.transport, transport)
+        self.assertIs(bob._dispenser.transport, transport)
+        self.assertIs(bob._agent_search._transport, transport)
+
+
+class TestTransportLoops(unittest.TestCase):
+    def test_session_of_previous_loop_is_closed(self):
+        transport = HttpTransport()
+
+        async def get_session():
+            return transport.session
+
+        async def get_session_and_close():
+            session = transport.session
+            await transport.close()
+            return session
+
+        first = asyncio.run(get_session())
+        second = asyncio.run(get_session_and_close())
+
+        self.assertIsNot(first, second)
+        self.assertTrue(first.closed)
+        self.assertTrue(second.closed)
+
+
+@unittest.skipUnless(msgpack_available(), "msgpack is not installed")
+class TestBinaryEnvelopes(unittest.IsolatedAsyncioTestCase):
+    def test_signature_survives_reencoding(self):
+        env = make_envelope(Identity.generate())
+        data = encode_envelope(env, MSGPACK_CONTENT_TYPE)
+        decoded = decode_envelope(data, MSGPACK_CONTENT_TYPE)
+
+        self.assertLess(len(data), len(encode_envelope(env)))
+        self.assertEqual(decoded, env)
+        self.assertTrue(decoded.verify())
+
+    @aioresponses()
+    async def test_fallback_to_json(self, mocked_responses):
+        mocked_responses.post(
+            ENDPOINT, status=400, payload={"error": "invalid content-type"}
+        )
+        mocked_responses.post(ENDPOINT, status=200, repeat=True)
+        transport = HttpTransport(binary_envelopes=True)
+        self.assertEqual(
+            transport.envelope_content_type(ENDPOINT), MSGPACK_CONTENT_TYPE
+        )
+
+        result = await send_exchange_envelope(
+            make_envelope(Identity.generate()), [ENDPOINT], transport=transport
+        )
+
+        self.assertEqual(result.status, DeliveryStatus.DELIVERED)
+        self.assertEqual(transport.envelope_content_type(ENDPOINT), JSON_CONTENT_TYPE)
+        await transport.close()
+
+
+class TestCompression(unittest.IsolatedAsyncioTestCase):
+    def test_compression_threshold(self):
+        transport = HttpTransport(compression="gzip", compression_threshold=1024)
+        self.assertIsNone(transport.request_encoding(ENDPOINT, 2048))
+        transport.update_accepted_encodings(ENDPOINT, "zstd, gzip")
+        self.assertIsNone(transport.request_encoding(ENDPOINT, 100))
+        self.assertEqual(transport.request_encoding(ENDPOINT, 2048), "gzip")
+        transport.update_accepted_encodings(ENDPOINT, None)
+        self.assertEqual(transport.request_encoding(ENDPOINT, 2048), "gzip")
+        transport.update_accepted_encodings(ENDPOINT, "zstd")
+        self.assertIsNone(transport.request_encoding(ENDPOINT, 2048))
+        self.assertIsNone(HttpTransport().request_encoding(ENDPOINT, 2048))
+
+    @aioresponses()
+    async def test_compression_after_advertisement(self, mocked_responses):
+        mocked_responses.post(
+            ENDPOINT, status=200, headers={"accept-encoding": "gzip"}, repeat=True
+        )
+        transport = HttpTransport(compression="gzip", compression_threshold=0)
+        sender = Identity.generate()
+
+        for _ in range(2):
+            result = await send_exchange_envelope(
+                make_envelope(sender), [ENDPOINT], transport=transport
+            )
+            self.assertEqual(result.status, DeliveryStatus.DELIVERED)
+
+        requests = next(iter(mocked_responses.requests.values()))
+        self.assertNotIn("content-encoding", requests[0].kwargs["headers"])
+        self.assertEqual(requests[1].kwargs["headers"]["content-encoding"], "gzip")
+        await transport.close()
+
+    @aioresponses()
+    async def test_fallback_to_uncompressed(self, mocked_responses):
+        # servers without compression support fail to parse the compressed body
+        mocked_responses.post(
+            ENDPOINT, status=400, payload={"error": "empty or invalid payload"}
+        )
+        mocked_responses.post(ENDPOINT, status=200, repeat=True)
+        transport = HttpTransport(compression="gzip", compression_threshold=0)
+        transport.update_accepted_encodings(ENDPOINT, "gzip")
+
+        result = await send_exchange_envelope(
+            make_envelope(Identity.generate()), [ENDPOINT], transport=transport
+        )
+
+        self.assertEqual(result.status, DeliveryStatus.DELIVERED)
+        requests = next(iter(mocked_responses.requests.values()))
+        self.assertEqual(requests[0].kwargs["headers"]["content-encoding"], "gzip")
+        self.assertNotIn("content-encoding", requests[1].kwargs["headers"])
+        self.assertIsNone(transport.request_encoding(ENDPOINT, 2048))
+        await transport.close()
+
+    @aioresponses()
+    async def test_endpoint_without_advertisement_is_not_compressed(
+        self, mocked_responses
+    ):
+        mocked_responses.post(ENDPOINT, status=200, repeat=True)
+        transport = HttpTransport(compression="gzip", compression_threshold=0)
+        sender = Identity.generate()
+
+        for _ in range(2):
+            await send_exchange_envelope(
+                make_envelope(sender), [ENDPOINT], transport=transport
+            )
+
+        requests = next(iter(mocked_responses.requests.values()))
+        self.assertEqual(len(requests), 2)
+        for request in requests:
+            self.assertNotIn("content-encoding", request.kwargs["headers"])
+        await transport.close()
+
+    @aioresponses()
+    async def test_failed_uncompressed_retry_keeps_compression(self, mocked_responses):
+        mocked_responses.post(
+            ENDPOINT, status=415, payload={"error": "unsupported content-encoding"}
+        )
+        mocked_responses.post(ENDPOINT, status=500, payload={"error": "unavailable"})
+        transport = HttpTransport(compression="gzip", compression_threshold=0)
+        transport.update_accepted_encodings(ENDPOINT, "gzip")
+
+        result = await send_exchange_envelope(
+            make_envelope(Identity.generate()), [ENDPOINT], transport=transport
+        )
+
+        self.assertEqual(result.status, DeliveryStatus.FAILED)
+        self.assertEqual(len(next(iter(mocked_responses.requests.values()))), 2)
+        self.assertEqual(transport.request_encoding(ENDPOINT, 2048), "gzip")
+        await transport.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+# pylint: disable=protected-access
+import asyncio
+import unittest
+import uuid
+from unittest.mock import AsyncMock, call, patch
+
+import ecdsa
+from uagents_core.envelope import Envelope
+
+from uagents import Agent, Bureau, Model
+from uagents.crypto import Identity
+from uagents.verification import VerificationPool, verify_envelope
+
+
+class Message(Model):
+    message: str
+
+
+def make_envelope(sender: Identity, target: str, text: str = "hello") -> Envelope:
+    message = Message(message=text)
+    env = Envelope(
+        version=1,
+        sender=sender.address,
+        target=target,
+        session=uuid.uuid4(),
+        schema_digest=Model.build_schema_digest(message),
+    )
+    env.encode_payload(message.model_dump_json())
+    env.sign(sender)
+    return env
+
+
+class TestVerificationPool(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.sender = Identity.generate()
+        self.target = Identity.generate().address
+
+    async def test_verifies_in_batches(self):
+        pool = VerificationPool(max_workers=2, max_batch_size=4)
+        envelopes = [make_envelope(self.sender, self.target) for _ in range(10)]
+        results = await asyncio.gather(*[pool.verify(env) for env in envelopes])
+        pool.shutdown()
+
+        self.assertTrue(all(results))
+        metrics = pool.metrics
+        self.assertEqual(metrics.verified, 10)
+        self.assertEqual(metrics.failed, 0)
+        self.assertEqual(metrics.batches, 3)
+        self.assertEqual(metrics.queue_depth, 0)
+        self.assertEqual(metrics.in_flight, 0)
+        self.assertGreater(metrics.max_latency, 0)
+        self.assertLessEqual(metrics.avg_latency, metrics.max_latency)
+
+    async def test_invalid_signature(self):
+        pool = VerificationPool(max_workers=1)
+        env = make_envelope(self.sender, self.target)
+        env.payload = make_envelope(self.sender, self.target, "tampered").payload
+        with self.assertRaises(ecdsa.BadSignatureError):
+            await pool.verify(env)
+
+        env.signature = None
+        with self.assertRaises(ValueError):
+            await verify_envelope(env, pool)
+        pool.shutdown()
+        self.assertEqual(pool.metrics.failed, 1)
+
+    async def test_pool_can_be_reused_after_shutdown(self):
+        pool = VerificationPool(max_workers=1)
+        env = make_envelope(self.sender, self.target)
+        self.assertTrue(await pool.verify(env))
+        pool.shutdown(wait=True)
+        self.assertTrue(await pool.verify(env))
+        pool.shutdown()
+
+    async def test_server_uses_pool(self):
+        pool = VerificationPool(max_workers=1)
+        agent = Agent(
+            name="alice", seed="alice verification phrase", verification_pool=pool
+        )
+        env = make_envelope(self.sender, agent.address)
+
+        mock_send = AsyncMock()
+        with patch("uagents.asgi._read_asgi_body") as mock_receive:
+            mock_receive.return_value = env.model_dump_json().encode()
+            await agent._server(
+                scope={
+                    "type": "http",
+                    "method": "POST",
+                    "path": "/submit",
+                    "headers": {b"content-type": b"application/json"},
+                },
+                receive=None,
+                send=mock_send,
+            )
+        pool.shutdown()
+
+        mock_send.assert_has_calls(
+            [
+                call(
+                    {
+                        "type": "http.response.start",
+                        "status": 200,
+                        "headers": [[b"content-type", b"application/json"]],
+                    }
+                )
+            ]
+        )
+        self.assertEqual(pool.metrics.verified, 1)
+
+    def test_bureau_shares_pool(self):
+        pool = VerificationPool()
+        alice = Agent(name="alice", seed="alice verification phrase", mailbox=True)
+        bureau = Bureau(agents=[alice], verification_pool=pool)
+
+        self.assertIs(bureau._server._verification_pool, pool)
+        self.assertIs(alice._verification_pool, pool)
+        self.assertIs(alice.mailbox_client._verification_pool, pool)
+
+
+if __name__ == "__main__":
+    unittest.main()
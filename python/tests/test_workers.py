@@ -0,0 +1,156 @@
+# pylint: disable=protected-access
+import asyncio
+import unittest
+import uuid
+
+from uagents import Agent, Context, Model
+from uagents.workers import MessageWorkerPool, QueueFullError
+
+SESSION_A = uuid.uuid4()
+SESSION_B = uuid.uuid4()
+
+
+class Message(Model):
+    value: int
+
+
+async def run_until_processed(pool: MessageWorkerPool, count: int):
+    task = asyncio.create_task(pool.run())
+    while pool.metrics.processed < count:
+        await asyncio.sleep(0.005)
+    task.cancel()
+    await task
+
+
+class TestMessageWorkerPool(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.processed: list[tuple[uuid.UUID, str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def process(self, schema_digest, sender, message, session):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.02 if message == "0" else 0.01)
+        self.in_flight -= 1
+        self.processed.append((session, message))
+
+    async def test_ordered_per_session_and_parallel_across_sessions(self):
+        pool = MessageWorkerPool(self.process, num_workers=4)
+        for i in range(5):
+            await pool.put(("digest", "sender", str(i), SESSION_A))
+            await pool.put(("digest", "sender", str(i), SESSION_B))
+        await run_until_processed(pool, 10)
+
+        for session in (SESSION_A, SESSION_B):
+            self.assertEqual(
+                [msg for s, msg in self.processed if s == session],
+                ["0", "1", "2", "3", "4"],
+            )
+        self.assertEqual(self.max_in_flight, 2)
+        metrics = pool.metrics
+        self.assertEqual(metrics.processed, 10)
+        self.assertEqual(metrics.queue_depth, 0)
+        self.assertEqual(metrics.max_queue_depth, 10)
+
+    async def test_unordered_uses_all_workers(self):
+        pool = MessageWorkerPool(self.process, num_workers=3, ordered=False)
+        for i in range(6):
+            await pool.put(("digest", "sender", str(i), SESSION_A))
+        await run_until_processed(pool, 6)
+        self.assertEqual(self.max_in_flight, 3)
+        self.assertEqual(len(self.processed), 6)
+
+    async def test_bounded_queue_and_drain(self):
+        pool = MessageWorkerPool(self.process, max_queue_size=2)
+        await pool.put(("digest", "sender", "0", SESSION_A))
+        await pool.put(("digest", "sender", "1", SESSION_A))
+        blocked = asyncio.create_task(pool.put(("digest", "sender", "2", SESSION_A)))
+        await asyncio.sleep(0.01)
+        self.assertFalse(blocked.done())
+
+        task = asyncio.create_task(pool.run())
+        await blocked
+        task.cancel()
+        await task
+        self.assertEqual([msg for _, msg in self.processed], ["0", "1", "2"])
+
+    async def test_failures_are_counted(self):
+        async def fail(*_):
+            raise RuntimeError("boom")
+
+        pool = MessageWorkerPool(fail)
+        await pool.put(("digest", "sender", "0", SESSION_A))
+        await run_until_processed(pool, 1)
+        self.assertEqual(pool.metrics.failed, 1)
+
+    async def test_reject_policy(self):
+        pool = MessageWorkerPool(self.process, max_queue_size=2, policy="reject")
+        await pool.put(("digest", "sender", "0", SESSION_A))
+        await pool.put(("digest", "sender", "1", SESSION_A))
+        with self.assertRaises(QueueFullError) as ctx:
+            await pool.put(("digest", "sender", "2", SESSION_A))
+        self.assertGreaterEqual(ctx.exception.retry_after, 1)
+        self.assertEqual(pool.metrics.rejected, 1)
+        self.assertEqual(pool.queue_depth, 2)
+
+    async def test_drop_oldest_policy_with_priorities(self):
+        def priority(item):
+            return 0 if item[0] == "error" else 1
+
+        pool = MessageWorkerPool(
+            self.process, max_queue_size=3, policy="drop_oldest", priority=priority
+        )
+        await pool.put(("digest", "sender", "0", SESSION_A))
+        await pool.put(("error", "sender", "1", SESSION_A))
+        await pool.put(("digest", "sender", "2", SESSION_A))
+        # the oldest messages of the lowest priority make space for new ones
+        await pool.put(("digest", "sender", "3", SESSION_A))
+        await pool.put(("error", "sender", "4", SESSION_A))
+        await pool.put(("error", "sender", "5", SESSION_A))
+        # only messages of a higher priority are queued, so the new one is dropped
+        await pool.put(("digest", "sender", "6", SESSION_A))
+
+        await run_until_processed(pool, 3)
+        self.assertEqual([msg for _, msg in self.processed], ["1", "4", "5"])
+        self.assertEqual(pool.metrics.dropped, 4)
+        self.assertEqual(pool.metrics.max_queue_depth, 3)
+
+
+class TestAgentMessageWorkers(unittest.IsolatedAsyncioTestCase):
+    async def test_max_messages_in_flight(self):
+        agent = Agent(
+            name="alice",
+            seed="alice message workers phrase",
+            handle_messages_concurrently=True,
+            max_messages_in_flight=2,
+        )
+        running = 0
+        max_running = 0
+
+        @agent.on_message(Message)
+        async def _(_ctx: Context, _sender: str, _msg: Message):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+
+        agent.include(agent._protocol)
+        task = asyncio.create_task(agent._process_message_queue())
+        digest = Model.build_schema_digest(Message)
+        for i in range(6):
+            await agent.handle_message(
+                agent.address, digest, Message(value=i).model_dump_json(), SESSION_A
+            )
+        while agent.message_metrics.processed < 6 or agent._message_tasks:
+            await asyncio.sleep(0.005)
+        task.cancel()
+        await task
+
+        self.assertEqual(max_running, 2)
+        self.assertEqual(agent.message_metrics.processed, 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
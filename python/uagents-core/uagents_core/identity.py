@@ -1,7 +1,10 @@
 import base64
 import hashlib
 import struct
+from abc import ABC, abstractmethod
+from functools import lru_cache
 from secrets import token_bytes
+from typing import Any
 
 import bech32
 import ecdsa
@@ -9,8 +12,15 @@ from ecdsa.util import sigencode_string_canonize
 
 from uagents_core.config import AGENT_ADDRESS_LENGTH, AGENT_PREFIX
 
+try:
+    import coincurve
+    from coincurve.ecdsa import cdata_to_der, deserialize_compact, signature_normalize
+except ImportError:  # pragma: no cover - optional native backend
+    coincurve = None
+
 USER_PREFIX = "user"
 SHA_LENGTH = 256
+VERIFYING_KEY_CACHE_SIZE = 4096
 
 
 def _decode_bech32(value: str) -> tuple[str, bytes]:
@@ -75,6 +85,105 @@ def encode_length_prefixed(value: str | int | bytes) -> bytes:
     return prefix + encoded
 
 
+class VerificationBackend(ABC):
+    """Signature verification backend for secp256k1 agent signatures."""
+
+    name: str
+
+    @abstractmethod
+    def load_verifying_key(self, public_key: bytes) -> Any:
+        """Parse a compressed public key into a backend specific verifying key."""
+        pass
+
+    @abstractmethod
+    def verify_digest(
+        self, verifying_key: Any, digest: bytes, signature: bytes
+    ) -> bool:
+        """
+        Verify a raw (r || s) signature over the provided digest.
+
+        Raises:
+            ecdsa.BadSignatureError: If the signature is invalid.
+        """
+        pass
+
+
+class EcdsaBackend(VerificationBackend):
+    """Pure Python backend based on the `ecdsa` package."""
+
+    name = "ecdsa"
+
+    def load_verifying_key(self, public_key: bytes) -> ecdsa.VerifyingKey:
+        return ecdsa.VerifyingKey.from_string(public_key, curve=ecdsa.SECP256k1)
+
+    def verify_digest(
+        self, verifying_key: ecdsa.VerifyingKey, digest: bytes, signature: bytes
+    ) -> bool:
+        return verifying_key.verify_digest(signature, digest)
+
+
+class CoincurveBackend(VerificationBackend):
+    """Native backend based on `coincurve` (libsecp256k1)."""
+
+    name = "coincurve"
+
+    def __init__(self):
+        if coincurve is None:
+            raise RuntimeError("coincurve is not installed")
+
+    def load_verifying_key(self, public_key: bytes) -> "coincurve.PublicKey":
+        return coincurve.PublicKey(public_key)
+
+    def verify_digest(
+        self, verifying_key: "coincurve.PublicKey", digest: bytes, signature: bytes
+    ) -> bool:
+        try:
+            sig = deserialize_compact(signature)
+        except ValueError as ex:
+            raise ecdsa.BadSignatureError("Malformed signature") from ex
+
+        # libsecp256k1 only accepts low-S signatures while `ecdsa` does not
+        # canonize them when signing, so normalize before verifying
+        _, sig = signature_normalize(sig)
+        if not verifying_key.verify(cdata_to_der(sig), digest, hasher=None):
+            raise ecdsa.BadSignatureError("Signature verification failed")
+        return True
+
+
+def _default_backend() -> VerificationBackend:
+    if coincurve is not None:
+        return CoincurveBackend()
+    return EcdsaBackend()
+
+
+_verification_backend: VerificationBackend = _default_backend()
+
+
+def get_verification_backend() -> VerificationBackend:
+    """Return the backend currently used for signature verification."""
+    return _verification_backend
+
+
+def set_verification_backend(backend: VerificationBackend) -> None:
+    """
+    Set the backend used for signature verification.
+
+    Args:
+        backend (VerificationBackend): The backend to use.
+    """
+    global _verification_backend  # noqa: PLW0603
+    _verification_backend = backend
+    _load_verifying_key.cache_clear()
+
+
+@lru_cache(maxsize=VERIFYING_KEY_CACHE_SIZE)
+def _load_verifying_key(address: str) -> Any:
+    pk_prefix, pk_data = _decode_bech32(address)
+    if pk_prefix != "agent":
+        raise ValueError("Unable to decode agent address")
+    return _verification_backend.load_verifying_key(pk_data)
+
+
 class Identity:
     """An identity is a cryptographic keypair that can be used to sign messages."""
 
@@ -149,19 +258,13 @@ class Identity:
     @staticmethod
     def verify_digest(address: str, digest: bytes, signature: str) -> bool:
         """Verify that the signature is correct for the provided signer address and digest."""
-        pk_prefix, pk_data = _decode_bech32(address)
+        verifying_key = _load_verifying_key(address)
         sig_prefix, sig_data = _decode_bech32(signature)
 
-        if pk_prefix != "agent":
-            raise ValueError("Unable to decode agent address")
-
         if sig_prefix != "sig":
             raise ValueError("Unable to decode signature")
 
-        # build the verifying key
-        verifying_key = ecdsa.VerifyingKey.from_string(pk_data, curve=ecdsa.SECP256k1)
-
-        return verifying_key.verify_digest(sig_data, digest)
+        return _verification_backend.verify_digest(verifying_key, digest, sig_data)
 
 
 def is_valid_address(address: str) -> bool:
@@ -4,6 +4,8 @@ from typing import Any
 from pydantic.v1 import BaseModel, Field  # noqa
 from typing_extensions import Self
 
+_SCHEMA_DIGEST_ATTR = "__schema_digest__"
+
 
 # reverting back to pydantic v1 BaseModel for backwards compatibility
 class Model(BaseModel):
@@ -27,10 +29,17 @@ class Model(BaseModel):
 
     @staticmethod
     def build_schema_digest(model: BaseModel | type[BaseModel]) -> str:
-        schema = model.schema_json(indent=None, sort_keys=True)
-        digest = hashlib.sha256(schema.encode("utf8")).digest().hex()
+        model_cls = model if isinstance(model, type) else type(model)
+
+        # the digest only depends on the class, so compute it once and keep it on
+        # the class itself (not inherited by subclasses, which have their own schema)
+        digest = model_cls.__dict__.get(_SCHEMA_DIGEST_ATTR)
+        if digest is None:
+            schema = model_cls.schema_json(indent=None, sort_keys=True)
+            digest = f"model:{hashlib.sha256(schema.encode('utf8')).digest().hex()}"
+            setattr(model_cls, _SCHEMA_DIGEST_ATTR, digest)
 
-        return f"model:{digest}"
+        return digest
 
 
 class ErrorMessage(Model):